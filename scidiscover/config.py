@@ -42,4 +42,20 @@ MAX_PAPERS_TO_ANALYZE = 1000
 EVIDENCE_THRESHOLD = 0.85  # Minimum confidence score for including scientific claims
 
 # Knowledge Graph Configuration
-GRAPH_CACHE_DIR = ".graph_cache"
\ No newline at end of file
+GRAPH_CACHE_DIR = ".graph_cache"
+GRAPH_BACKEND = "networkx"  # "networkx": mutable dict-of-dicts; "compact": built graphs kept as read-only CSR snapshots
+GRAPH_COMPACT_CHANGE_FRACTION = 0.1  # "compact" backend: changes (fraction of nodes + edges) buffered in a mutable graph before it is compacted again
+GRAPH_LOG_COMPACT_THRESHOLD = 5000  # Logged node/edge changes after which a versioned graph store writes a new base snapshot
+CENTRALITY_EXACT_THRESHOLD = 1000  # Graphs up to this many nodes get exact betweenness centrality
+CENTRALITY_PIVOTS = 128  # Sampled pivots for approximate betweenness on larger graphs (more = slower, more accurate)
+COMMUNITY_REBUILD_FRACTION = 0.2  # Added edges (fraction of the graph) after which communities are recomputed, not updated
+WALK_PROCESSES = 1  # Worker processes for random-walk path sampling (1 = in-process; None = all cores)
+WALK_PARALLEL_MIN_WALKS = 20000  # Smallest walk count worth distributing across worker processes
+WALK_BATCH_WALKS = 10000  # Walks per RNG stream; a seed gives the same paths in-process and in parallel
+
+# Debate Configuration
+DEBATE_MEMORY_TOKEN_BUDGET = 6000  # Maximum estimated tokens per debate prompt for embedded structures (split between them)
+DEBATE_EVALUATION_MODE = "critic"  # "critic": every hypothesis scored by a critique's confidence_score (one call less per round); "separate": dedicated evaluation calls
+DEBATE_ROUND_STRATEGY = "full"  # "full": one call per agent; "compact": one call per round; "auto": compact for low/none thinking
+DEBATE_SCORING_MODE = "single"  # "single": one score per evaluation; "self_consistency": sampled scores with confidence intervals
+DEBATE_SCORE_SAMPLES = 5  # Dimension-score samples requested per self-consistency evaluation
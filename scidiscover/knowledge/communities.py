@@ -0,0 +1,228 @@
+"""
+Community index over a whole concept graph
+Computed once per graph version and kept up to date through added nodes and edges:
+Louvain communities with local moves around new edges, or connected components merged
+with each new edge
+"""
+from typing import Dict, Hashable, Iterable, List, Optional, Set, Tuple
+from collections import deque
+import networkx as nx
+
+COMMUNITY_LOUVAIN = "louvain"
+COMMUNITY_COMPONENTS = "components"
+
+
+class CommunityIndex:
+    """
+    Partition of every node into communities, with O(1) lookups per node
+
+    Community IDs stay fixed between calls for an unchanged graph. After edge additions,
+    Louvain communities are refined by Louvain local moves restricted to the endpoints of
+    new or reweighted edges and the neighbors of nodes that move; once the added edges exceed
+    rebuild_fraction of the graph, the next query recomputes the partition from scratch.
+    Directed graphs are partitioned as undirected graphs.
+    """
+    def __init__(self, method: str = COMMUNITY_LOUVAIN, weight: Optional[str] = "weight",
+                 resolution: float = 1.0, seed: Optional[int] = 42, rebuild_fraction: float = 0.2):
+        """
+        Args:
+            method: COMMUNITY_LOUVAIN or COMMUNITY_COMPONENTS
+            weight: Edge weight attribute (missing weights count as 1), or None for unweighted
+            resolution: Louvain resolution (higher favors smaller communities)
+            seed: Seed for the Louvain node order, so rebuilds of a graph give the same partition
+            rebuild_fraction: Added edges, relative to the edges at the last full build,
+                              after which the partition is recomputed instead of updated
+        """
+        if method not in (COMMUNITY_LOUVAIN, COMMUNITY_COMPONENTS):
+            raise ValueError(f"Unknown community detection method: {method}")
+        self.method = method
+        self.weight = weight
+        self.resolution = resolution
+        self.seed = seed
+        self.rebuild_fraction = rebuild_fraction
+        self.stats = {"full_builds": 0, "incremental_updates": 0, "local_moves": 0}
+        self._reset()
+
+    def _reset(self) -> None:
+        self._key = None
+        self._community: Dict[Hashable, int] = {}
+        self._members: Dict[int, Set[Hashable]] = {}
+        self._totals: Dict[int, float] = {}  # Summed weighted degree per community (Louvain)
+        self._degrees: Dict[Hashable, float] = {}  # Weighted degree per node (Louvain)
+        self._total_weight = 0.0
+        self._next_id = 0
+        self._built_edges = 0
+        self._added_edges = 0
+
+    def invalidate(self) -> None:
+        """Drop the partition; the next query recomputes it"""
+        self._reset()
+
+    def partition(self, graph: nx.Graph, key: Hashable) -> Dict[Hashable, int]:
+        """
+        Community ID of every node
+        Args:
+            graph: Graph to partition
+            key: Key identifying the graph and its version; the partition is rebuilt only when it changes
+        Returns:
+            Dictionary mapping nodes to community IDs (do not modify)
+        """
+        if self._key != key:
+            self._build(graph, key)
+        return self._community
+
+    def members(self, graph: nx.Graph, key: Hashable, communities: Iterable[int]) -> Set[Hashable]:
+        """All nodes in the given communities"""
+        self.partition(graph, key)
+        nodes = set()
+        for community in communities:
+            nodes.update(self._members.get(community, ()))
+        return nodes
+
+    def _edge_weight(self, data: Dict) -> float:
+        return float(data.get(self.weight, 1.0)) if self.weight is not None else 1.0
+
+    @staticmethod
+    def _undirected(graph: nx.Graph) -> nx.Graph:
+        return graph.to_undirected(as_view=True) if graph.is_directed() else graph
+
+    def _add_community(self, nodes: Iterable[Hashable], total: float = 0.0) -> int:
+        community = self._next_id
+        self._next_id += 1
+        self._members[community] = set(nodes)
+        for node in self._members[community]:
+            self._community[node] = community
+        self._totals[community] = total
+        return community
+
+    def _build(self, graph: nx.Graph, key: Hashable) -> None:
+        self._reset()
+        self.stats["full_builds"] += 1
+        self._key = key
+        undirected = self._undirected(graph)
+        if self.method == COMMUNITY_LOUVAIN:
+            groups = nx.community.louvain_communities(
+                undirected, weight=self.weight, resolution=self.resolution, seed=self.seed
+            )
+            self._degrees = dict(undirected.degree(weight=self.weight))
+            for group in groups:
+                self._add_community(group, sum(self._degrees[node] for node in group))
+            self._total_weight = undirected.size(weight=self.weight)
+        else:
+            for component in nx.connected_components(undirected):
+                self._add_community(component)
+        self._built_edges = undirected.number_of_edges()
+
+    def apply_update(self, graph: nx.Graph, key_before: Hashable, key_after: Hashable,
+                     new_nodes: Iterable[Hashable], new_edges: Iterable[Tuple[Hashable, Hashable]],
+                     touched_nodes: Iterable[Hashable] = ()) -> None:
+        """
+        Incrementally account for nodes and edges added to the graph
+        Args:
+            graph: The updated graph
+            key_before: Version key the cached partition must match to be updated in place
+            key_after: Version key of the updated graph
+            new_nodes: Nodes that did not exist before
+            new_edges: Edges that did not exist before
+            touched_nodes: Endpoints of existing edges whose weights may have changed
+        """
+        if self._key is None:
+            return  # Nothing cached yet; the next query builds from scratch
+        if self._key != key_before:
+            self.invalidate()
+            return
+        new_edges = list(new_edges)
+        self._added_edges += len(new_edges)
+        if self._added_edges > self.rebuild_fraction * max(1, self._built_edges):
+            self.invalidate()
+            return
+
+        for node in new_nodes:
+            if node not in self._community:
+                self._add_community([node])
+        if self.method == COMMUNITY_LOUVAIN:
+            nodes = [node for edge in new_edges for node in edge] + list(touched_nodes)
+            nodes = [node for node in dict.fromkeys(nodes) if node in self._community]
+            self._local_moves(graph, nodes)
+        else:
+            for u, v in new_edges:
+                self._merge(self._community[u], self._community[v])
+        self._key = key_after
+        self.stats["incremental_updates"] += 1
+
+    def _merge(self, first: int, second: int) -> None:
+        """Merge two components, relabeling the smaller one"""
+        if first == second:
+            return
+        if len(self._members[first]) < len(self._members[second]):
+            first, second = second, first
+        for node in self._members[second]:
+            self._community[node] = first
+        self._members[first] |= self._members.pop(second)
+        self._totals.pop(second, None)
+
+    def _links(self, adjacency, node: Hashable) -> Tuple[float, Dict[int, float]]:
+        """Weighted degree of node and its summed edge weight to each neighboring community"""
+        degree = 0.0
+        links = {}
+        for neighbor, data in adjacency[node].items():
+            w = self._edge_weight(data)
+            if neighbor == node:
+                degree += 2 * w  # Self-loops count twice, as in nx degree
+                continue
+            degree += w
+            community = self._community[neighbor]
+            links[community] = links.get(community, 0.0) + w
+        return degree, links
+
+    def _local_moves(self, graph: nx.Graph, nodes: List[Hashable]) -> None:
+        """
+        Louvain phase one from the given nodes: refresh their degrees, then move each queued
+        node to the neighboring community with the largest modularity gain, queueing the
+        neighbors of every node that moves, until no queued node improves modularity
+        """
+        adjacency = self._undirected(graph).adj
+        community, totals, degrees = self._community, self._totals, self._degrees
+        for node in nodes:
+            degree, _ = self._links(adjacency, node)
+            change = degree - degrees.get(node, 0.0)
+            degrees[node] = degree
+            totals[community[node]] += change
+            self._total_weight += change / 2
+        if self._total_weight <= 0:
+            return
+        scale = self.resolution / (2 * self._total_weight)
+
+        queue = deque(nodes)
+        queued = set(nodes)
+        max_moves = 10 * len(queue) + 100  # Gains are strictly positive, so this is only a safeguard
+        moves = 0
+        while queue and moves < max_moves:
+            node = queue.popleft()
+            queued.discard(node)
+            current = community[node]
+            degree = degrees[node]
+            _, links = self._links(adjacency, node)
+
+            totals[current] -= degree
+            best, best_gain = current, links.get(current, 0.0) - totals[current] * degree * scale
+            for candidate, link in links.items():
+                gain = link - totals[candidate] * degree * scale
+                if gain > best_gain + 1e-12:
+                    best, best_gain = candidate, gain
+            totals[best] += degree
+            if best == current:
+                continue
+
+            moves += 1
+            community[node] = best
+            self._members[best].add(node)
+            self._members[current].discard(node)
+            if not self._members[current]:
+                del self._members[current]
+                del totals[current]
+            for neighbor in adjacency[node]:
+                if neighbor not in queued and neighbor != node:
+                    queued.add(neighbor)
+                    queue.append(neighbor)
+        self.stats["local_moves"] += moves
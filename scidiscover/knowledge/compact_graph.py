@@ -0,0 +1,439 @@
+"""
+Compact integer-indexed storage for concept graphs
+Interned node IDs, CSR adjacency, typed attribute columns and an evidence side table,
+with a read-only NetworkX-compatible view for existing callers
+"""
+from typing import Any, Dict, Hashable, Iterator, List, Optional, Tuple
+from collections.abc import Mapping
+import sys
+import networkx as nx
+import numpy as np
+
+# Bits of CompactGraph.edge_flags recording which attributes an edge has
+HAS_WEIGHT = 1
+HAS_TYPE = 2
+HAS_EVIDENCE_COUNT = 4
+HAS_EVIDENCE = 8
+
+# Bits of CompactGraph.node_flags
+HAS_CONFIDENCE = 1
+
+MAX_EVIDENCE_COUNT = np.iinfo(np.uint16).max
+
+GRAPH_BACKEND_NETWORKX = "networkx"  # Mutable NetworkX dict-of-dicts
+GRAPH_BACKEND_COMPACT = "compact"  # Read-only CompactGraph views; mutations convert back to NetworkX first
+
+
+def _intern(value: Hashable) -> Hashable:
+    return sys.intern(value) if type(value) is str else value
+
+
+class Categories:
+    """Categorical column: small integer codes into a list of distinct values (-1 = missing)"""
+    def __init__(self):
+        self.values: List[Hashable] = []
+        self._codes: Dict[Hashable, int] = {}
+
+    def encode(self, value: Hashable) -> int:
+        code = self._codes.get(value)
+        if code is None:
+            code = self._codes[value] = len(self.values)
+            self.values.append(_intern(value))
+        return code
+
+    def dtype(self) -> np.dtype:
+        return np.int8 if len(self.values) < 127 else np.int16 if len(self.values) < 32767 else np.int32
+
+
+class CompactGraph:
+    """
+    Immutable compact snapshot of a concept graph
+
+    Nodes are integer IDs into `nodes`. Neighbors of node i are
+    indices[indptr[i]:indptr[i + 1]] (successors for directed graphs; predecessors are in
+    the CSC arrays in_indptr/in_indices), and edge_ids maps every adjacency entry to its
+    row in the edge columns, so an undirected edge is stored once. Evidence lists live in
+    one flat side table: edge e owns evidence[evidence_offsets[e]:evidence_offsets[e + 1]].
+    Attributes outside the typed columns are kept per node/edge in the sparse extra dicts.
+    """
+    def __init__(self):
+        self.directed = False
+        self.graph_attributes: Dict = {}
+        self.nodes: List[Hashable] = []
+        self.index: Dict[Hashable, int] = {}
+        self.node_type = np.zeros(0, dtype=np.int8)
+        self.node_types = Categories()
+        self.node_source = np.zeros(0, dtype=np.int8)
+        self.node_sources = Categories()
+        self.node_confidence = np.zeros(0, dtype=np.float64)
+        self.node_flags = np.zeros(0, dtype=np.uint8)
+        self.node_extra: Dict[int, Dict] = {}
+
+        self.indptr = np.zeros(1, dtype=np.int64)
+        self.indices = np.zeros(0, dtype=np.int32)
+        self.edge_ids = np.zeros(0, dtype=np.int32)
+        self.in_indptr = self.indptr
+        self.in_indices = self.indices
+        self.in_edge_ids = self.edge_ids
+
+        self.weight = np.zeros(0, dtype=np.float32)
+        self.rel_type = np.zeros(0, dtype=np.int8)
+        self.rel_types = Categories()
+        self.evidence_count = np.zeros(0, dtype=np.uint16)
+        self.edge_flags = np.zeros(0, dtype=np.uint8)
+        self.evidence_offsets = np.zeros(1, dtype=np.int64)
+        self.evidence: List[Any] = []
+        self.edge_extra: Dict[int, Dict] = {}
+        self.metadata: Dict = {}  # File-level metadata of saved snapshots (e.g. their graph version)
+
+    @classmethod
+    def from_networkx(cls, graph: nx.Graph) -> "CompactGraph":
+        """
+        Build a compact snapshot of a NetworkX graph
+        Weights are stored as float32 and evidence counts are capped at 65535
+        Args:
+            graph: Graph or DiGraph (multigraphs are not supported)
+        """
+        if graph.is_multigraph():
+            raise ValueError("CompactGraph does not support multigraphs")
+        compact = cls()
+        compact.directed = graph.is_directed()
+        compact.graph_attributes = dict(graph.graph)
+        compact.nodes = [_intern(node) for node in graph.nodes()]
+        compact.index = {node: i for i, node in enumerate(compact.nodes)}
+        index = compact.index
+        num_nodes = len(compact.nodes)
+
+        node_type = np.full(num_nodes, -1, dtype=np.int32)
+        node_source = np.full(num_nodes, -1, dtype=np.int32)
+        compact.node_confidence = np.zeros(num_nodes, dtype=np.float64)
+        compact.node_flags = np.zeros(num_nodes, dtype=np.uint8)
+        for i, (node, data) in enumerate(graph.nodes(data=True)):
+            extra = {}
+            for key, value in data.items():
+                if key == "type" and isinstance(value, str):
+                    node_type[i] = compact.node_types.encode(value)
+                elif key == "source" and isinstance(value, str):
+                    node_source[i] = compact.node_sources.encode(value)
+                elif key == "confidence" and isinstance(value, (int, float)) and not isinstance(value, bool):
+                    compact.node_confidence[i] = value
+                    compact.node_flags[i] |= HAS_CONFIDENCE
+                else:
+                    extra[key] = value
+            if extra:
+                compact.node_extra[i] = extra
+        compact.node_type = node_type.astype(compact.node_types.dtype())
+        compact.node_source = node_source.astype(compact.node_sources.dtype())
+
+        # Edge columns, one row per edge
+        num_edges = graph.number_of_edges()
+        sources = np.empty(num_edges, dtype=np.int64)
+        targets = np.empty(num_edges, dtype=np.int64)
+        compact.weight = np.zeros(num_edges, dtype=np.float32)
+        rel_type = np.full(num_edges, -1, dtype=np.int32)
+        compact.evidence_count = np.zeros(num_edges, dtype=np.uint16)
+        compact.edge_flags = np.zeros(num_edges, dtype=np.uint8)
+        evidence_offsets = np.zeros(num_edges + 1, dtype=np.int64)
+        for e, (u, v, data) in enumerate(graph.edges(data=True)):
+            sources[e] = index[u]
+            targets[e] = index[v]
+            flags = 0
+            extra = {}
+            for key, value in data.items():
+                if key == "weight" and isinstance(value, (int, float)) and not isinstance(value, bool):
+                    compact.weight[e] = value
+                    flags |= HAS_WEIGHT
+                elif key == "type" and isinstance(value, str):
+                    rel_type[e] = compact.rel_types.encode(value)
+                    flags |= HAS_TYPE
+                elif key == "evidence_count" and isinstance(value, int) and 0 <= value:
+                    compact.evidence_count[e] = min(value, MAX_EVIDENCE_COUNT)
+                    flags |= HAS_EVIDENCE_COUNT
+                elif key == "evidence" and isinstance(value, list):
+                    compact.evidence.extend(value)
+                    flags |= HAS_EVIDENCE
+                else:
+                    extra[key] = value
+            compact.edge_flags[e] = flags
+            evidence_offsets[e + 1] = len(compact.evidence)
+            if extra:
+                compact.edge_extra[e] = extra
+        compact.rel_type = rel_type.astype(compact.rel_types.dtype())
+        compact.evidence_offsets = evidence_offsets
+
+        # Adjacency: both directions of an undirected edge, successors only for directed graphs
+        edge_rows = np.arange(num_edges, dtype=np.int64)
+        if compact.directed:
+            compact.indptr, compact.indices, compact.edge_ids = _csr(num_nodes, sources, targets, edge_rows)
+            compact.in_indptr, compact.in_indices, compact.in_edge_ids = _csr(num_nodes, targets, sources, edge_rows)
+        else:
+            loops = sources == targets  # A self-loop is one adjacency entry, as in NetworkX
+            compact.indptr, compact.indices, compact.edge_ids = _csr(
+                num_nodes,
+                np.concatenate([sources, targets[~loops]]),
+                np.concatenate([targets, sources[~loops]]),
+                np.concatenate([edge_rows, edge_rows[~loops]])
+            )
+            compact.in_indptr, compact.in_indices, compact.in_edge_ids = compact.indptr, compact.indices, compact.edge_ids
+        return compact
+
+    @property
+    def num_nodes(self) -> int:
+        return len(self.nodes)
+
+    @property
+    def num_edges(self) -> int:
+        return len(self.weight)
+
+    def neighbor_ids(self, node_id: int) -> np.ndarray:
+        """IDs of a node's neighbors (successors for directed graphs)"""
+        return self.indices[self.indptr[node_id]:self.indptr[node_id + 1]]
+
+    def edge_evidence(self, edge_id: int) -> List[Any]:
+        """Evidence records of an edge"""
+        return self.evidence[self.evidence_offsets[edge_id]:self.evidence_offsets[edge_id + 1]]
+
+    def node_data(self, node_id: int) -> Dict:
+        """Attribute dictionary of a node, as stored in the original graph"""
+        data = {}
+        if self.node_type[node_id] >= 0:
+            data["type"] = self.node_types.values[self.node_type[node_id]]
+        if self.node_flags[node_id] & HAS_CONFIDENCE:
+            data["confidence"] = float(self.node_confidence[node_id])
+        if self.node_source[node_id] >= 0:
+            data["source"] = self.node_sources.values[self.node_source[node_id]]
+        extra = self.node_extra.get(node_id)
+        if extra:
+            data.update(extra)
+        return data
+
+    def edge_data(self, edge_id: int) -> Dict:
+        """Attribute dictionary of an edge, as stored in the original graph"""
+        flags = self.edge_flags[edge_id]
+        data = {}
+        if flags & HAS_TYPE:
+            data["type"] = self.rel_types.values[self.rel_type[edge_id]]
+        if flags & HAS_WEIGHT:
+            data["weight"] = float(self.weight[edge_id])
+        if flags & HAS_EVIDENCE_COUNT:
+            data["evidence_count"] = int(self.evidence_count[edge_id])
+        if flags & HAS_EVIDENCE:
+            data["evidence"] = self.edge_evidence(edge_id)
+        extra = self.edge_extra.get(edge_id)
+        if extra:
+            data.update(extra)
+        return data
+
+    def edge_weights(self, default: float = 1.0) -> np.ndarray:
+        """Weight of every adjacency entry as float64 (default where an edge has none)"""
+        weights = np.where(self.edge_flags & HAS_WEIGHT, self.weight, default).astype(np.float64)
+        return weights[self.edge_ids]
+
+    def bfs_distances(self, source: Hashable, cutoff: Optional[int] = None) -> np.ndarray:
+        """
+        Hop distance from source to every node, frontier at a time over the CSR arrays
+        Args:
+            source: Start node
+            cutoff: Optional maximum distance
+        Returns:
+            Array of distances by node ID, -1 for unreachable nodes
+        """
+        return self.multi_source_bfs([source], cutoff)[0]
+
+    def multi_source_bfs(self, sources: List[Hashable],
+                         cutoff: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Hop distance from the nearest of several sources, visiting every node once
+        Args:
+            sources: Start nodes
+            cutoff: Optional maximum distance
+        Returns:
+            (distances, origins): arrays by node ID; distances are -1 and origins -1 for
+            unreachable nodes, otherwise origins is the position in sources of the nearest
+            source (the first one listed on ties)
+        """
+        distances = np.full(self.num_nodes, -1, dtype=np.int32)
+        origins = np.full(self.num_nodes, len(sources), dtype=np.int32)
+        seeds = np.array([self.index[source] for source in sources], dtype=np.int64)
+        # Reversed so that for a repeated source the first position wins
+        origins[seeds[::-1]] = np.arange(len(seeds), dtype=np.int32)[::-1]
+        distances[seeds] = 0
+        frontier = np.unique(seeds)
+        depth = 0
+        while len(frontier) and (cutoff is None or depth < cutoff):
+            depth += 1
+            starts, ends = self.indptr[frontier], self.indptr[frontier + 1]
+            counts = ends - starts
+            offsets = np.repeat(starts - np.cumsum(counts) + counts, counts) + np.arange(counts.sum())
+            neighbors = self.indices[offsets]
+            new = distances[neighbors] < 0
+            neighbors = neighbors[new]
+            distances[neighbors] = depth
+            np.minimum.at(origins, neighbors, np.repeat(origins[frontier], counts)[new])
+            # Deduplicate through the distance array (cheaper than sorting the candidates)
+            frontier = np.flatnonzero(distances == depth) if len(neighbors) else neighbors
+        origins[distances < 0] = -1
+        return distances, origins
+
+    def nbytes(self) -> int:
+        """Approximate memory of the arrays and the node/evidence tables (excluding shared strings)"""
+        arrays = [
+            self.node_type, self.node_source, self.node_confidence, self.node_flags,
+            self.indptr, self.indices, self.edge_ids, self.weight, self.rel_type,
+            self.evidence_count, self.edge_flags, self.evidence_offsets
+        ]
+        if self.directed:
+            arrays += [self.in_indptr, self.in_indices, self.in_edge_ids]
+        total = sum(array.nbytes for array in arrays)
+        total += sys.getsizeof(self.nodes) + sys.getsizeof(self.index) + sys.getsizeof(self.evidence)
+        return total
+
+    def view(self) -> nx.Graph:
+        """Read-only NetworkX graph backed by this snapshot"""
+        return CompactDiGraphView(self) if self.directed else CompactGraphView(self)
+
+    def to_networkx(self) -> nx.Graph:
+        """Mutable NetworkX copy of the graph"""
+        graph = nx.DiGraph() if self.directed else nx.Graph()
+        graph.graph.update(self.graph_attributes)
+        graph.add_nodes_from((node, self.node_data(i)) for i, node in enumerate(self.nodes))
+        for u in range(self.num_nodes):
+            for position in range(self.indptr[u], self.indptr[u + 1]):
+                v = int(self.indices[position])
+                if self.directed or u <= v:
+                    graph.add_edge(self.nodes[u], self.nodes[v], **self.edge_data(int(self.edge_ids[position])))
+        return graph
+
+
+def _csr(num_nodes: int, rows: np.ndarray, columns: np.ndarray,
+         edge_rows: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """CSR arrays (indptr, indices, edge ids) of (row, column) entries, keeping insertion order per row"""
+    order = np.argsort(rows, kind="stable")
+    indptr = np.zeros(num_nodes + 1, dtype=np.int64)
+    np.cumsum(np.bincount(rows, minlength=num_nodes), out=indptr[1:])
+    return indptr, columns[order].astype(np.int32), edge_rows[order].astype(np.int32)
+
+
+class _NodeMap(Mapping):
+    """node -> attribute dict, materialized on access"""
+    def __init__(self, compact: CompactGraph):
+        self._compact = compact
+
+    def __getitem__(self, node: Hashable) -> Dict:
+        return self._compact.node_data(self._compact.index[node])
+
+    def __iter__(self) -> Iterator[Hashable]:
+        return iter(self._compact.nodes)
+
+    def __len__(self) -> int:
+        return len(self._compact.nodes)
+
+    def __contains__(self, node: Hashable) -> bool:
+        try:
+            return node in self._compact.index
+        except TypeError:
+            return False
+
+
+class _NeighborMap(Mapping):
+    """neighbor -> edge attribute dict of one node"""
+    def __init__(self, compact: CompactGraph, indices: np.ndarray, edge_ids: np.ndarray):
+        self._compact = compact
+        self._indices = indices
+        self._edge_ids = edge_ids
+        self._positions = None
+
+    def _lookup(self) -> Dict[int, int]:
+        if self._positions is None:
+            self._positions = {int(v): i for i, v in enumerate(self._indices)}
+        return self._positions
+
+    def __getitem__(self, neighbor: Hashable) -> Dict:
+        position = self._lookup()[self._compact.index[neighbor]]
+        return self._compact.edge_data(int(self._edge_ids[position]))
+
+    def __iter__(self) -> Iterator[Hashable]:
+        nodes = self._compact.nodes
+        return (nodes[v] for v in self._indices.tolist())
+
+    def __len__(self) -> int:
+        return len(self._indices)
+
+    def __contains__(self, neighbor: Hashable) -> bool:
+        try:
+            i = self._compact.index.get(neighbor)
+        except TypeError:
+            return False
+        return i is not None and i in self._lookup()
+
+    def items(self):
+        nodes = self._compact.nodes
+        edge_data = self._compact.edge_data
+        return [(nodes[v], edge_data(e)) for v, e in zip(self._indices.tolist(), self._edge_ids.tolist())]
+
+
+class _AdjacencyMap(Mapping):
+    """node -> _NeighborMap over one set of CSR arrays"""
+    def __init__(self, compact: CompactGraph, indptr: np.ndarray, indices: np.ndarray, edge_ids: np.ndarray):
+        self._compact = compact
+        self._indptr = indptr
+        self._indices = indices
+        self._edge_ids = edge_ids
+
+    def __getitem__(self, node: Hashable) -> _NeighborMap:
+        i = self._compact.index[node]
+        lo, hi = self._indptr[i], self._indptr[i + 1]
+        return _NeighborMap(self._compact, self._indices[lo:hi], self._edge_ids[lo:hi])
+
+    def __iter__(self) -> Iterator[Hashable]:
+        return iter(self._compact.nodes)
+
+    def __len__(self) -> int:
+        return len(self._compact.nodes)
+
+    def __contains__(self, node: Hashable) -> bool:
+        try:
+            return node in self._compact.index
+        except TypeError:
+            return False
+
+
+class CompactGraphView(nx.Graph):
+    """
+    Read-only nx.Graph over a CompactGraph
+    Attribute dicts are built on access, so writing to them has no effect;
+    mutating methods raise NetworkXError (use to_networkx() for a mutable copy).
+    Without a snapshot it is an ordinary empty graph, which NetworkX relies on when it
+    instantiates graphs of the same class (copy(), subgraph views)
+    """
+    def __init__(self, compact: Optional[CompactGraph] = None, **attr):
+        super().__init__(**attr)
+        self.compact = compact
+        if compact is None:
+            return
+        self.graph.update(compact.graph_attributes)
+        self._node = _NodeMap(compact)
+        self._adj = _AdjacencyMap(compact, compact.indptr, compact.indices, compact.edge_ids)
+        nx.freeze(self)
+
+    def to_networkx(self) -> nx.Graph:
+        """Mutable NetworkX copy"""
+        return self.compact.to_networkx() if self.compact is not None else nx.Graph(self)
+
+
+class CompactDiGraphView(nx.DiGraph):
+    """Read-only nx.DiGraph over a directed CompactGraph (see CompactGraphView)"""
+    def __init__(self, compact: Optional[CompactGraph] = None, **attr):
+        super().__init__(**attr)
+        self.compact = compact
+        if compact is None:
+            return
+        self.graph.update(compact.graph_attributes)
+        self._node = _NodeMap(compact)
+        self._succ = self._adj = _AdjacencyMap(compact, compact.indptr, compact.indices, compact.edge_ids)
+        self._pred = _AdjacencyMap(compact, compact.in_indptr, compact.in_indices, compact.in_edge_ids)
+        nx.freeze(self)
+
+    def to_networkx(self) -> nx.DiGraph:
+        """Mutable NetworkX copy"""
+        return self.compact.to_networkx() if self.compact is not None else nx.DiGraph(self)
@@ -1,21 +1,61 @@
 import networkx as nx
-from typing import List, Tuple
+from typing import List, Optional, Tuple
 import json
 import os
-from scidiscover.config import GRAPH_CACHE_DIR
+from scidiscover.config import GRAPH_CACHE_DIR, GRAPH_BACKEND
+from .compact_graph import CompactGraph, CompactGraphView, CompactDiGraphView, GRAPH_BACKEND_COMPACT
+from .graph_store import read_graph_file, write_graph_file, XML_FORMAT_GEXF
+from .path_search import PathMatrix, many_to_many_paths
+from .walk_engine import CSRGraph
 
 class KnowledgeGraph:
     def __init__(self):
         self.graph = nx.Graph()
+        self.backend = GRAPH_BACKEND
+        self.graph_version = 0  # Incremented on every change; keys the cached CSR adjacency
+        self._csr = None
+        self._csr_key = None
         os.makedirs(GRAPH_CACHE_DIR, exist_ok=True)
 
+    def _graph_key(self) -> Tuple:
+        """Cache key of the current graph state (replacing self.graph is detected too)"""
+        return (self.graph_version, id(self.graph), self.graph.number_of_nodes())
+
+    def _mutable_graph(self) -> nx.Graph:
+        """The graph as a mutable NetworkX graph, converting a compact view back if needed"""
+        if isinstance(self.graph, (CompactGraphView, CompactDiGraphView)):
+            self.graph = self.graph.to_networkx()
+        # Callers modify the graph
+        self.graph_version += 1
+        return self.graph
+
+    def csr_graph(self) -> CSRGraph:
+        """CSR adjacency of the graph with integer node IDs, cached per graph version"""
+        key = self._graph_key()
+        if self._csr_key != key:
+            if isinstance(self.graph, (CompactGraphView, CompactDiGraphView)):
+                # Reuse the compact adjacency arrays instead of walking attribute dicts
+                compact = self.graph.compact
+                self._csr = CSRGraph(compact.nodes, compact.indptr, compact.indices, compact.edge_weights())
+            else:
+                self._csr = CSRGraph.from_networkx(self.graph)
+            self._csr_key = key
+        return self._csr
+
+    def compact(self):
+        """Store the graph as a read-only compact snapshot (later additions convert it back)"""
+        if not isinstance(self.graph, (CompactGraphView, CompactDiGraphView)):
+            self.graph = CompactGraph.from_networkx(self.graph).view()
+
     def add_concept(self, concept: str, properties: dict = None):
         """Add a concept node to the knowledge graph"""
-        self.graph.add_node(concept, **properties if properties else {})
+        self._mutable_graph().add_node(concept, **properties if properties else {})
+        self.graph_version += 1
 
     def add_relationship(self, concept1: str, concept2: str, relationship_type: str):
         """Add a relationship between two concepts"""
-        self.graph.add_edge(concept1, concept2, type=relationship_type)
+        self._mutable_graph().add_edge(concept1, concept2, type=relationship_type)
+        self.graph_version += 1
 
     def find_path(self, start_concept: str, end_concept: str) -> List[str]:
         """Find the shortest path between two concepts"""
@@ -25,6 +65,11 @@ class KnowledgeGraph:
         except nx.NetworkXNoPath:
             return []
 
+    def find_paths(self, start_concepts: List[str], end_concepts: List[str]) -> PathMatrix:
+        """Shortest paths (by hops) between every start and end concept, one search per concept of the smaller set"""
+        return many_to_many_paths(self.csr_graph(), start_concepts, end_concepts, self.graph.is_directed(),
+                                  weighted=False)
+
     def get_related_concepts(self, concept: str, max_depth: int = 2) -> List[str]:
         """Get related concepts within specified depth"""
         related = set()
@@ -33,12 +78,15 @@ class KnowledgeGraph:
         return list(related)
 
     def save_graph(self, filename: str):
-        """Save the knowledge graph to file"""
+        """Save the knowledge graph to file (binary for .kgb names, GraphML for .graphml, GEXF otherwise)"""
         path = os.path.join(GRAPH_CACHE_DIR, filename)
-        nx.write_gexf(self.graph, path)
+        write_graph_file(self.graph, path, XML_FORMAT_GEXF)
 
     def load_graph(self, filename: str):
-        """Load a knowledge graph from file"""
+        """Load a knowledge graph from file (binary files open memory-mapped and read-only)"""
         path = os.path.join(GRAPH_CACHE_DIR, filename)
         if os.path.exists(path):
-            self.graph = nx.read_gexf(path)
\ No newline at end of file
+            self.graph = read_graph_file(path, XML_FORMAT_GEXF)
+            self.graph_version += 1
+            if self.backend == GRAPH_BACKEND_COMPACT:
+                self.compact()
\ No newline at end of file
@@ -0,0 +1,200 @@
+"""
+Versioned graph persistence: a base snapshot plus an append-only delta log
+Every committed batch of node/edge changes gets the next graph version and is appended
+to the log; compaction folds the log into a new base snapshot
+"""
+from typing import Dict, Hashable, Iterable, List, Optional, Tuple
+import json
+import os
+import networkx as nx
+
+from .graph_store import GRAPH_FILE_EXTENSION, load_compact, save_compact, _decode_json_label
+from .compact_graph import CompactGraph
+
+LOG_EXTENSION = ".log"
+
+# Change operations; each change is a dict with "op" and the fields listed
+ADD_NODE = "add_node"  # node, attrs (merged into existing attributes)
+UPDATE_NODE = "update_node"  # node, attrs (ignored if the node does not exist)
+REMOVE_NODE = "remove_node"  # node
+ADD_EDGE = "add_edge"  # source, target, attrs (merged)
+UPDATE_EDGE = "update_edge"  # source, target, attrs (ignored if the edge does not exist)
+REMOVE_EDGE = "remove_edge"  # source, target
+CLEAR = "clear"  # remove everything
+
+
+def apply_graph_changes(graph: nx.Graph, changes: Iterable[Dict]) -> Tuple[List[Hashable], List[Tuple], bool]:
+    """
+    Apply change operations to a mutable graph
+    Args:
+        graph: Graph to modify in place
+        changes: Change dicts (see the operation constants)
+    Returns:
+        (nodes that did not exist before, edges that did not exist before,
+        whether anything was removed)
+    Raises:
+        ValueError: For an unknown operation
+    """
+    new_nodes, new_edges = [], []
+    removed = False
+    for change in changes:
+        op = change["op"]
+        if op == ADD_NODE:
+            if change["node"] not in graph:
+                new_nodes.append(change["node"])
+            graph.add_node(change["node"], **change.get("attrs", {}))
+        elif op == UPDATE_NODE:
+            if change["node"] in graph:
+                graph.nodes[change["node"]].update(change.get("attrs", {}))
+        elif op == REMOVE_NODE:
+            if change["node"] in graph:
+                graph.remove_node(change["node"])
+                removed = True
+        elif op == ADD_EDGE:
+            source, target = change["source"], change["target"]
+            for node in (source, target):
+                if node not in graph:
+                    new_nodes.append(node)
+            if not graph.has_edge(source, target):
+                new_edges.append((source, target))
+            graph.add_edge(source, target, **change.get("attrs", {}))
+        elif op == UPDATE_EDGE:
+            if graph.has_edge(change["source"], change["target"]):
+                graph[change["source"]][change["target"]].update(change.get("attrs", {}))
+        elif op == REMOVE_EDGE:
+            if graph.has_edge(change["source"], change["target"]):
+                graph.remove_edge(change["source"], change["target"])
+                removed = True
+        elif op == CLEAR:
+            removed = removed or graph.number_of_nodes() > 0
+            graph.clear()
+            new_nodes, new_edges = [], []
+        else:
+            raise ValueError(f"Unknown graph change operation: {op}")
+    return new_nodes, new_edges, removed
+
+
+def _decode_change(change: Dict) -> Dict:
+    """Restore hashable node labels (JSON turns tuples into lists)"""
+    for key in ("node", "source", "target"):
+        if key in change:
+            change[key] = _decode_json_label(change[key])
+    return change
+
+
+class VersionedGraphStore:
+    """
+    Base snapshot (binary graph file) plus append-only delta log for one named graph
+
+    Log lines are {"version": v, "changes": [...]}, one per committed batch, with strictly
+    increasing versions. The snapshot records the version it contains, so replay only
+    applies newer batches; a torn last line from a crash is dropped.
+    """
+    def __init__(self, directory: str, name: str, compact_threshold: int = 5000):
+        """
+        Args:
+            directory: Graph cache directory
+            name: Graph name (file stem)
+            compact_threshold: Logged changes after which maybe_compact folds the log into the snapshot
+        """
+        self.directory = directory
+        self.name = name
+        self.compact_threshold = compact_threshold
+        self.snapshot_path = os.path.join(directory, name + GRAPH_FILE_EXTENSION)
+        self.log_path = os.path.join(directory, name + LOG_EXTENSION)
+        self.version = 0
+        self.base_version = 0
+        self.pending_changes = 0  # Changes in the log, not yet in the snapshot
+        os.makedirs(directory, exist_ok=True)
+
+    def load(self) -> nx.Graph:
+        """
+        Open the graph at its latest version
+        Returns:
+            The snapshot as a read-only compact view when the log adds nothing,
+            otherwise a mutable graph with the logged changes replayed
+        """
+        graph = None
+        self.base_version = 0
+        if os.path.exists(self.snapshot_path):
+            compact = load_compact(self.snapshot_path)
+            self.base_version = int(compact.metadata.get("graph_version", 0))
+            graph = compact.view()
+        self.version = self.base_version
+        self.pending_changes = 0
+
+        batches = [batch for batch in self._read_log() if batch["version"] > self.base_version]
+        if not batches:
+            return graph if graph is not None else nx.Graph()
+
+        graph = graph.to_networkx() if graph is not None else nx.Graph()
+        for batch in batches:
+            apply_graph_changes(graph, (_decode_change(change) for change in batch["changes"]))
+            self.version = batch["version"]
+            self.pending_changes += len(batch["changes"])
+        return graph
+
+    def _read_log(self) -> List[Dict]:
+        """Logged batches; a torn last line from an interrupted append is cut off the file"""
+        if not os.path.exists(self.log_path):
+            return []
+        batches, valid_bytes = [], 0
+        with open(self.log_path, "rb") as f:
+            for line in f:
+                try:
+                    batch = json.loads(line.decode("utf-8"))
+                except ValueError:
+                    break
+                if not line.endswith(b"\n"):
+                    break
+                batches.append(batch)
+                valid_bytes += len(line)
+        if valid_bytes < os.path.getsize(self.log_path):
+            with open(self.log_path, "r+b") as f:
+                f.truncate(valid_bytes)
+        return batches
+
+    def append(self, changes: List[Dict], version: Optional[int] = None) -> int:
+        """
+        Durably log a batch of changes
+        Args:
+            changes: Change dicts, already applied to the in-memory graph
+            version: Version of the graph after the batch (default: next version)
+        Returns:
+            The batch's version
+        Raises:
+            ValueError: If version does not increase
+        """
+        version = self.version + 1 if version is None else version
+        if version <= self.version:
+            raise ValueError(f"Graph version must increase (log is at {self.version}, got {version})")
+        line = json.dumps({"version": version, "changes": changes}, default=str, ensure_ascii=False)
+        with open(self.log_path, "a", encoding="utf-8") as f:
+            f.write(line + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        self.version = version
+        self.pending_changes += len(changes)
+        return version
+
+    def compact(self, graph: nx.Graph) -> None:
+        """
+        Fold the log into a new base snapshot of graph, which must be at self.version
+        The snapshot is replaced atomically before the log is cleared, so a crash in
+        between only leaves batches that replay skips
+        """
+        existing = getattr(graph, "compact", None)
+        snapshot = existing if isinstance(existing, CompactGraph) else CompactGraph.from_networkx(graph)
+        save_compact(snapshot, self.snapshot_path, metadata={"graph_version": self.version})
+        temporary = self.log_path + ".tmp"
+        open(temporary, "w").close()
+        os.replace(temporary, self.log_path)
+        self.base_version = self.version
+        self.pending_changes = 0
+
+    def maybe_compact(self, graph: nx.Graph) -> bool:
+        """Compact when the log holds at least compact_threshold changes; returns whether it did"""
+        if self.pending_changes >= self.compact_threshold:
+            self.compact(graph)
+            return True
+        return False
@@ -0,0 +1,407 @@
+"""
+Binary, memory-mapped persistence for compact concept graphs
+One file: a fixed preamble, a JSON header describing the sections, then 64-byte aligned
+sections (CSR arrays, attribute columns, node string table, evidence table) that are
+opened with numpy.memmap and paged in lazily. Includes GraphML/GEXF converters.
+"""
+from typing import Any, Dict, Hashable, Iterator, List, Optional, Tuple
+from collections.abc import Mapping, Sequence
+import json
+import os
+import struct
+import networkx as nx
+import numpy as np
+
+from .compact_graph import CompactGraph, Categories
+
+MAGIC = b"SDKGRAPH"
+FORMAT_VERSION = 1
+GRAPH_FILE_EXTENSION = ".kgb"  # Only names with this extension are written in the binary format
+XML_FORMAT_GRAPHML = "graphml"
+XML_FORMAT_GEXF = "gexf"
+ALIGNMENT = 64
+_PREAMBLE = struct.Struct("<8sIQ")  # magic, format version, header length
+
+# Graph attribute listing edge/node attributes stored as JSON strings in GraphML/GEXF files
+JSON_ATTRIBUTES_KEY = "json_attributes"
+# Decoded when a file does not list its JSON attributes (GEXF drops graph attributes)
+DEFAULT_JSON_ATTRIBUTES = ("evidence",)
+
+# CompactGraph arrays written as sections, in file order
+_ARRAY_SECTIONS = [
+    "node_type", "node_source", "node_confidence", "node_flags",
+    "indptr", "indices", "edge_ids",
+    "weight", "rel_type", "evidence_count", "edge_flags", "evidence_offsets"
+]
+_DIRECTED_SECTIONS = ["in_indptr", "in_indices", "in_edge_ids"]
+
+
+def _align(offset: int) -> int:
+    return (offset + ALIGNMENT - 1) // ALIGNMENT * ALIGNMENT
+
+
+def _decode_json_label(value: Any) -> Hashable:
+    """JSON arrays come back as tuples so that decoded node labels are hashable"""
+    if isinstance(value, list):
+        return tuple(_decode_json_label(item) for item in value)
+    return value
+
+
+class StringTable(Sequence):
+    """Node labels decoded on access from a UTF-8 blob and an offsets array"""
+    def __init__(self, blob: np.ndarray, offsets: np.ndarray, encoding: str):
+        """
+        Args:
+            blob: Concatenated encoded labels (uint8)
+            offsets: Start of every label in blob (length num_labels + 1)
+            encoding: "str" for plain UTF-8 strings, "json" for JSON-encoded labels
+        """
+        self.blob = blob
+        self.offsets = offsets
+        self.encoding = encoding
+
+    def raw(self, i: int) -> bytes:
+        return self.blob[self.offsets[i]:self.offsets[i + 1]].tobytes()
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError(i)
+        text = self.raw(i).decode("utf-8")
+        return text if self.encoding == "str" else _decode_json_label(json.loads(text))
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+
+class SortedIndex(Mapping):
+    """
+    Label -> node ID lookup by binary search over the encoded labels' sort order
+    Needs no hash table in memory, so opening a graph stays O(1)
+    """
+    def __init__(self, labels: StringTable, order: np.ndarray):
+        """
+        Args:
+            labels: Node string table
+            order: Node IDs sorted by encoded label bytes
+        """
+        self.labels = labels
+        self.order = order
+
+    def _encode(self, label: Hashable) -> bytes:
+        if self.labels.encoding == "str":
+            if not isinstance(label, str):
+                raise KeyError(label)
+            return label.encode("utf-8")
+        return json.dumps(label).encode("utf-8")
+
+    def __getitem__(self, label: Hashable) -> int:
+        key = self._encode(label)
+        lo, hi = 0, len(self.order)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self.labels.raw(int(self.order[mid])) < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo < len(self.order) and self.labels.raw(int(self.order[lo])) == key:
+            return int(self.order[lo])
+        raise KeyError(label)
+
+    def __contains__(self, label: Hashable) -> bool:
+        try:
+            self[label]
+        except (KeyError, TypeError):
+            return False
+        return True
+
+    def __iter__(self) -> Iterator[Hashable]:
+        return iter(self.labels)
+
+    def __len__(self) -> int:
+        return len(self.labels)
+
+
+class RecordTable(Sequence):
+    """Evidence records decoded on access from a JSON blob and an offsets array"""
+    def __init__(self, blob: np.ndarray, offsets: np.ndarray):
+        self.blob = blob
+        self.offsets = offsets
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError(i)
+        return json.loads(self.blob[self.offsets[i]:self.offsets[i + 1]].tobytes().decode("utf-8"))
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+
+def _encode_strings(values: List[bytes]) -> Tuple[np.ndarray, np.ndarray]:
+    """(uint8 blob, int64 offsets) of encoded strings"""
+    lengths = np.fromiter((len(value) for value in values), dtype=np.int64, count=len(values))
+    offsets = np.zeros(len(values) + 1, dtype=np.int64)
+    np.cumsum(lengths, out=offsets[1:])
+    blob = np.frombuffer(b"".join(values), dtype=np.uint8) if values else np.zeros(0, dtype=np.uint8)
+    return blob, offsets
+
+
+def save_compact(compact: CompactGraph, path: str, metadata: Optional[Dict] = None) -> None:
+    """
+    Write a compact graph in the binary format
+    Args:
+        compact: Graph snapshot (see CompactGraph.from_networkx)
+        path: Output file
+        metadata: JSON-serializable file metadata, restored as CompactGraph.metadata
+                  (default: the snapshot's own metadata)
+    """
+    label_encoding = "str" if all(isinstance(node, str) for node in compact.nodes) else "json"
+    if label_encoding == "str":
+        encoded = [node.encode("utf-8") for node in compact.nodes]
+    else:
+        encoded = [json.dumps(node).encode("utf-8") for node in compact.nodes]
+    label_blob, label_offsets = _encode_strings(encoded)
+    order = np.array(sorted(range(len(encoded)), key=encoded.__getitem__), dtype=np.int64)
+    evidence_blob, record_offsets = _encode_strings(
+        [json.dumps(record, default=str).encode("utf-8") for record in compact.evidence]
+    )
+    extras = json.dumps({
+        "node": {str(i): data for i, data in compact.node_extra.items()},
+        "edge": {str(e): data for e, data in compact.edge_extra.items()}
+    }, default=str).encode("utf-8")
+
+    arrays = {name: getattr(compact, name) for name in _ARRAY_SECTIONS}
+    if compact.directed:
+        arrays.update({name: getattr(compact, name) for name in _DIRECTED_SECTIONS})
+    arrays.update({
+        "label_blob": label_blob, "label_offsets": label_offsets, "label_order": order,
+        "evidence_blob": evidence_blob, "record_offsets": record_offsets,
+        "extras": np.frombuffer(extras, dtype=np.uint8)
+    })
+
+    sections, offset = {}, 0
+    for name, array in arrays.items():
+        array = np.ascontiguousarray(array)
+        arrays[name] = array
+        sections[name] = {"offset": offset, "dtype": array.dtype.str, "shape": list(array.shape)}
+        offset = _align(offset + array.nbytes)
+
+    header = json.dumps({
+        "directed": compact.directed,
+        "graph_attributes": compact.graph_attributes,
+        "num_nodes": compact.num_nodes,
+        "num_edges": compact.num_edges,
+        "label_encoding": label_encoding,
+        "node_types": compact.node_types.values,
+        "node_sources": compact.node_sources.values,
+        "rel_types": compact.rel_types.values,
+        "metadata": compact.metadata if metadata is None else metadata,
+        "sections": sections
+    }, default=str).encode("utf-8")
+    data_start = _align(_PREAMBLE.size + len(header))
+
+    temporary = path + ".tmp"
+    with open(temporary, "wb") as f:
+        f.write(_PREAMBLE.pack(MAGIC, FORMAT_VERSION, len(header)))
+        f.write(header)
+        for name, array in arrays.items():
+            f.seek(data_start + sections[name]["offset"])
+            if array.nbytes:
+                f.write(memoryview(array.reshape(-1).view(np.uint8)))
+        f.truncate(data_start + offset)
+    os.replace(temporary, path)  # Readers never see a partially written file
+
+
+def _categories(values: List[Hashable]) -> Categories:
+    categories = Categories()
+    for value in values:
+        categories.encode(value)
+    return categories
+
+
+def load_compact(path: str) -> CompactGraph:
+    """
+    Open a graph written by save_compact
+    Arrays are memory-mapped read-only; labels and evidence are decoded on access
+    Args:
+        path: Graph file
+    Raises:
+        ValueError: If the file is not a graph file of a supported version
+    """
+    with open(path, "rb") as f:
+        magic, version, header_length = _PREAMBLE.unpack(f.read(_PREAMBLE.size))
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a binary graph file")
+        if version != FORMAT_VERSION:
+            raise ValueError(f"Unsupported graph file version {version} in {path}")
+        header = json.loads(f.read(header_length).decode("utf-8"))
+
+    data_start = _align(_PREAMBLE.size + header_length)
+    raw = np.memmap(path, dtype=np.uint8, mode="r")
+
+    def section(name: str) -> np.ndarray:
+        spec = header["sections"][name]
+        dtype = np.dtype(spec["dtype"])
+        count = int(np.prod(spec["shape"], dtype=np.int64))
+        start = data_start + spec["offset"]
+        return raw[start:start + count * dtype.itemsize].view(dtype).reshape(spec["shape"])
+
+    compact = CompactGraph()
+    compact.directed = header["directed"]
+    compact.graph_attributes = header["graph_attributes"]
+    compact.metadata = header.get("metadata", {})
+    for name in _ARRAY_SECTIONS:
+        setattr(compact, name, section(name))
+    if compact.directed:
+        for name in _DIRECTED_SECTIONS:
+            setattr(compact, name, section(name))
+    else:
+        compact.in_indptr, compact.in_indices, compact.in_edge_ids = compact.indptr, compact.indices, compact.edge_ids
+    compact.node_types = _categories(header["node_types"])
+    compact.node_sources = _categories(header["node_sources"])
+    compact.rel_types = _categories(header["rel_types"])
+
+    labels = StringTable(section("label_blob"), section("label_offsets"), header["label_encoding"])
+    compact.nodes = labels
+    compact.index = SortedIndex(labels, section("label_order"))
+    compact.evidence = RecordTable(section("evidence_blob"), section("record_offsets"))
+    extras = json.loads(section("extras").tobytes().decode("utf-8"))
+    compact.node_extra = {int(i): data for i, data in extras["node"].items()}
+    compact.edge_extra = {int(e): data for e, data in extras["edge"].items()}
+    return compact
+
+
+def is_binary_graph_file(path: str) -> bool:
+    """Whether a file is in the binary format (by its magic bytes, whatever its name)"""
+    with open(path, "rb") as f:
+        return f.read(len(MAGIC)) == MAGIC
+
+
+def xml_graph_format(path: str, default: str = XML_FORMAT_GRAPHML) -> str:
+    """
+    XML format of a graph file: by extension, else by the root element of an existing file, else default
+    Returns:
+        XML_FORMAT_GRAPHML or XML_FORMAT_GEXF
+    """
+    lowered = path.lower()
+    if lowered.endswith(".gexf"):
+        return XML_FORMAT_GEXF
+    if lowered.endswith(".graphml"):
+        return XML_FORMAT_GRAPHML
+    if os.path.exists(path):
+        with open(path, "rb") as f:
+            head = f.read(4096)
+        if b"<gexf" in head:
+            return XML_FORMAT_GEXF
+        if b"<graphml" in head:
+            return XML_FORMAT_GRAPHML
+    return default
+
+
+def _encode_for_xml(graph: nx.Graph) -> nx.Graph:
+    """Copy of graph with list/dict attribute values JSON-encoded, as GraphML/GEXF only hold scalars"""
+    encoded = graph.__class__()
+    encoded.graph.update(graph.graph)
+    json_keys = set()
+
+    def convert(data: Dict) -> Dict:
+        converted = {}
+        for key, value in data.items():
+            if isinstance(value, (list, dict, tuple)):
+                converted[key] = json.dumps(value, default=str)
+                json_keys.add(key)
+            elif value is None:
+                continue  # Not representable in GraphML
+            else:
+                converted[key] = value
+        return converted
+
+    encoded.add_nodes_from((node, convert(data)) for node, data in graph.nodes(data=True))
+    encoded.add_edges_from((u, v, convert(data)) for u, v, data in graph.edges(data=True))
+    if json_keys:
+        encoded.graph[JSON_ATTRIBUTES_KEY] = ",".join(sorted(json_keys))
+    return encoded
+
+
+def _decode_from_xml(graph: nx.Graph) -> nx.Graph:
+    """Decode the attributes _encode_for_xml stored as JSON strings, in place"""
+    listed = graph.graph.pop(JSON_ATTRIBUTES_KEY, None)
+    keys = [key for key in listed.split(",") if key] if listed is not None else DEFAULT_JSON_ATTRIBUTES
+    for _, data in list(graph.nodes(data=True)) + [(None, d) for _, _, d in graph.edges(data=True)]:
+        for key in keys:
+            if isinstance(data.get(key), str):
+                try:
+                    data[key] = json.loads(data[key])
+                except ValueError:
+                    pass
+    return graph
+
+
+def write_xml_graph(graph: nx.Graph, path: str, default_format: str = XML_FORMAT_GRAPHML) -> None:
+    """
+    Write GraphML or GEXF, JSON-encoding list-valued attributes such as evidence
+    Args:
+        graph: Graph to write
+        path: Output file (.graphml/.gexf select the format)
+        default_format: Format for other names
+    """
+    encoded = _encode_for_xml(graph)
+    if xml_graph_format(path, default_format) == XML_FORMAT_GEXF:
+        nx.write_gexf(encoded, path)
+    else:
+        nx.write_graphml(encoded, path)
+
+
+def read_xml_graph(path: str, default_format: str = XML_FORMAT_GRAPHML) -> nx.Graph:
+    """Read GraphML or GEXF (see xml_graph_format), decoding attributes written by write_xml_graph"""
+    if xml_graph_format(path, default_format) == XML_FORMAT_GEXF:
+        graph = nx.read_gexf(path)
+    else:
+        graph = nx.read_graphml(path)
+    return _decode_from_xml(graph)
+
+
+def convert_xml_to_binary(source: str, destination: str) -> None:
+    """Convert a GraphML/GEXF file to the binary format"""
+    save_compact(CompactGraph.from_networkx(read_xml_graph(source)), destination)
+
+
+def convert_binary_to_xml(source: str, destination: str) -> None:
+    """Convert a binary graph file to GraphML or GEXF (by the destination's extension)"""
+    write_xml_graph(load_compact(source).to_networkx(), destination)
+
+
+def write_graph_file(graph: nx.Graph, path: str, default_format: str = XML_FORMAT_GRAPHML) -> None:
+    """
+    Save a graph: binary for GRAPH_FILE_EXTENSION names, GraphML/GEXF otherwise
+    Args:
+        graph: NetworkX graph or compact view
+        path: Output file
+        default_format: XML format for names that are neither .graphml nor .gexf
+    """
+    if not path.lower().endswith(GRAPH_FILE_EXTENSION):
+        write_xml_graph(graph, path, default_format)
+        return
+    compact = getattr(graph, "compact", None)
+    save_compact(compact if isinstance(compact, CompactGraph) else CompactGraph.from_networkx(graph), path)
+
+
+def read_graph_file(path: str, default_format: str = XML_FORMAT_GRAPHML) -> nx.Graph:
+    """
+    Load a graph written by write_graph_file or an older GraphML/GEXF cache, whatever its name
+    Args:
+        path: Graph file; the binary format is recognized by its magic bytes
+        default_format: XML format assumed when neither the name nor the content tells
+    Returns:
+        A read-only memory-mapped compact view for binary files, a mutable NetworkX graph otherwise
+    """
+    if is_binary_graph_file(path):
+        return load_compact(path).view()
+    return read_xml_graph(path, default_format)
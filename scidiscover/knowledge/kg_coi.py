@@ -2,14 +2,305 @@
 KG-COI (Knowledge Graph - Concept Oriented Inference) implementation
 Based on Buehler et al. 2024 (Machine Learning: Science and Technology)
 """
-from typing import List, Dict, Tuple, Optional
+from typing import List, Dict, Tuple, Optional, Hashable, Iterable
+from collections import OrderedDict, deque
 import networkx as nx
 import json
-from ..config import GRAPH_CACHE_DIR
+from ..config import (
+    GRAPH_CACHE_DIR, CENTRALITY_EXACT_THRESHOLD, CENTRALITY_PIVOTS,
+    WALK_PROCESSES, WALK_PARALLEL_MIN_WALKS, WALK_BATCH_WALKS, GRAPH_BACKEND, GRAPH_LOG_COMPACT_THRESHOLD,
+    GRAPH_COMPACT_CHANGE_FRACTION, COMMUNITY_REBUILD_FRACTION
+)
+from .compact_graph import CompactGraph, CompactGraphView, CompactDiGraphView, GRAPH_BACKEND_COMPACT
+from .graph_store import read_graph_file, write_graph_file, XML_FORMAT_GRAPHML
+from .graph_log import (
+    VersionedGraphStore, apply_graph_changes, ADD_NODE, ADD_EDGE, CLEAR
+)
+from .walk_engine import AliasTables, CSRGraph, RandomWalkEngine
+from .parallel_walks import ParallelWalkSampler, sample_paths_batched
+from .path_search import KShortestPaths, PathMatrix, many_to_many_paths
+from .communities import CommunityIndex, COMMUNITY_LOUVAIN, COMMUNITY_COMPONENTS
+from .importance import (
+    ImportanceEngine, IMPORTANCE_METHODS, IMPORTANCE_DEGREE, IMPORTANCE_PAGERANK, personalized_pagerank_push
+)
+import heapq
+import math
 import os
 import random
 import numpy as np
 
+
+def pivots_for_error(num_nodes: int, error: float, delta: float = 0.1) -> int:
+    """
+    Number of sampled pivots keeping the approximate betweenness of every node within
+    +/- error (normalized scale) with probability 1 - delta (Hoeffding and union bounds)
+    """
+    if num_nodes <= 0:
+        return 0
+    return min(num_nodes, math.ceil(math.log(2 * num_nodes / delta) / (2 * error ** 2)))
+
+
+class CentralityService:
+    """
+    Betweenness centrality cached per graph version
+
+    Uses exact Brandes betweenness for small graphs and k-pivot sampled betweenness
+    (Brandes & Pich 2007) for large ones. Per-pivot dependencies are kept so that
+    added nodes and edges only recompute the pivots whose shortest-path DAG they change:
+    a new edge (u, v) leaves pivot s untouched when d(s, u) == d(s, v).
+    """
+    def __init__(self, pivots: Optional[int] = CENTRALITY_PIVOTS, error: Optional[float] = None,
+                 exact_threshold: int = CENTRALITY_EXACT_THRESHOLD, seed: int = 42):
+        """
+        Args:
+            pivots: Number of sampled pivots for graphs above exact_threshold
+            error: Alternative to pivots: target absolute error of the normalized scores
+            exact_threshold: Maximum number of nodes for exact computation
+            seed: Seed for pivot sampling
+        """
+        self.pivots = pivots
+        self.error = error
+        self.exact_threshold = exact_threshold
+        self.seed = seed
+        self.stats = {"full_builds": 0, "incremental_updates": 0, "pivot_recomputations": 0}
+        self._reset()
+
+    def _reset(self) -> None:
+        self._key = None
+        self._directed = False
+        self._nodes = []
+        self._index = {}
+        self._adjacency = []
+        self._predecessors = []
+        self._pivots = []
+        self._exact = True
+        self._sampled_size = 0
+        self._distances = {}
+        self._sigmas = {}
+        self._dependencies = {}
+        self._total = np.zeros(0)
+        self._scores = None
+
+    def invalidate(self) -> None:
+        """Drop all cached state"""
+        self._reset()
+
+    def betweenness(self, graph: nx.Graph, key: Hashable) -> Dict[Hashable, float]:
+        """
+        Normalized betweenness centrality of every node
+        Args:
+            graph: Graph to score
+            key: Key identifying the graph and its version; scores are recomputed only when it changes
+        Returns:
+            Dictionary mapping nodes to (exact or approximate) betweenness
+        """
+        if self._key != key:
+            self._build(graph, key)
+        if self._scores is None:
+            self._scores = self._rescale()
+        return self._scores
+
+    def apply_update(self, graph: nx.Graph, key_before: Hashable, key_after: Hashable,
+                     new_nodes: Iterable[Hashable], new_edges: Iterable[Tuple[Hashable, Hashable]]) -> None:
+        """
+        Incrementally account for nodes and edges added to the graph
+
+        A new node attached by a single edge (the common case when concepts are added)
+        only adds dependency along the shortest paths to its attachment point, which is
+        propagated up each pivot's shortest-path DAG. Pivots whose distances change
+        because of other new edges are recomputed.
+
+        Args:
+            graph: The updated graph
+            key_before: Version key the cached state must match to be updated in place
+            key_after: Version key of the updated graph
+            new_nodes: Nodes that did not exist before
+            new_edges: Edges that did not exist before
+        """
+        if self._key is None:
+            return  # Nothing cached yet; the next query builds from scratch
+        if self._key != key_before:
+            self.invalidate()
+            return
+
+        first_new = len(self._nodes)
+        for node in new_nodes:
+            if node not in self._index:
+                self._index[node] = len(self._nodes)
+                self._nodes.append(node)
+                self._adjacency.append([])
+                if self._directed:
+                    self._predecessors.append([])
+        num_nodes = len(self._nodes)
+        if self._exact and num_nodes > self.exact_threshold or not self._exact and num_nodes > 2 * self._sampled_size:
+            # The pivot set no longer represents the graph; rebuild lazily
+            self.invalidate()
+            return
+
+        edges = []
+        batch_degree = {}
+        for u, v in new_edges:
+            iu, iv = self._index[u], self._index[v]
+            self._adjacency[iu].append(iv)
+            if self._directed:
+                self._predecessors[iv].append(iu)
+            else:
+                self._adjacency[iv].append(iu)  # Predecessor lists alias the adjacency lists
+            edges.append((iu, iv))
+            for index in (iu, iv):
+                batch_degree[index] = batch_degree.get(index, 0) + 1
+
+        # Split new edges into pendant attachments (new node -> existing node) and the rest
+        pendants, structural = [], []
+        for iu, iv in edges:
+            if iv >= first_new and iu < first_new and batch_degree[iv] == 1:
+                pendants.append((iv, iu))
+            elif iu >= first_new and iv < first_new and batch_degree[iu] == 1:
+                if not self._directed:
+                    pendants.append((iu, iv))
+                # A new node with a single outgoing edge lies on no shortest path from a pivot
+            else:
+                structural.append((iu, iv))
+
+        self._total = np.concatenate([self._total, np.zeros(num_nodes - len(self._total))])
+        for pivot in self._pivots:
+            padding = num_nodes - len(self._distances[pivot])
+            if padding:
+                self._distances[pivot] = np.concatenate([self._distances[pivot], np.full(padding, -1, dtype=np.int32)])
+                self._sigmas[pivot] = np.concatenate([self._sigmas[pivot], np.zeros(padding)])
+                self._dependencies[pivot] = np.concatenate([self._dependencies[pivot], np.zeros(padding)])
+
+            distances = self._distances[pivot]
+            if any(self._edge_affects(distances, iu, iv) for iu, iv in structural):
+                self._total -= self._dependencies[pivot]
+                self._accumulate_pivot(pivot)
+            else:
+                for node, attachment in pendants:
+                    self._attach_pendant(pivot, node, attachment)
+
+        if self._exact:
+            # Every node is a pivot in exact mode, including the new ones
+            new_pivots = list(range(len(self._pivots), num_nodes))
+            self._pivots.extend(new_pivots)
+            for pivot in new_pivots:
+                self._accumulate_pivot(pivot)
+
+        self._key = key_after
+        self._scores = None
+        self.stats["incremental_updates"] += 1
+
+    def _attach_pendant(self, pivot: int, node: int, attachment: int) -> None:
+        """
+        Add a new node hanging off an existing attachment node to one pivot's state
+        Its pair dependency sigma(s,v) * sigma(v,u) / sigma(s,u) is pushed from the
+        attachment node u up the shortest-path DAG, one distance level at a time
+        """
+        distances = self._distances[pivot]
+        sigmas = self._sigmas[pivot]
+        dependencies = self._dependencies[pivot]
+        level = int(distances[attachment])
+        if level < 0:
+            return  # Not reachable from this pivot
+        distances[node] = level + 1
+        sigmas[node] = sigmas[attachment]
+
+        frontier = {attachment: 1.0}
+        while level > 0:
+            next_frontier = {}
+            for w, flow in frontier.items():
+                dependencies[w] += flow
+                self._total[w] += flow
+                coefficient = flow / sigmas[w]
+                for v in self._predecessors[w]:
+                    if distances[v] == level - 1:
+                        next_frontier[v] = next_frontier.get(v, 0.0) + sigmas[v] * coefficient
+            frontier = next_frontier
+            level -= 1
+        # The remaining frontier is the pivot itself, which is an endpoint and not counted
+
+    def _edge_affects(self, distances: np.ndarray, iu: int, iv: int) -> bool:
+        """Whether a new edge changes the shortest-path DAG rooted at a pivot"""
+        du, dv = distances[iu], distances[iv]
+        if self._directed:
+            return du >= 0 and (dv < 0 or du + 1 <= dv)
+        return du != dv
+
+    def _build(self, graph: nx.Graph, key: Hashable) -> None:
+        """Compute all pivot dependencies from scratch"""
+        self._reset()
+        self._key = key
+        self._directed = graph.is_directed()
+        self._nodes = list(graph.nodes())
+        self._index = {node: index for index, node in enumerate(self._nodes)}
+        neighbors = graph.successors if self._directed else graph.neighbors
+        self._adjacency = [[self._index[other] for other in neighbors(node)] for node in self._nodes]
+        if self._directed:
+            self._predecessors = [[self._index[other] for other in graph.predecessors(node)] for node in self._nodes]
+        else:
+            self._predecessors = self._adjacency
+
+        num_nodes = len(self._nodes)
+        self._total = np.zeros(num_nodes)
+        pivots = self.pivots
+        if self.error is not None:
+            pivots = pivots_for_error(num_nodes, self.error)
+        self._exact = num_nodes <= self.exact_threshold or not pivots or pivots >= num_nodes
+        if self._exact:
+            self._pivots = list(range(num_nodes))
+        else:
+            self._pivots = random.Random(self.seed).sample(range(num_nodes), pivots)
+        self._sampled_size = num_nodes
+
+        for pivot in self._pivots:
+            self._accumulate_pivot(pivot)
+        self.stats["full_builds"] += 1
+
+    def _accumulate_pivot(self, source: int) -> None:
+        """Brandes single-source shortest paths and dependency accumulation for one pivot"""
+        num_nodes = len(self._nodes)
+        adjacency = self._adjacency
+        distance = [-1] * num_nodes
+        sigma = [0.0] * num_nodes
+        predecessors = [[] for _ in range(num_nodes)]
+        distance[source] = 0
+        sigma[source] = 1.0
+        order = []
+        queue = deque([source])
+        while queue:
+            v = queue.popleft()
+            order.append(v)
+            next_distance = distance[v] + 1
+            for w in adjacency[v]:
+                if distance[w] < 0:
+                    distance[w] = next_distance
+                    queue.append(w)
+                if distance[w] == next_distance:
+                    sigma[w] += sigma[v]
+                    predecessors[w].append(v)
+
+        dependency = [0.0] * num_nodes
+        for w in reversed(order):
+            coefficient = (1.0 + dependency[w]) / sigma[w]
+            for v in predecessors[w]:
+                dependency[v] += sigma[v] * coefficient
+        dependency[source] = 0.0  # Endpoints are not counted
+
+        dependency = np.array(dependency)
+        self._distances[source] = np.array(distance, dtype=np.int32)
+        self._sigmas[source] = np.array(sigma)
+        self._dependencies[source] = dependency
+        self._total += dependency
+        self.stats["pivot_recomputations"] += 1
+
+    def _rescale(self) -> Dict[Hashable, float]:
+        """Normalize accumulated dependencies like nx.betweenness_centrality"""
+        num_nodes = len(self._nodes)
+        scale = 1.0 / ((num_nodes - 1) * (num_nodes - 2)) if num_nodes > 2 else 1.0
+        if not self._exact:
+            scale *= num_nodes / len(self._pivots)
+        return {node: float(value) * scale for node, value in zip(self._nodes, self._total)}
+
+
 class KGCOIManager:
     def __init__(self):
         """Initialize KG-COI manager"""
@@ -17,6 +308,177 @@ class KGCOIManager:
         self.cache_dir = GRAPH_CACHE_DIR
         os.makedirs(self.cache_dir, exist_ok=True)
 
+        # Incremented whenever the graph is modified through this manager; caches are keyed on it
+        self.graph_version = 0
+        # "compact": built graphs are kept as read-only CompactGraph views (see maybe_compact)
+        self.backend = GRAPH_BACKEND
+        self.compact_change_fraction = GRAPH_COMPACT_CHANGE_FRACTION
+        self._uncompacted_changes = 0  # Changes applied to the mutable graph since it was last compacted
+        self._graph_alias = None  # (graph, identity) after a representation swap
+        # Optional snapshot + delta log that every change batch is appended to (see open_store)
+        self.store: Optional[VersionedGraphStore] = None
+        # Hop distances to a target concept, keyed by (graph key, target)
+        self._distance_cache = OrderedDict()
+        self.distance_cache_size = 32
+        # Betweenness centrality, cached per graph version and updated incrementally
+        self.centrality = CentralityService()
+        # Whole-graph community partitions by method, cached per graph version and updated incrementally
+        self.communities: Dict[str, CommunityIndex] = {}
+        # PageRank, eigenvector and degree scores over a sparse adjacency matrix, cached per graph version
+        self.importance = ImportanceEngine()
+        # CSR adjacency for the vectorized walk engine, rebuilt when the graph key changes
+        self._csr = None
+        self._csr_key = None
+        # Walk transition weights and alias tables, keyed by (graph key, target, novelty weight)
+        self._transition_cache = OrderedDict()
+        self.transition_cache_size = 8
+        # Parallel mode: walk batches run in worker processes over shared-memory arrays
+        self.walk_processes = os.cpu_count() if WALK_PROCESSES is None else WALK_PROCESSES
+        self.parallel_min_walks = WALK_PARALLEL_MIN_WALKS
+        self.walk_batch_walks = WALK_BATCH_WALKS
+        self._walk_sampler = None
+        # Resumable k-shortest path searches, keyed by (graph key, endpoints, constraints)
+        self._path_searches = OrderedDict()
+        self.path_search_cache_size = 16
+        # Many-to-many cheapest path matrices, keyed by (graph key, sources, targets, weight)
+        self._path_matrices = OrderedDict()
+        self.path_matrix_cache_size = 16
+
+    def _bump_version(self) -> None:
+        """Mark the graph as modified, invalidating version-keyed caches"""
+        self.graph_version += 1
+
+    def _graph_key(self) -> Tuple:
+        """
+        Cache key of the current graph state
+        Combines the version counter with O(1) fingerprints, so replacing self.graph or
+        adding/removing nodes on it directly is also detected
+        """
+        return (self.graph_version, self._graph_identity(), self.graph.number_of_nodes())
+
+    def _graph_identity(self) -> int:
+        """Identity of the graph object, preserved across representation swaps"""
+        if self._graph_alias is not None and self._graph_alias[0] is self.graph:
+            return self._graph_alias[1]
+        return id(self.graph)
+
+    def _swap_graph(self, graph: nx.Graph) -> None:
+        """Replace the graph by another representation of the same content, keeping caches valid"""
+        identity = self._graph_identity()
+        self.graph = graph
+        self._graph_alias = (graph, identity)
+
+    def _mutable_graph(self) -> nx.Graph:
+        """The graph as a mutable NetworkX graph, converting a compact view back if needed"""
+        if isinstance(self.graph, (CompactGraphView, CompactDiGraphView)):
+            self._swap_graph(self.graph.to_networkx())
+        return self.graph
+
+    def _store_graph(self) -> None:
+        """Convert a freshly built or loaded graph to the configured backend"""
+        if self.backend == GRAPH_BACKEND_COMPACT and not isinstance(self.graph, (CompactGraphView, CompactDiGraphView)):
+            self._swap_graph(CompactGraph.from_networkx(self.graph).view())
+        self._uncompacted_changes = 0
+
+    def maybe_compact(self, force: bool = False) -> bool:
+        """
+        Compact the mutable graph for the "compact" backend once enough changes have accumulated
+        Change batches are applied to a mutable NetworkX graph that stays in place between batches:
+        converting in both directions costs O(V+E), so it is only done after changes amounting to
+        compact_change_fraction of the graph (a rebuild compacts at once)
+        Args:
+            force: Compact regardless of the number of changes
+        Returns:
+            Whether the graph was compacted
+        """
+        if self.backend != GRAPH_BACKEND_COMPACT or isinstance(self.graph, (CompactGraphView, CompactDiGraphView)):
+            return False
+        size = self.graph.number_of_nodes() + self.graph.number_of_edges()
+        if not force and self._uncompacted_changes < self.compact_change_fraction * size:
+            return False
+        self._store_graph()
+        return True
+
+    def target_distances(self, target: Hashable) -> Dict[Hashable, int]:
+        """
+        Hop distance from every node to a target concept
+        Computed with a single reverse BFS from the target and cached per graph version
+        Args:
+            target: Target concept node
+        Returns:
+            Dictionary mapping each node that can reach the target to its distance
+        """
+        key = (self._graph_key(), target)
+        distances = self._distance_cache.get(key)
+        if distances is not None:
+            self._distance_cache.move_to_end(key)
+            return distances
+
+        if target not in self.graph:
+            distances = {}
+        else:
+            # Distances *to* the target follow reversed edges in a directed graph
+            graph = self.graph.reverse(copy=False) if self.graph.is_directed() else self.graph
+            distances = nx.single_source_shortest_path_length(graph, target)
+
+        self._distance_cache[key] = distances
+        while len(self._distance_cache) > self.distance_cache_size:
+            self._distance_cache.popitem(last=False)
+        return distances
+
+    def open_store(self, name: str) -> nx.Graph:
+        """
+        Attach a versioned graph store in the cache directory and load its latest version
+        Later changes made through apply_changes are appended to the store's delta log
+        Args:
+            name: Graph name (files <name>.kgb and <name>.log)
+        Returns:
+            The loaded graph
+        """
+        self.store = VersionedGraphStore(self.cache_dir, name, GRAPH_LOG_COMPACT_THRESHOLD)
+        self.graph = self.store.load()
+        # Keep versions monotonic for this manager's caches as well as for the log
+        self.graph_version = max(self.graph_version + 1, self.store.version)
+        self._store_graph()
+        return self.graph
+
+    def apply_changes(self, changes: List[Dict]) -> int:
+        """
+        Apply a batch of node/edge changes as one new graph version
+        Centrality and communities are updated incrementally for pure additions; other version-keyed
+        caches (distances, walk transitions, path searches) are invalidated by the new version.
+        With the compact backend, batches go to a mutable graph that maybe_compact compacts periodically
+        Args:
+            changes: Change dicts (see graph_log: add/update/remove node or edge, clear)
+        Returns:
+            The new graph version
+        """
+        graph = self._mutable_graph()
+        key_before = self._graph_key()
+        new_nodes, new_edges, removed = apply_graph_changes(graph, changes)
+        self._bump_version()
+        if removed:
+            self.centrality.invalidate()
+            for index in self.communities.values():
+                index.invalidate()
+        else:
+            key_after = self._graph_key()
+            self.centrality.apply_update(graph, key_before, key_after, new_nodes, new_edges)
+            # Edge changes on existing edges can change weighted degrees used by Louvain
+            touched = [change[end] for change in changes for end in ("source", "target") if end in change]
+            for index in self.communities.values():
+                index.apply_update(graph, key_before, key_after, new_nodes, new_edges, touched)
+
+        self._uncompacted_changes += len(changes)
+        if self.store is not None:
+            self.store.append(changes, self.graph_version)
+            if self.store.pending_changes >= self.store.compact_threshold:
+                # The new snapshot is written from the compact graph
+                self.maybe_compact(force=True)
+            self.store.maybe_compact(self.graph)
+        self.maybe_compact()
+        return self.graph_version
+
     def build_concept_graph(self, concepts: List[str], relationships: List[Dict]) -> nx.Graph:
         """
         Build a concept-oriented knowledge graph
@@ -25,93 +487,171 @@ class KGCOIManager:
             relationships: List of relationship dictionaries between concepts
         """
         # Create concept nodes
-        for concept in concepts:
-            self.graph.add_node(concept, type="concept")
+        changes = [{"op": ADD_NODE, "node": concept, "attrs": {"type": "concept"}} for concept in concepts]
 
         # Add relationships with metadata
         for rel in relationships:
-            source = rel["source"]
-            target = rel["target"]
-            rel_type = rel["type"]
-            evidence = rel.get("evidence", [])
-
-            self.graph.add_edge(
-                source,
-                target,
-                type=rel_type,
-                evidence=evidence
-            )
+            changes.append({
+                "op": ADD_EDGE,
+                "source": rel["source"],
+                "target": rel["target"],
+                "attrs": {"type": rel["type"], "evidence": rel.get("evidence", [])}
+            })
 
+        self.apply_changes(changes)
         return self.graph
 
-    def build_evidence_weighted_graph(self, concepts: List[Dict], relationships: List[Dict]) -> nx.Graph:
+    def build_evidence_weighted_graph(self, concepts: List[Dict], relationships: List[Dict],
+                                      incremental: bool = False) -> nx.Graph:
         """
         Build a knowledge graph with evidence-weighted edges
         Args:
             concepts: List of concept dictionaries with metadata
             relationships: List of relationship dictionaries with evidence
+            incremental: Add to the existing graph, merging new evidence into existing edges,
+                         instead of rebuilding it
         """
-        # Clear existing graph
-        self.graph = nx.Graph()
+        changes = []
+        if not incremental:
+            # Rebuild in a new graph: graphs returned by earlier calls keep their content.
+            # The clear only records the rebuild in the store's delta log
+            self.graph = nx.Graph()
+            changes.append({"op": CLEAR})
 
         # Add concept nodes with metadata
         for concept in concepts:
-            self.graph.add_node(
-                concept["text"], 
-                type=concept.get("type", "concept"),
-                confidence=concept.get("confidence", 0.5),
-                source=concept.get("source", "unknown")
-            )
+            changes.append({
+                "op": ADD_NODE,
+                "node": concept["text"],
+                "attrs": {
+                    "type": concept.get("type", "concept"),
+                    "confidence": concept.get("confidence", 0.5),
+                    "source": concept.get("source", "unknown")
+                }
+            })
 
         # Add relationship edges with evidence weighting
+        merged = {}  # Edge -> evidence merged so far in this batch (incremental mode)
+        directed = self.graph.is_directed()
         for rel in relationships:
-            # Calculate evidence strength
-            evidence_count = len(rel.get("evidence", []))
-            pub_years = [e.get("year", 2020) for e in rel.get("evidence", [])]
-            recency_factor = sum([(y - 2000)/20 for y in pub_years]) / max(1, len(pub_years))
-
-            # Combine evidence factors into edge weight
-            weight = 0.5  # Base weight
-            if evidence_count > 0:
-                # More evidence = higher weight
-                weight += min(0.4, evidence_count * 0.1)
-
-            # Recency bonus/penalty
-            weight += recency_factor * 0.1
+            source, target = rel["source"], rel["target"]
+            evidence = rel.get("evidence", [])
+            if incremental:
+                edge = (source, target) if directed else frozenset((source, target))
+                if edge not in merged:
+                    merged[edge] = list(self.graph[source][target].get("evidence", [])) \
+                        if self.graph.has_edge(source, target) else []
+                known = {json.dumps(e, sort_keys=True, default=str) for e in merged[edge]}
+                merged[edge].extend(e for e in evidence if json.dumps(e, sort_keys=True, default=str) not in known)
+                evidence = list(merged[edge])
 
             # Add the edge with calculated weight
-            self.graph.add_edge(
-                rel["source"],
-                rel["target"],
-                type=rel.get("type", "relates_to"),
-                weight=weight,
-                evidence_count=evidence_count,
-                evidence=rel.get("evidence", [])
-            )
+            changes.append({
+                "op": ADD_EDGE,
+                "source": source,
+                "target": target,
+                "attrs": {
+                    "type": rel.get("type", "relates_to"),
+                    "weight": self._evidence_weight(evidence),
+                    "evidence_count": len(evidence),
+                    "evidence": evidence
+                }
+            })
 
+        self.apply_changes(changes)
         return self.graph
 
-    def sample_concept_paths(self, start_concept: str, end_concept: str, num_paths: int = 5) -> List[List[str]]:
+    @staticmethod
+    def _evidence_weight(evidence: List[Dict]) -> float:
+        """Edge weight from the amount and recency of its evidence"""
+        # Calculate evidence strength
+        evidence_count = len(evidence)
+        pub_years = [e.get("year", 2020) for e in evidence]
+        recency_factor = sum([(y - 2000)/20 for y in pub_years]) / max(1, len(pub_years))
+
+        # Combine evidence factors into edge weight
+        weight = 0.5  # Base weight
+        if evidence_count > 0:
+            # More evidence = higher weight
+            weight += min(0.4, evidence_count * 0.1)
+
+        # Recency bonus/penalty
+        weight += recency_factor * 0.1
+        return weight
+
+    def sample_concept_paths(self, start_concept: str, end_concept: str, num_paths: int = 5,
+                             max_path_length: Optional[int] = None,
+                             forbidden: Optional[Iterable[str]] = None) -> List[List[str]]:
+        """
+        Find the num_paths best supported distinct paths between concepts
+        Args:
+            start_concept: Starting concept node
+            end_concept: Target concept node
+            num_paths: Number of paths to return
+            max_path_length: Maximum number of concepts on a path
+            forbidden: Concepts the paths must avoid
+        Returns:
+            Loopless paths, cheapest -log(evidence weight) first
         """
-        Sample paths between concepts using random walks
+        return self.k_shortest_paths(start_concept, end_concept, max_path_length, forbidden).take(num_paths)
+
+    def k_shortest_paths(self, start_concept: str, end_concept: str, max_path_length: Optional[int] = None,
+                         forbidden: Optional[Iterable[str]] = None,
+                         weight: Optional[str] = "weight") -> KShortestPaths:
+        """
+        Resumable k-shortest loopless path search, cached per graph version
+        Iterate the result to get paths lazily, cheapest first; stop whenever enough are found
         Args:
             start_concept: Starting concept node
             end_concept: Target concept node
-            num_paths: Number of paths to sample
+            max_path_length: Maximum number of concepts on a path
+            forbidden: Concepts the paths must avoid
+            weight: Edge evidence attribute for -log(weight) costs, or None for hop counts
+        """
+        forbidden = frozenset(forbidden or ())
+        key = (self._graph_key(), start_concept, end_concept, max_path_length, forbidden, weight)
+        search = self._path_searches.get(key)
+        if search is not None:
+            self._path_searches.move_to_end(key)
+            return search
+
+        search = KShortestPaths(self.graph, start_concept, end_concept, weight, max_path_length, forbidden)
+        self._path_searches[key] = search
+        while len(self._path_searches) > self.path_search_cache_size:
+            self._path_searches.popitem(last=False)
+        return search
+
+    def concept_path_matrix(self, sources: Iterable[str], targets: Optional[Iterable[str]] = None,
+                            weight: Optional[str] = "weight") -> PathMatrix:
+        """
+        Cheapest evidence-weighted paths between all source and target concepts, cached per graph version
+        One search per concept of the smaller side covers all pairs (see many_to_many_paths)
+        Args:
+            sources: Source concepts
+            targets: Target concepts (default: the sources, for all pairs within one concept set)
+            weight: Edge evidence attribute for -log(weight) costs, or None for hop counts
+        Returns:
+            PathMatrix with distances (inf where unconnected) and witness paths
         """
-        paths = []
-        for _ in range(num_paths):
-            try:
-                path = nx.shortest_path(self.graph, start_concept, end_concept)
-                if path not in paths:
-                    paths.append(path)
-            except nx.NetworkXNoPath:
-                continue
+        sources = tuple(dict.fromkeys(sources))
+        targets = sources if targets is None else tuple(dict.fromkeys(targets))
+        key = (self._graph_key(), sources, targets, weight)
+        matrix = self._path_matrices.get(key)
+        if matrix is not None:
+            self._path_matrices.move_to_end(key)
+            return matrix
 
-        return paths
+        csr = self.csr_graph() if weight in ("weight", None) else CSRGraph.from_networkx(self.graph, weight)
+        matrix = many_to_many_paths(csr, sources, targets, self.graph.is_directed(), weight is not None)
+        self._path_matrices[key] = matrix
+        while len(self._path_matrices) > self.path_matrix_cache_size:
+            self._path_matrices.popitem(last=False)
+        return matrix
 
     def enhanced_concept_paths(self, start_concept: str, end_concept: str, num_paths: int = 5, 
-                             max_path_length: int = 10, novelty_weight: float = 3.0) -> List[List[str]]:
+                             max_path_length: int = 10, novelty_weight: float = 3.0,
+                             seed: Optional[int] = None, num_walks: Optional[int] = None,
+                             processes: Optional[int] = None) -> List[List[str]]:
         """
         Enhanced path sampling using weighted random walks and node centrality metrics
         Args:
@@ -120,71 +660,106 @@ class KGCOIManager:
             num_paths: Number of paths to return
             max_path_length: Maximum length of a path
             novelty_weight: Weighting factor for encouraging exploration of novel paths
+            seed: Optional seed for reproducible sampling
+            num_walks: Walks to sample (default num_paths * 4); raise it on large graphs
+            processes: Worker processes (default self.walk_processes); walks run in parallel
+                       when more than one and num_walks >= self.parallel_min_walks
         Returns:
             List of diverse concept paths between start and end concepts
         """
-        # Calculate node centrality to weight important concepts
+        # Per-edge transition weights and alias tables (cached per graph version, target and novelty)
+        engine, base_weights, alias_tables = self.walk_transitions(end_concept, novelty_weight)
+
+        # Weighted random walks, advanced in lockstep with O(1) alias-table steps
+        attempts = num_walks or num_paths * 4  # Sample more paths than needed to ensure diversity
+        processes = self.walk_processes if processes is None else processes
+        if processes > 1 and attempts >= self.parallel_min_walks:
+            paths = self.walk_sampler(processes).sample_paths(
+                self._transition_key(end_concept, novelty_weight), engine, base_weights, alias_tables,
+                start_concept, end_concept, attempts, max_path_length, novelty_weight, seed
+            )
+        else:
+            # Same batches and RNG streams as the workers, so a seed gives the same paths either way
+            paths = sample_paths_batched(
+                engine, base_weights, alias_tables, start_concept, end_concept, attempts,
+                max_path_length, novelty_weight, seed, self.walk_batch_walks
+            )
+
+        # Select most diverse paths
+        return self._diversify_paths(paths, num_paths)
+
+    def walk_transitions(self, end_concept: str,
+                         novelty_weight: float) -> Tuple[RandomWalkEngine, np.ndarray, AliasTables]:
+        """
+        Walk engine, per-edge base weights and alias tables for walks toward a target
+        Built once per (graph version, target, novelty weight) and kept in a small LRU cache,
+        so repeated path sampling between the same concepts skips all setup
+        Args:
+            end_concept: Target concept node
+            novelty_weight: Boost for stepping to a node not yet on the walk
+        Returns:
+            (engine, base_weights, alias_tables)
+        """
+        key = self._transition_key(end_concept, novelty_weight)
+        transitions = self._transition_cache.get(key)
+        if transitions is not None:
+            self._transition_cache.move_to_end(key)
+            return transitions
+
+        # Calculate node centrality to weight important concepts (cached per graph version)
         try:
-            centrality = nx.betweenness_centrality(self.graph)
-        except:
+            centrality = self.centrality.betweenness(self.graph, self._graph_key())
+        except (nx.NetworkXError, KeyError, ValueError, ZeroDivisionError) as e:
             # Fallback if centrality calculation fails
+            print(f"Centrality calculation failed, using uniform weights: {str(e)}")
             centrality = {node: 1.0 for node in self.graph.nodes()}
 
-        # Use centrality for weighted random walks
-        paths = []
-        attempts = num_paths * 4  # Sample more paths than needed to ensure diversity
-
-        for _ in range(attempts):
-            current = start_concept
-            path = [current]
-            visited = {current}
-
-            while current != end_concept and len(path) < max_path_length:
-                neighbors = list(self.graph.neighbors(current))
-                if not neighbors:
-                    break
-
-                # Weight by centrality, edge weight and novelty (not yet visited)
-                weights = []
-                for neighbor in neighbors:
-                    # Base weight from centrality
-                    w = centrality.get(neighbor, 0.1)
-
-                    # Include edge weight if available
-                    edge_data = self.graph.get_edge_data(current, neighbor)
-                    if edge_data and 'weight' in edge_data:
-                        w *= edge_data['weight']
-
-                    # Boost for nodes not yet visited in this path
-                    if neighbor not in visited:
-                        w *= novelty_weight
-
-                    # Boost for nodes closer to target (if we can compute shortest path)
-                    try:
-                        target_distance = nx.shortest_path_length(self.graph, neighbor, end_concept)
-                        # Lower distance = higher weight
-                        w *= (1.0 + 1.0/max(1, target_distance))
-                    except:
-                        # If no path exists, no boost
-                        pass
-
-                    weights.append(max(0.01, w))  # Ensure positive weight
-
-                # Probabilistic next step
-                if sum(weights) > 0:
-                    next_node = random.choices(neighbors, weights=weights)[0]
-                else:
-                    next_node = random.choice(neighbors)
-
-                path.append(next_node)
-                visited.add(next_node)
-                current = next_node
-
-            if current == end_concept:
-                paths.append(path)
+        # Distances to the target for every node, from one BFS per graph version and target
+        target_distances = self.target_distances(end_concept)
 
-        # Select most diverse paths
-        return self._diversify_paths(paths, num_paths)
+        csr = self.csr_graph()
+        engine = RandomWalkEngine(csr)
+        base_weights = engine.edge_base_weights(
+            csr.node_array(centrality, 0.1),
+            csr.node_array(target_distances, -1, dtype=np.int64)
+        )
+        transitions = (engine, base_weights, engine.build_alias_tables(base_weights, novelty_weight))
+
+        self._transition_cache[key] = transitions
+        while len(self._transition_cache) > self.transition_cache_size:
+            self._transition_cache.popitem(last=False)
+        return transitions
+
+    def _transition_key(self, end_concept: str, novelty_weight: float) -> Tuple:
+        """Cache key of the walk transitions toward a target"""
+        return (self._graph_key(), end_concept, float(novelty_weight))
+
+    def walk_sampler(self, processes: int) -> ParallelWalkSampler:
+        """Persistent parallel walk sampler, recreated when the process count changes"""
+        if self._walk_sampler is not None and self._walk_sampler.processes != processes:
+            self.close()
+        if self._walk_sampler is None:
+            self._walk_sampler = ParallelWalkSampler(processes, self.walk_batch_walks)
+        return self._walk_sampler
+
+    def close(self) -> None:
+        """Stop parallel sampling workers and release their shared memory"""
+        if self._walk_sampler is not None:
+            self._walk_sampler.close()
+            self._walk_sampler = None
+
+    def csr_graph(self) -> CSRGraph:
+        """CSR adjacency of the graph with integer node IDs, cached per graph version"""
+        key = self._graph_key()
+        if self._csr_key != key:
+            if isinstance(self.graph, (CompactGraphView, CompactDiGraphView)):
+                # Reuse the compact adjacency arrays instead of walking attribute dicts
+                compact = self.graph.compact
+                self._csr = CSRGraph(compact.nodes, compact.indptr, compact.indices, compact.edge_weights())
+            else:
+                self._csr = CSRGraph.from_networkx(self.graph)
+            self._csr_key = key
+        return self._csr
 
     def _diversify_paths(self, paths: List[List[str]], num_paths: int) -> List[List[str]]:
         """
@@ -203,96 +778,156 @@ class KGCOIManager:
 
         # Start with the shortest path
         paths.sort(key=len)
-        selected = [paths[0]]
-        remaining = paths[1:]
 
-        # Iteratively add the most diverse path
-        while len(selected) < num_paths and remaining:
-            max_diversity = -1
-            most_diverse_idx = 0
+        # Node incidence of the candidates, stored by node (CSR of the transposed incidence
+        # matrix): the rows of all paths through a node are rows[offsets[n]:offsets[n + 1]]
+        node_ids = {}
+        entry_rows, entry_nodes = [], []
+        for row, path in enumerate(paths):
+            for node in set(path):
+                entry_rows.append(row)
+                entry_nodes.append(node_ids.setdefault(node, len(node_ids)))
+        entry_rows = np.asarray(entry_rows, dtype=np.int64)
+        entry_nodes = np.asarray(entry_nodes, dtype=np.int64)
+        sizes = np.bincount(entry_rows, minlength=len(paths))
+        order = np.argsort(entry_nodes, kind="stable")
+        rows = entry_rows[order]
+        offsets = np.zeros(len(node_ids) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(entry_nodes, minlength=len(node_ids)), out=offsets[1:])
+        path_nodes = np.split(entry_nodes, np.cumsum(sizes)[:-1])  # Unique node IDs of every path
 
-            for i, path in enumerate(remaining):
-                # Calculate diversity as average Jaccard distance to existing paths
-                path_set = set(path)
-                diversity = 0
+        # Sum of Jaccard distances of every candidate to the selected paths, updated per selection
+        diversity = np.zeros(len(paths))
+        available = np.ones(len(paths), dtype=bool)
 
-                for sel_path in selected:
-                    sel_path_set = set(sel_path)
-                    # Jaccard distance: 1 - intersection/union
-                    intersection = len(path_set.intersection(sel_path_set))
-                    union = len(path_set.union(sel_path_set))
-                    if union > 0:
-                        diversity += 1 - (intersection / union)
+        def add(row: int) -> None:
+            available[row] = False
+            nodes = path_nodes[row]
+            spans = [np.arange(offsets[n], offsets[n + 1]) for n in nodes]
+            members = rows[np.concatenate(spans)] if spans else np.empty(0, dtype=np.int64)
+            intersection = np.bincount(members, minlength=len(paths))
+            union = sizes + sizes[row] - intersection
+            # Jaccard distance: 1 - intersection/union
+            diversity[union > 0] += 1 - intersection[union > 0] / union[union > 0]
 
-                avg_diversity = diversity / len(selected)
-                if avg_diversity > max_diversity:
-                    max_diversity = avg_diversity
-                    most_diverse_idx = i
+        selected = [0]
+        add(0)
 
-            # Add the most diverse path
-            selected.append(remaining[most_diverse_idx])
-            remaining.pop(most_diverse_idx)
+        # Iteratively add the path with the highest average Jaccard distance to the selection
+        # (the first one in length order on ties)
+        while len(selected) < num_paths and available.any():
+            average = np.where(available, diversity / len(selected), -np.inf)
+            most_diverse = int(np.argmax(average))
+            selected.append(most_diverse)
+            add(most_diverse)
 
-        return selected
+        return [paths[row] for row in selected]
 
-    def extract_subgraph(self, concepts: List[str], max_hops: int = 2) -> nx.Graph:
+    def concept_neighborhood(self, concepts: List[str],
+                             max_hops: Optional[int] = 2) -> Tuple[Dict[Hashable, int], Dict[Hashable, Hashable]]:
+        """
+        Nodes within max_hops of any concept, by one multi-source BFS that visits each node once
+        Args:
+            concepts: Seed concepts (those not in the graph are ignored)
+            max_hops: Maximum distance from the nearest concept (None for no limit)
+        Returns:
+            (distances, sources): hop distance of every reached node to its nearest concept,
+            and that concept (the first one listed on ties)
+        """
+        seeds = [concept for concept in dict.fromkeys(concepts) if concept in self.graph]
+        compact = getattr(self.graph, "compact", None)
+        if isinstance(compact, CompactGraph):
+            distances, origins = compact.multi_source_bfs(seeds, max_hops)
+            reached = np.flatnonzero(distances >= 0)
+            nodes = compact.nodes
+            return (
+                {nodes[i]: int(distances[i]) for i in reached},
+                {nodes[i]: seeds[origins[i]] for i in reached}
+            )
+
+        distances = {seed: 0 for seed in seeds}
+        sources = {seed: seed for seed in seeds}
+        adjacency = self.graph.adj
+        frontier = seeds
+        depth = 0
+        # Frontiers stay grouped by seed in input order, so the first listed seed wins ties
+        while frontier and (max_hops is None or depth < max_hops):
+            depth += 1
+            next_frontier = []
+            for node in frontier:
+                source = sources[node]
+                for neighbor in adjacency[node]:
+                    if neighbor not in distances:
+                        distances[neighbor] = depth
+                        sources[neighbor] = source
+                        next_frontier.append(neighbor)
+            frontier = next_frontier
+        return distances, sources
+
+    def extract_subgraph(self, concepts: List[str], max_hops: int = 2, copy: bool = True) -> nx.Graph:
         """
         Extract a relevant subgraph around concepts
         Args:
             concepts: List of central concepts
             max_hops: Maximum path length from concepts
+            copy: Return an independent mutable graph; False returns a read-only view in O(1),
+                  which shares the graph's attribute dicts and reflects later changes to the graph
+        Returns:
+            Subgraph of the nodes within max_hops of any concept
         """
-        nodes = set(concepts)
-        for concept in concepts:
-            for node in nx.single_source_shortest_path_length(self.graph, concept, cutoff=max_hops):
-                nodes.add(node)
+        distances, _ = self.concept_neighborhood(concepts, max_hops)
+        subgraph = self.graph.subgraph(distances)
+        return subgraph.copy() if copy else subgraph
 
-        return self.graph.subgraph(nodes).copy()
+    def community_index(self, method: str = COMMUNITY_LOUVAIN) -> CommunityIndex:
+        """Community index of the given method, created on first use"""
+        index = self.communities.get(method)
+        if index is None:
+            index = CommunityIndex(method, rebuild_fraction=COMMUNITY_REBUILD_FRACTION)
+            self.communities[method] = index
+        return index
+
+    def concept_communities(self, concepts: List[str], method: str = COMMUNITY_LOUVAIN) -> Dict[str, int]:
+        """
+        Community ID of each concept in the whole-graph partition
+        The partition is computed once per graph version, so lookups cost O(len(concepts))
+        Args:
+            concepts: Concepts to look up (those not in the graph are left out)
+            method: COMMUNITY_LOUVAIN or COMMUNITY_COMPONENTS
+        """
+        partition = self.community_index(method).partition(self.graph, self._graph_key())
+        return {concept: partition[concept] for concept in concepts if concept in partition}
 
-    def extract_community_subgraph(self, concepts: List[str], community_detection: str = "louvain") -> nx.Graph:
+    def extract_community_subgraph(self, concepts: List[str], community_detection: str = "louvain",
+                                   copy: bool = True, max_hops: Optional[int] = 3) -> nx.Graph:
         """
         Extract a subgraph containing the communities of the input concepts
         Args:
             concepts: List of central concepts
-            community_detection: Algorithm to use for community detection
+            community_detection: "louvain", otherwise connected components
+            copy: Return an independent mutable graph; False returns a read-only view
+            max_hops: Keep only community members within this distance of the concepts
+                      (None for the whole communities)
         Returns:
             Subgraph containing communities of interest
         """
-        # First extract a larger neighborhood around the concepts
-        extended_neighborhood = self.extract_subgraph(concepts, max_hops=3)
-
-        # Detect communities
-        if community_detection == "louvain":
-            try:
-                import community as community_louvain
-                communities = community_louvain.best_partition(extended_neighborhood)
-            except ImportError:
-                # Fallback to connected components if community detection package not available
-                communities = {}
-                for i, component in enumerate(nx.connected_components(extended_neighborhood)):
-                    for node in component:
-                        communities[node] = i
-        else:
-            # Simple connected components as fallback
-            communities = {}
-            for i, component in enumerate(nx.connected_components(extended_neighborhood)):
-                for node in component:
-                    communities[node] = i
-
-        # Find which communities our concepts belong to
-        target_communities = set()
-        for concept in concepts:
-            if concept in communities:
-                target_communities.add(communities[concept])
+        method = COMMUNITY_LOUVAIN if community_detection == "louvain" else COMMUNITY_COMPONENTS
+        index = self.community_index(method)
+        target_communities = set(self.concept_communities(concepts, method).values())
+        community_nodes = index.members(self.graph, self._graph_key(), target_communities)
 
-        # Extract nodes in the target communities
-        community_nodes = set()
-        for node, comm_id in communities.items():
-            if comm_id in target_communities:
-                community_nodes.add(node)
+        if max_hops is not None:
+            # Restrict to the neighborhood of the concepts
+            neighborhood, _ = self.concept_neighborhood(concepts, max_hops)
+            if len(neighborhood) < len(community_nodes):
+                partition = index.partition(self.graph, self._graph_key())
+                community_nodes = [node for node in neighborhood if partition[node] in target_communities]
+            else:
+                community_nodes = [node for node in community_nodes if node in neighborhood]
 
         # Return the subgraph of community nodes
-        return extended_neighborhood.subgraph(community_nodes).copy()
+        subgraph = self.graph.subgraph(community_nodes)
+        return subgraph.copy() if copy else subgraph
 
     def get_concept_relationships(self, concept: str) -> List[Dict]:
         """
@@ -311,33 +946,109 @@ class KGCOIManager:
             })
         return relationships
 
-    def get_concept_importance(self, method: str = "pagerank") -> Dict[str, float]:
+    def get_concept_importance(self, method: str = "pagerank", weighted: bool = False) -> Dict[str, float]:
         """
         Calculate importance scores for all concepts in the graph
         Args:
-            method: Method to use for importance calculation
+            method: "pagerank", "eigenvector", "betweenness", "degree" or "strength" (weighted degree);
+                    unknown methods fall back to degree
+            weighted: Also use evidence weights for eigenvector centrality (PageRank uses them either way,
+                      as nx.pagerank does by default)
         Returns:
             Dictionary mapping concept names to importance scores
         """
-        if method == "pagerank":
-            return nx.pagerank(self.graph)
-        elif method == "betweenness":
-            return nx.betweenness_centrality(self.graph)
-        elif method == "eigenvector":
-            return nx.eigenvector_centrality_numpy(self.graph)
-        elif method == "degree":
-            return {node: score/len(self.graph) for node, score in dict(self.graph.degree()).items()}
-        else:
+        if method == "betweenness":
+            return dict(self.centrality.betweenness(self.graph, self._graph_key()))
+        if method not in IMPORTANCE_METHODS:
             # Default to degree
-            return {node: score/len(self.graph) for node, score in dict(self.graph.degree()).items()}
+            method = IMPORTANCE_DEGREE
+        scores = self.importance_scores([method], weighted)[method]
+        return dict(zip(self.csr_graph().nodes, scores.tolist()))
+
+    def importance_scores(self, methods: Iterable[str] = IMPORTANCE_METHODS,
+                          weighted: bool = False) -> Dict[str, np.ndarray]:
+        """
+        Several importance metrics in one pass over the cached sparse adjacency
+        Args:
+            methods: Metrics to compute (see importance.IMPORTANCE_METHODS)
+            weighted: Also use evidence weights for eigenvector centrality (PageRank uses them either way)
+        Returns:
+            Dictionary mapping each method to scores indexed like csr_graph().nodes
+        """
+        methods = list(methods)
+        # Without weighting, scores match the NetworkX defaults: weighted PageRank, unweighted eigenvector
+        unweighted = [] if weighted else [method for method in methods if method != IMPORTANCE_PAGERANK]
+        weighted_methods = [method for method in methods if method not in unweighted]
+        scores = {}
+        for group, use_weights in ((weighted_methods, True), (unweighted, False)):
+            if group:
+                scores.update(self.importance.scores(self.csr_graph(), self._graph_key(), group,
+                                                     self.graph.is_directed(), use_weights))
+        return scores
+
+    def top_concepts(self, top_k: int = 10, method: str = "pagerank", weighted: bool = False) -> List[Tuple[str, float]]:
+        """
+        Highest-ranked concepts by an importance metric
+        Args:
+            top_k: Number of concepts
+            method: Metric (see importance.IMPORTANCE_METHODS)
+            weighted: Also use evidence weights for eigenvector centrality (PageRank uses them either way)
+        Returns:
+            (concept, score) pairs, highest first
+        """
+        scores = self.importance_scores([method], weighted)[method]
+        top_k = min(top_k, len(scores))
+        if top_k <= 0:
+            return []
+        top = np.argpartition(-scores, top_k - 1)[:top_k]
+        top = top[np.argsort(-scores[top], kind="stable")]
+        nodes = self.csr_graph().nodes
+        return [(nodes[i], float(scores[i])) for i in top]
+
+    def personalized_pagerank(self, seeds: Iterable[str], top_k: Optional[int] = 20, epsilon: float = 1e-4,
+                              alpha: float = 0.85, weighted: bool = True,
+                              include_seeds: bool = True) -> List[Tuple[str, float]]:
+        """
+        Concepts most relevant to a query, by personalized PageRank around its concepts
+        Uses local push, so the cost depends on epsilon, not on the size of the graph
+        Args:
+            seeds: Query concepts (a dict maps concepts to restart weights; otherwise uniform)
+            top_k: Number of concepts to return (None for all with a nonzero score)
+            epsilon: Push tolerance (smaller = more accurate and more concepts reached, but slower)
+            alpha: Damping factor (higher reaches further from the seeds)
+            weighted: Follow edges in proportion to their evidence weights
+            include_seeds: Include the query concepts themselves in the ranking
+        Returns:
+            (concept, score) pairs, highest first
+        """
+        if not isinstance(seeds, dict):
+            seeds = {concept: 1.0 for concept in seeds}
+        scores = personalized_pagerank_push(self.graph, seeds, alpha, epsilon, "weight" if weighted else None)
+        if not include_seeds:
+            for concept in seeds:
+                scores.pop(concept, None)
+        if top_k is None:
+            return sorted(scores.items(), key=lambda item: item[1], reverse=True)
+        return heapq.nlargest(top_k, scores.items(), key=lambda item: item[1])
 
     def save_graph(self, filename: str):
-        """Save knowledge graph to cache"""
+        """
+        Save knowledge graph to cache
+        Names ending in GRAPH_FILE_EXTENSION (e.g. "graph.kgb") use the binary memory-mappable
+        format; any other name is written as GraphML (GEXF for .gexf), evidence lists JSON-encoded
+        """
         path = os.path.join(self.cache_dir, filename)
-        nx.write_graphml(self.graph, path)
+        write_graph_file(self.graph, path, XML_FORMAT_GRAPHML)
 
     def load_graph(self, filename: str):
-        """Load knowledge graph from cache"""
+        """
+        Load knowledge graph from cache
+        Binary files (recognized by content) open memory-mapped as a read-only compact view in O(1);
+        anything else is read as GraphML/GEXF
+        """
         path = os.path.join(self.cache_dir, filename)
         if os.path.exists(path):
-            self.graph = nx.read_graphml(path)
\ No newline at end of file
+            self.graph = read_graph_file(path, XML_FORMAT_GRAPHML)
+            self.store = None  # The loaded graph is not the store's version history
+            self._bump_version()
+            self._store_graph()
\ No newline at end of file
@@ -0,0 +1,228 @@
+"""
+Multiprocess random-walk sampling for large concept graphs
+Worker processes read the CSR adjacency and walk transition arrays from shared memory,
+so neither the NetworkX graph nor the arrays are pickled per task
+"""
+from typing import Dict, Hashable, List, Optional, Tuple
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+import multiprocessing
+import weakref
+import numpy as np
+
+from .walk_engine import AliasTables, CSRGraph, RandomWalkEngine
+
+
+def _release_blocks(blocks: List[shared_memory.SharedMemory]) -> None:
+    """Close and unlink shared memory blocks, tolerating ones already removed"""
+    for block in blocks:
+        block.close()
+        try:
+            block.unlink()
+        except FileNotFoundError:
+            pass
+    blocks.clear()
+
+
+class SharedArrays:
+    """
+    NumPy arrays copied into named shared memory blocks, one block per array
+    The blocks are removed by close(), when the object is garbage collected, or at interpreter exit
+    """
+    def __init__(self, arrays: Dict[str, np.ndarray]):
+        """
+        Args:
+            arrays: Arrays by name
+        """
+        self.blocks = {}
+        self.spec = {}  # name -> (block name, shape, dtype); picklable handle for workers
+        created = []
+        self._finalizer = weakref.finalize(self, _release_blocks, created)
+        for name, array in arrays.items():
+            block = shared_memory.SharedMemory(create=True, size=max(1, array.nbytes))
+            created.append(block)
+            np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)[...] = array
+            self.blocks[name] = block
+            self.spec[name] = (block.name, array.shape, array.dtype.str)
+
+    def close(self) -> None:
+        """Release and remove the blocks (workers keep their mappings until they detach)"""
+        self._finalizer()
+        self.blocks = {}
+
+
+# Worker side: attached shared blocks and their engines, by spec
+_ATTACHED = OrderedDict()
+_MAX_ATTACHED = 4
+
+
+def _attach(spec: Dict[str, Tuple]) -> Tuple[RandomWalkEngine, np.ndarray, AliasTables]:
+    """Engine, base weights and alias tables over shared arrays, attached once per worker"""
+    key = tuple(sorted((name, entry[0]) for name, entry in spec.items()))
+    attached = _ATTACHED.get(key)
+    if attached is not None:
+        _ATTACHED.move_to_end(key)
+        return attached[1]
+
+    blocks, arrays = [], {}
+    for name, (block_name, shape, dtype) in spec.items():
+        block = shared_memory.SharedMemory(name=block_name)
+        blocks.append(block)
+        arrays[name] = np.ndarray(shape, dtype=np.dtype(dtype), buffer=block.buf)
+
+    # Workers only walk integer IDs, so node labels are not shipped
+    csr = CSRGraph([], arrays["indptr"], arrays["indices"], arrays["edge_weights"])
+    result = (RandomWalkEngine(csr), arrays["base_weights"], AliasTables(arrays["prob"], arrays["alias"]))
+    _ATTACHED[key] = (blocks, result)
+    while len(_ATTACHED) > _MAX_ATTACHED:
+        old_blocks, _ = _ATTACHED.popitem(last=False)[1]
+        for block in old_blocks:
+            block.close()
+    return result
+
+
+def _walk_batch(spec: Dict[str, Tuple], start: int, end: int, num_walks: int, max_path_length: int,
+                novelty_weight: float, seed: np.random.SeedSequence) -> List[np.ndarray]:
+    """Worker task: run one batch of walks and return the integer paths that reached end"""
+    engine, base_weights, tables = _attach(spec)
+    paths, lengths, reached = engine.run_walks(
+        start, end, num_walks, max_path_length, novelty_weight, base_weights,
+        np.random.default_rng(seed), tables
+    )
+    return [paths[i, :lengths[i]].copy() for i in np.flatnonzero(reached)]
+
+
+def walk_batches(num_walks: int, batch_walks: int,
+                 seed: Optional[int] = None) -> List[Tuple[int, np.random.SeedSequence]]:
+    """
+    Split num_walks into fixed-size batches, each with an independent RNG stream spawned
+    from seed; sampling batch by batch gives the same paths in-process and across any
+    number of worker processes
+    Returns:
+        (walks, seed sequence) per batch
+    """
+    sizes = [batch_walks] * (num_walks // batch_walks)
+    if num_walks % batch_walks:
+        sizes.append(num_walks % batch_walks)
+    return list(zip(sizes, np.random.SeedSequence(seed).spawn(len(sizes))))
+
+
+def sample_paths_batched(engine: RandomWalkEngine, base_weights: np.ndarray, tables: AliasTables,
+                         start: Hashable, end: Hashable, num_walks: int, max_path_length: int,
+                         novelty_weight: float, seed: Optional[int] = None,
+                         batch_walks: int = 10000) -> List[List[Hashable]]:
+    """
+    In-process counterpart of ParallelWalkSampler.sample_paths, with the same batches and
+    RNG streams (and so the same paths for a seed); arguments as there
+    """
+    batches = walk_batches(num_walks, batch_walks, seed) if num_walks > 0 else [(num_walks, None)]
+    return [
+        path
+        for size, batch_seed in batches
+        for path in engine.sample_paths(start, end, size, max_path_length, novelty_weight, base_weights,
+                                        np.random.default_rng(batch_seed), tables)
+    ]
+
+
+class ParallelWalkSampler:
+    """
+    Distributes random-walk batches across a persistent pool of worker processes
+    Each batch gets an independent RNG stream spawned from the caller's seed; batches
+    have a fixed size, so results for a seed do not depend on the number of processes
+    and match sample_paths_batched in-process
+    """
+    def __init__(self, processes: int, batch_walks: int = 10000, max_published: int = 4):
+        """
+        Args:
+            processes: Number of worker processes
+            batch_walks: Walks per task
+            max_published: Transition array sets kept in shared memory before the least recently used is removed
+        """
+        self.processes = processes
+        self.batch_walks = batch_walks
+        self.max_published = max_published
+        self._executor = None
+        self._published = OrderedDict()
+
+    def _pool(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            # Never fork the (multithreaded) caller: a forked child can inherit locks held by other
+            # threads and deadlock. Forkserver workers fork from a clean single-threaded server
+            method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.processes, mp_context=multiprocessing.get_context(method)
+            )
+        return self._executor
+
+    def publish(self, key: Hashable, engine: RandomWalkEngine, base_weights: np.ndarray,
+                tables: AliasTables) -> Dict[str, Tuple]:
+        """
+        Copy the arrays for one (graph version, target, novelty weight) into shared memory
+        Returns:
+            Picklable spec that workers attach to
+        """
+        shared = self._published.get(key)
+        if shared is None:
+            shared = SharedArrays({
+                "indptr": engine.csr.indptr,
+                "indices": engine.csr.indices,
+                "edge_weights": engine.csr.edge_weights,
+                "base_weights": base_weights,
+                "prob": tables.prob,
+                "alias": tables.alias
+            })
+            self._published[key] = shared
+            while len(self._published) > self.max_published:
+                self._published.popitem(last=False)[1].close()
+        self._published.move_to_end(key)
+        return shared.spec
+
+    def sample_paths(self, key: Hashable, engine: RandomWalkEngine, base_weights: np.ndarray,
+                     tables: AliasTables, start: Hashable, end: Hashable, num_walks: int,
+                     max_path_length: int, novelty_weight: float,
+                     seed: Optional[int] = None) -> List[List[Hashable]]:
+        """
+        Run num_walks walks across the worker processes
+        Args:
+            key: Cache key of the transition arrays (see publish)
+            engine: Walk engine over the graph
+            base_weights: Per-edge base weights for the target
+            tables: Alias tables for base_weights and novelty_weight
+            start: Starting concept
+            end: Target concept
+            num_walks: Number of walks
+            max_path_length: Maximum number of nodes on a walk
+            novelty_weight: Boost for stepping to a node not yet on the walk
+            seed: Optional seed for reproducible sampling
+        Returns:
+            Paths (lists of concepts) of the walks that reached end, in batch order
+        Raises:
+            nx.NetworkXError: If start is not in the graph (as in RandomWalkEngine.sample_paths)
+        """
+        csr = engine.csr
+        if start not in csr.index or start == end or num_walks <= 0:
+            # Trivial cases behave exactly as in-process sampling, without dispatching
+            return sample_paths_batched(engine, base_weights, tables, start, end, num_walks,
+                                        max_path_length, novelty_weight, seed, self.batch_walks)
+        if end not in csr.index:
+            return []
+
+        spec = self.publish(key, engine, base_weights, tables)
+        futures = [
+            self._pool().submit(
+                _walk_batch, spec, csr.index[start], csr.index[end], size,
+                max_path_length, novelty_weight, batch_seed
+            )
+            for size, batch_seed in walk_batches(num_walks, self.batch_walks, seed)
+        ]
+        nodes = csr.nodes
+        return [[nodes[i] for i in path] for future in futures for path in future.result()]
+
+    def close(self) -> None:
+        """Stop the workers and remove all shared memory blocks"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        while self._published:
+            self._published.popitem(last=False)[1].close()
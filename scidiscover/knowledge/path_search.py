@@ -0,0 +1,450 @@
+"""
+K-shortest loopless path search between concepts
+Yen's algorithm over evidence-weighted edge costs, with resumable search state,
+path length limits and forbidden concepts; many-to-many cheapest path matrices
+"""
+from typing import Callable, Dict, Hashable, Iterable, Iterator, List, Optional, Set, Tuple
+import heapq
+import itertools
+import math
+import weakref
+import networkx as nx
+import numpy as np
+
+from .walk_engine import CSRGraph
+
+MIN_EDGE_WEIGHT = 1e-6  # Normalized weights are clamped to [MIN_EDGE_WEIGHT, 1] before taking -log
+MIN_HOP_COST = 1e-9  # Keeps every edge cost positive, so cheapest bounded-hop walks are simple paths
+
+
+def max_edge_weight(graph: nx.Graph, weight: Optional[str] = "weight") -> float:
+    """Largest edge weight of a graph (missing weights count as 1), the normalizer of evidence_cost"""
+    if weight is None:
+        return 1.0
+    largest = max((float(w) for _, _, w in graph.edges(data=weight, default=1.0)), default=1.0)
+    return largest if largest > 0 else 1.0
+
+
+def evidence_cost(weight: Optional[str] = "weight", hop_cost: float = 1e-3, max_weight: float = 1.0) -> Callable:
+    """
+    Edge cost function for evidence-weighted graphs
+    Weights are divided by max_weight before taking -log, so they rank relative to the best
+    supported edge of the graph: evidence weights are not bounded by 1 (see
+    KGCOIManager._evidence_weight), and clamping raw weights at 1 would give every edge at or
+    above 1 the same cost
+    Args:
+        weight: Edge attribute holding the evidence weight (missing weights count as 1),
+                or None to rank paths by hop count alone
+        hop_cost: Constant added per edge, so among equally supported paths fewer hops rank first
+        max_weight: Largest weight of the graph (see max_edge_weight)
+    Returns:
+        Function (edge data) -> -log(clamp(weight / max_weight, MIN_EDGE_WEIGHT, 1)) + hop_cost
+    """
+    hop_cost = max(MIN_HOP_COST, hop_cost)
+    if weight is None:
+        return lambda data: 1.0
+    scale = 1.0 / max_weight if max_weight > 0 else 1.0
+
+    def cost(data: Dict) -> float:
+        w = min(1.0, max(MIN_EDGE_WEIGHT, float(data.get(weight, 1.0)) * scale))
+        return -math.log(w) + hop_cost
+    return cost
+
+
+class KShortestPaths:
+    """
+    Lazily enumerated loopless paths from source to target, cheapest first (Yen's algorithm)
+
+    Found paths and the candidate heap are kept between calls, so iterating again or
+    asking for more paths resumes the search instead of restarting it. With a length
+    limit, spur paths are searched hop-bounded, so only admissible paths are ever built.
+    """
+    def __init__(self, graph: nx.Graph, source: Hashable, target: Hashable, weight: Optional[str] = "weight",
+                 max_length: Optional[int] = None, forbidden: Optional[Iterable[Hashable]] = None):
+        """
+        Args:
+            graph: Concept graph
+            source: Starting concept
+            target: Target concept
+            weight: Evidence weight attribute for -log(weight) costs, or None to rank by hop count
+            max_length: Maximum number of concepts on a path (None for no limit)
+            forbidden: Concepts no path may pass through
+        """
+        self.graph = graph
+        self.source = source
+        self.target = target
+        self.max_length = max_length
+        self.forbidden = frozenset(forbidden or ())
+        self.cost = evidence_cost(weight, max_weight=max_edge_weight(graph, weight))
+        self.paths: List[List[Hashable]] = []
+        self.spur_searches = 0
+
+        self._deviations: List[int] = []  # Index where each found path left its parent path
+        self._candidates = []  # Heap of (cost, tiebreak, path, deviation index)
+        self._seen: Set[Tuple] = set()
+        self._counter = itertools.count()
+        self._to_target = None  # Hop distances to the target (length-limited searches)
+        self._cost_to_target = None  # Cheapest cost to the target (A* heuristic of unlimited searches)
+        self._exhausted = source in self.forbidden or target in self.forbidden \
+            or source not in graph or target not in graph
+
+        if not self._exhausted:
+            if max_length is not None:
+                self._to_target = self._hops_to_target()
+            else:
+                self._cost_to_target = self._costs_to_target()
+            self._push(self._spur_path(source, set(), set(), self._budget(1)), 0.0, [], 0)
+
+    def _budget(self, root_length: int) -> Optional[int]:
+        """Edges left for a spur path starting at the last of root_length concepts"""
+        if self.max_length is None:
+            return None
+        return self.max_length - root_length
+
+    def _hops_to_target(self) -> Dict[Hashable, int]:
+        """Hop distance of every allowed node to the target, a lower bound used to prune spur searches"""
+        graph = self.graph.reverse(copy=False) if self.graph.is_directed() else self.graph
+        distances = {self.target: 0}
+        frontier = [self.target]
+        while frontier:
+            next_frontier = []
+            for node in frontier:
+                for neighbor in graph.adj[node]:
+                    if neighbor not in distances and neighbor not in self.forbidden:
+                        distances[neighbor] = distances[node] + 1
+                        next_frontier.append(neighbor)
+            frontier = next_frontier
+        return distances
+
+    def _costs_to_target(self) -> Dict[Hashable, float]:
+        """
+        Cheapest cost from every allowed node to the target, computed once per search
+        Blocking nodes and edges can only raise costs, so this is an exact-when-unblocked
+        lower bound that keeps every spur search focused on the target
+        """
+        graph = self.graph.reverse(copy=False) if self.graph.is_directed() else self.graph
+        if self.forbidden:
+            blocked = self.forbidden
+            graph = nx.subgraph_view(graph, filter_node=lambda node: node not in blocked)
+        return nx.single_source_dijkstra_path_length(graph, self.target, weight=lambda u, v, data: self.cost(data))
+
+    def _push(self, spur: Optional[Tuple[float, List[Hashable]]], root_cost: float,
+              root: List[Hashable], deviation: int) -> None:
+        if spur is None:
+            return
+        cost, spur_path = spur
+        path = root + spur_path
+        key = tuple(path)
+        if key not in self._seen:
+            self._seen.add(key)
+            heapq.heappush(self._candidates, (root_cost + cost, next(self._counter), path, deviation))
+
+    def _spur_path(self, spur: Hashable, blocked_nodes: Set[Hashable], blocked_edges: Set[Tuple],
+                   budget: Optional[int]) -> Optional[Tuple[float, List[Hashable]]]:
+        """Cheapest path from spur to target avoiding blocked nodes and edges, within budget edges"""
+        self.spur_searches += 1
+        if budget is None:
+            return self._dijkstra(spur, blocked_nodes, blocked_edges)
+        return self._bounded(spur, blocked_nodes, blocked_edges, budget)
+
+    def _allowed(self, node: Hashable, neighbor: Hashable, blocked_nodes: Set[Hashable],
+                 blocked_edges: Set[Tuple]) -> bool:
+        return neighbor not in blocked_nodes and neighbor not in self.forbidden \
+            and (node, neighbor) not in blocked_edges
+
+    def _dijkstra(self, spur: Hashable, blocked_nodes: Set[Hashable],
+                  blocked_edges: Set[Tuple]) -> Optional[Tuple[float, List[Hashable]]]:
+        """A* search guided by the cost-to-target lower bound"""
+        adjacency = self.graph.adj
+        remaining = self._cost_to_target
+        if spur not in remaining:
+            return None
+        distances = {spur: 0.0}
+        parents = {spur: None}
+        heap = [(remaining[spur], next(self._counter), spur)]
+        done = set()
+        while heap:
+            _, _, node = heapq.heappop(heap)
+            if node in done:
+                continue
+            if node == self.target:
+                path = [node]
+                while parents[path[-1]] is not None:
+                    path.append(parents[path[-1]])
+                return distances[node], path[::-1]
+            done.add(node)
+            cost = distances[node]
+            for neighbor, data in adjacency[node].items():
+                if neighbor in done or neighbor not in remaining:
+                    continue
+                if not self._allowed(node, neighbor, blocked_nodes, blocked_edges):
+                    continue
+                new_cost = cost + self.cost(data)
+                if new_cost < distances.get(neighbor, math.inf):
+                    distances[neighbor] = new_cost
+                    parents[neighbor] = node
+                    heapq.heappush(heap, (new_cost + remaining[neighbor], next(self._counter), neighbor))
+        return None
+
+    def _bounded(self, spur: Hashable, blocked_nodes: Set[Hashable], blocked_edges: Set[Tuple],
+                 budget: int) -> Optional[Tuple[float, List[Hashable]]]:
+        """
+        Hop-bounded cheapest path, by Bellman-Ford layers (layer h = paths of h edges)
+        An entry is kept only if it is cheaper than every entry for that node in earlier
+        layers, which with positive costs also rules out revisiting a node
+        """
+        if self._to_target.get(spur, math.inf) > budget:
+            return None
+        adjacency = self.graph.adj
+        best = {spur: 0.0}
+        layers = [{spur: (0.0, None)}]
+        found = None  # (cost, layer)
+        for hops in range(1, budget + 1):
+            layer = {}
+            for node, (cost, _) in layers[-1].items():
+                if node == self.target:
+                    continue
+                for neighbor, data in adjacency[node].items():
+                    if self._to_target.get(neighbor, math.inf) > budget - hops:
+                        continue
+                    if not self._allowed(node, neighbor, blocked_nodes, blocked_edges):
+                        continue
+                    new_cost = cost + self.cost(data)
+                    if new_cost < best.get(neighbor, math.inf) and new_cost < layer.get(neighbor, (math.inf,))[0]:
+                        layer[neighbor] = (new_cost, node)
+            if not layer:
+                break
+            for node, (cost, _) in layer.items():
+                best[node] = min(best.get(node, math.inf), cost)
+            layers.append(layer)
+            if self.target in layer and (found is None or layer[self.target][0] < found[0]):
+                found = (layer[self.target][0], hops)
+        if found is None:
+            return None
+
+        cost, hops = found
+        path = [self.target]
+        for h in range(hops, 0, -1):
+            path.append(layers[h][path[-1]][1])
+        return cost, path[::-1]
+
+    def _path_cost(self, path: List[Hashable]) -> float:
+        return sum(self.cost(self.graph.adj[u][v]) for u, v in zip(path, path[1:]))
+
+    def _advance(self) -> bool:
+        """Find the next cheapest path; False when no paths are left"""
+        if self._exhausted:
+            return False
+        if self.paths:
+            # Spur from every node of the last path at or after its deviation index (Lawler)
+            last = self.paths[-1]
+            for i in range(self._deviations[-1], len(last) - 1):
+                root = last[:i + 1]
+                budget = self._budget(len(root))
+                if budget is not None and budget < 1:
+                    break
+                blocked_edges = {
+                    (path[i], path[i + 1]) for path in self.paths
+                    if len(path) > i + 1 and path[:i + 1] == root
+                }
+                spur = self._spur_path(last[i], set(root[:-1]), blocked_edges, budget)
+                self._push(spur, self._path_cost(root), root[:-1], i)
+
+        if not self._candidates:
+            self._exhausted = True
+            return False
+        _, _, path, deviation = heapq.heappop(self._candidates)
+        self.paths.append(path)
+        self._deviations.append(deviation)
+        return True
+
+    def __iter__(self) -> Iterator[List[Hashable]]:
+        index = 0
+        while index < len(self.paths) or self._advance():
+            yield self.paths[index]
+            index += 1
+
+    def take(self, k: int) -> List[List[Hashable]]:
+        """Up to k cheapest paths, searching only as far as needed"""
+        while len(self.paths) < k and self._advance():
+            pass
+        return self.paths[:k]
+
+
+class PathMatrix:
+    """
+    Cheapest paths between every source and every target concept
+    Built by many_to_many_paths; rows follow sources and columns follow targets
+    """
+    def __init__(self, sources: List[Hashable], targets: List[Hashable], distances: np.ndarray,
+                 nodes: List[Hashable], index: Dict[Hashable, int], trees: Dict[int, np.ndarray],
+                 forward: bool, directed: bool):
+        """
+        Args:
+            sources: Source concepts (matrix rows)
+            targets: Target concepts (matrix columns)
+            distances: Path costs, inf where no path exists
+            nodes: Node labels by integer ID
+            index: Integer ID of every node label
+            trees: Shortest-path tree of every search root by node ID: parent toward the root,
+                   -1 for the root and -2 for nodes the search did not settle
+            forward: Whether the searches ran from the sources (otherwise backward from the targets)
+            directed: Whether the graph is directed (undirected trees also serve reversed pairs)
+        """
+        self.sources = sources
+        self.targets = targets
+        self.distances = distances
+        self.source_index = {node: i for i, node in enumerate(sources)}
+        self.target_index = {node: j for j, node in enumerate(targets)}
+        self._nodes = nodes
+        self._index = index
+        self._trees = trees
+        self._forward = forward
+        self._directed = directed
+
+    def distance(self, source: Hashable, target: Hashable) -> float:
+        """Cost of the cheapest path (inf if there is none)"""
+        return float(self.distances[self.source_index[source], self.target_index[target]])
+
+    def path(self, source: Hashable, target: Hashable) -> List[Hashable]:
+        """Witness path from source to target, or [] if there is none"""
+        if not math.isfinite(self.distance(source, target)):
+            return []
+        root, node = (source, target) if self._forward else (target, source)
+        root, node = self._index[root], self._index[node]
+        parents = self._trees.get(root)
+        if (parents is None or parents[node] == -2) and not self._directed:
+            # Found by the search from the other end of an undirected pair
+            root, node = node, root
+            parents = self._trees[root]
+        path = [node]
+        while parents[node] >= 0:
+            node = int(parents[node])
+            path.append(node)
+        # Trees point toward their root: reverse when the root is the source
+        path = [self._nodes[i] for i in path]
+        return path[::-1] if path[-1] == source else path
+
+    def pairs(self) -> Iterator[Tuple[Hashable, Hashable, float, List[Hashable]]]:
+        """(source, target, distance, path) for every connected pair, cheapest first"""
+        rows, columns = np.nonzero(np.isfinite(self.distances))
+        order = np.argsort(self.distances[rows, columns], kind="stable")
+        for i, j in zip(rows[order], columns[order]):
+            source, target = self.sources[i], self.targets[j]
+            yield source, target, float(self.distances[i, j]), self.path(source, target)
+
+
+# Search arrays per CSR graph; CSR graphs are cached per graph version, so these are too
+_SEARCH_ARRAYS = weakref.WeakKeyDictionary()
+
+
+def search_arrays(csr: CSRGraph, weighted: bool = True, hop_cost: float = 1e-3,
+                  reverse: bool = False) -> Tuple[List[int], List[int], List[float]]:
+    """
+    Adjacency and edge costs of a CSR graph as Python lists for the Dijkstra loop of
+    many_to_many_paths, built once per CSR graph object and cost setting
+    Args:
+        csr: CSR adjacency
+        weighted: Evidence costs (see evidence_cost, normalized by the largest weight), otherwise hop counts
+        hop_cost: Constant added per edge
+        reverse: Transpose the adjacency (predecessor lists of a directed graph)
+    Returns:
+        (indptr, indices, costs)
+    """
+    cache = _SEARCH_ARRAYS.setdefault(csr, {})
+    key = (weighted, hop_cost if weighted else None, reverse)
+    arrays = cache.get(key)
+    if arrays is not None:
+        return arrays
+
+    n = csr.num_nodes
+    if weighted:
+        largest = float(csr.edge_weights.max()) if csr.num_edges else 1.0
+        scale = largest if largest > 0 else 1.0
+        costs = -np.log(np.clip(csr.edge_weights / scale, MIN_EDGE_WEIGHT, 1.0)) + max(MIN_HOP_COST, hop_cost)
+    else:
+        costs = np.ones(csr.num_edges)
+    indptr, indices = csr.indptr, csr.indices
+    if reverse:
+        # Predecessor lists: sort adjacency entries by their target node
+        rows = np.repeat(np.arange(n), np.diff(indptr))
+        order = np.argsort(indices, kind="stable")
+        indptr = np.concatenate([[0], np.cumsum(np.bincount(indices, minlength=n))])
+        indices, costs = rows[order], costs[order]
+    arrays = (indptr.tolist(), indices.tolist(), costs.tolist())
+    cache[key] = arrays
+    return arrays
+
+
+def many_to_many_paths(csr: CSRGraph, sources: Iterable[Hashable], targets: Iterable[Hashable],
+                       directed: bool = False, weighted: bool = True, hop_cost: float = 1e-3) -> PathMatrix:
+    """
+    Cheapest paths between all pairs of sources and targets
+    Runs one Dijkstra search over the CSR arrays per concept of the smaller side (backward
+    over the transposed adjacency when that is the target side of a directed graph), each
+    stopping as soon as every concept of the other side it still needs is settled. On
+    undirected graphs a pair whose ends are both search roots is searched only once.
+    Args:
+        csr: CSR adjacency of the graph (successors for directed graphs)
+        sources: Source concepts (duplicates are dropped; concepts not in the graph get no paths)
+        targets: Target concepts
+        directed: Whether the graph is directed
+        weighted: Use evidence costs -log(clamp(weight / max weight)) + hop_cost (see evidence_cost),
+                  otherwise hop counts
+        hop_cost: Constant added per edge
+    Returns:
+        PathMatrix of distances and witness paths
+    """
+    sources = list(dict.fromkeys(sources))
+    targets = list(dict.fromkeys(targets))
+    forward = len(sources) <= len(targets)
+    roots, goals = (sources, targets) if forward else (targets, sources)
+
+    n = csr.num_nodes
+    indptr, indices, costs = search_arrays(csr, weighted, hop_cost, directed and not forward)
+
+    distances = np.full((len(roots), len(goals)), math.inf)
+    root_index = {node: i for i, node in enumerate(roots)}
+    goal_ids = {csr.index[node]: j for j, node in enumerate(goals) if node in csr.index}
+    trees = {}
+    pop, push = heapq.heappop, heapq.heappush
+    for i, root in enumerate(roots):
+        if root not in csr.index:
+            continue
+        needed = set()
+        for goal_id, j in goal_ids.items():
+            earlier = root_index.get(goals[j], len(roots))
+            if not directed and earlier < i and root in root_index and csr.index[root] in goal_ids:
+                # Symmetric pair, already searched from the other end
+                distances[i, j] = distances[earlier, goal_ids[csr.index[root]]]
+            else:
+                needed.add(goal_id)
+
+        start = csr.index[root]
+        settled = bytearray(n)
+        parents = [-2] * n
+        tentative = [math.inf] * n
+        parents[start], tentative[start] = -1, 0.0
+        heap = [(0.0, start)]
+        while heap and needed:
+            distance, node = pop(heap)
+            if settled[node]:
+                continue
+            settled[node] = 1
+            if node in needed:
+                distances[i, goal_ids[node]] = distance
+                needed.discard(node)
+            for k in range(indptr[node], indptr[node + 1]):
+                neighbor = indices[k]
+                new_distance = distance + costs[k]
+                if new_distance < tentative[neighbor] and not settled[neighbor]:
+                    tentative[neighbor] = new_distance
+                    parents[neighbor] = node
+                    push(heap, (new_distance, neighbor))
+        tree = np.array(parents, dtype=np.int32)
+        tree[np.frombuffer(bytes(settled), dtype=np.uint8) == 0] = -2
+        trees[start] = tree
+
+    if not forward:
+        distances = distances.T
+    return PathMatrix(sources, targets, distances, csr.nodes, csr.index, trees, forward, directed)
@@ -0,0 +1,319 @@
+"""
+Vectorized random-walk engine for concept path sampling
+Advances many weighted random walks in lockstep over CSR adjacency arrays
+"""
+from typing import Dict, Hashable, List, Optional
+import networkx as nx
+import numpy as np
+
+
+class CSRGraph:
+    """
+    Compressed sparse row adjacency of a NetworkX graph with integer node IDs
+    Neighbors of node i are indices[indptr[i]:indptr[i + 1]], in NetworkX adjacency order
+    """
+    def __init__(self, nodes: List[Hashable], indptr: np.ndarray, indices: np.ndarray, edge_weights: np.ndarray):
+        """
+        Args:
+            nodes: Node labels by integer ID
+            indptr: Start offset of every node's neighbor range (length num_nodes + 1)
+            indices: Neighbor IDs of all nodes, concatenated
+            edge_weights: Weight of every entry of indices (1.0 where the edge has none)
+        """
+        self.nodes = nodes
+        self.index = {node: i for i, node in enumerate(nodes)}
+        self.indptr = indptr
+        self.indices = indices
+        self.edge_weights = edge_weights
+
+    @classmethod
+    def from_networkx(cls, graph: nx.Graph, weight: str = "weight") -> "CSRGraph":
+        """
+        Convert a graph (successors for directed graphs)
+        Args:
+            graph: NetworkX graph
+            weight: Edge attribute holding the edge weight
+        """
+        nodes = list(graph.nodes())
+        index = {node: i for i, node in enumerate(nodes)}
+        adjacency = graph.adj
+        degrees = np.fromiter((len(adjacency[node]) for node in nodes), dtype=np.int64, count=len(nodes))
+        indptr = np.zeros(len(nodes) + 1, dtype=np.int64)
+        np.cumsum(degrees, out=indptr[1:])
+        indices = np.empty(indptr[-1], dtype=np.int32)
+        edge_weights = np.empty(indptr[-1], dtype=np.float64)
+        position = 0
+        for node in nodes:
+            for neighbor, data in adjacency[node].items():
+                indices[position] = index[neighbor]
+                edge_weights[position] = float(data.get(weight, 1.0))
+                position += 1
+        return cls(nodes, indptr, indices, edge_weights)
+
+    @property
+    def num_nodes(self) -> int:
+        return len(self.nodes)
+
+    @property
+    def num_edges(self) -> int:
+        """Number of adjacency entries (twice the edge count for undirected graphs)"""
+        return len(self.indices)
+
+    def node_array(self, values: Dict[Hashable, float], default: float, dtype=np.float64) -> np.ndarray:
+        """Per-node array of a node-keyed dictionary, default for missing nodes"""
+        array = np.full(self.num_nodes, default, dtype=dtype)
+        for node, value in values.items():
+            i = self.index.get(node)
+            if i is not None:
+                array[i] = value
+        return array
+
+
+class AliasTables:
+    """
+    Vose alias tables for every node's neighbor segment of a CSR graph
+    Draws a weighted neighbor in O(1): pick a slot uniformly, keep it with probability
+    prob[slot] or take alias[slot] otherwise
+    """
+    def __init__(self, prob: np.ndarray, alias: np.ndarray):
+        """
+        Args:
+            prob: Keep probability of every adjacency entry
+            alias: Absolute adjacency entry used when the slot is not kept
+        """
+        self.prob = prob
+        self.alias = alias
+
+    @classmethod
+    def build(cls, indptr: np.ndarray, weights: np.ndarray) -> "AliasTables":
+        """
+        Build tables with Vose's method, in O(degree) per node
+        Args:
+            indptr: CSR offsets
+            weights: Positive weight of every adjacency entry
+        """
+        prob = np.ones(len(weights))
+        alias = np.arange(len(weights), dtype=np.int64)
+        degrees = np.diff(indptr)
+        for node in np.flatnonzero(degrees > 1):
+            lo, hi = int(indptr[node]), int(indptr[node + 1])
+            segment = weights[lo:hi]
+            if segment.min() == segment.max():
+                continue  # Uniform: every slot keeps itself
+            scaled = (segment * ((hi - lo) / segment.sum())).tolist()
+            keep = [1.0] * (hi - lo)
+            other = list(range(lo, hi))
+            small = [i for i, value in enumerate(scaled) if value < 1.0]
+            large = [i for i, value in enumerate(scaled) if value >= 1.0]
+            while small and large:
+                s, l = small.pop(), large.pop()
+                keep[s] = scaled[s]
+                other[s] = lo + l
+                scaled[l] += scaled[s] - 1.0
+                (small if scaled[l] < 1.0 else large).append(l)
+            # Leftovers are 1 up to rounding and keep themselves
+            prob[lo:hi] = keep
+            alias[lo:hi] = other
+        return cls(prob, alias)
+
+    @property
+    def nbytes(self) -> int:
+        return self.prob.nbytes + self.alias.nbytes
+
+
+class RandomWalkEngine:
+    """
+    Weighted random walks from a start to a target concept, many walks at a time
+
+    A step from node c to neighbor n has weight max(0.01, base(c, n) * boost), where
+    base = centrality(n) * edge weight * (1 + 1 / max(1, distance(n, target))) is
+    precomputed per edge and boost = novelty_weight if n is not yet on the walk.
+    """
+    MIN_WEIGHT = 0.01
+
+    def __init__(self, csr: CSRGraph, max_batch_entries: int = 2_000_000):
+        """
+        Args:
+            csr: Graph adjacency
+            max_batch_entries: Bound on candidate-neighbor entries (x path length) processed per step batch
+        """
+        self.csr = csr
+        self.max_batch_entries = max_batch_entries
+
+    def edge_base_weights(self, node_weights: np.ndarray, target_distances: np.ndarray) -> np.ndarray:
+        """
+        Per-edge base transition weights
+        Args:
+            node_weights: Weight of every node as a step destination (e.g. centrality)
+            target_distances: Hop distance of every node to the target, -1 if unreachable
+        Returns:
+            Array aligned with csr.indices
+        """
+        distances = target_distances[self.csr.indices]
+        bias = np.where(distances >= 0, 1.0 + 1.0 / np.maximum(1, distances), 1.0)
+        return node_weights[self.csr.indices] * self.csr.edge_weights * bias
+
+    def envelope_weights(self, base_weights: np.ndarray, novelty_weight: float) -> np.ndarray:
+        """
+        Upper bound of every step weight, whatever the walk has visited
+        Alias tables over these weights plus rejection give exact novelty-boosted steps
+        """
+        return np.maximum(base_weights * max(1.0, novelty_weight), self.MIN_WEIGHT)
+
+    def build_alias_tables(self, base_weights: np.ndarray, novelty_weight: float) -> AliasTables:
+        """Alias tables for O(1) steps with these base weights and novelty boost"""
+        return AliasTables.build(self.csr.indptr, self.envelope_weights(base_weights, novelty_weight))
+
+    def sample_paths(self, start: Hashable, end: Hashable, num_walks: int, max_path_length: int,
+                     novelty_weight: float, base_weights: np.ndarray,
+                     rng: np.random.Generator,
+                     alias_tables: Optional[AliasTables] = None) -> List[List[Hashable]]:
+        """
+        Run num_walks walks and return those reaching the target
+        Args:
+            start: Starting concept
+            end: Target concept
+            num_walks: Number of walks
+            max_path_length: Maximum number of nodes on a walk
+            novelty_weight: Boost for stepping to a node not yet on the walk
+            base_weights: Output of edge_base_weights for this target
+            rng: Random generator (seed it for reproducible paths)
+            alias_tables: Optional output of build_alias_tables for O(1) steps; without
+                          them each step samples in O(degree)
+        Returns:
+            Paths (lists of concepts) of the walks that reached end, in walk order
+        """
+        if start not in self.csr.index:
+            raise nx.NetworkXError(f"The node {start} is not in the graph.")
+        if num_walks <= 0:
+            return []
+        if start == end:
+            return [[start] for _ in range(num_walks)]
+
+        paths, lengths, reached = self.run_walks(
+            self.csr.index[start], self.csr.index.get(end, -1), num_walks, max_path_length,
+            novelty_weight, base_weights, rng, alias_tables
+        )
+        nodes = self.csr.nodes
+        return [[nodes[i] for i in paths[walk, :lengths[walk]]] for walk in np.flatnonzero(reached)]
+
+    def run_walks(self, start: int, end: int, num_walks: int, max_path_length: int,
+                  novelty_weight: float, base_weights: np.ndarray, rng: np.random.Generator,
+                  alias_tables: Optional[AliasTables] = None):
+        """
+        Integer-ID walk kernel behind sample_paths
+        Returns:
+            (paths array padded with -1, path lengths, boolean mask of walks that reached end)
+        """
+        max_path_length = max(1, max_path_length)
+        paths = np.full((num_walks, max_path_length), -1, dtype=np.int32)
+        paths[:, 0] = start
+        lengths = np.ones(num_walks, dtype=np.int64)
+        reached = np.zeros(num_walks, dtype=bool)
+        active = np.full(num_walks, max_path_length > 1)
+
+        while active.any():
+            if alias_tables is not None:
+                batches = [np.flatnonzero(active)]  # O(1) work per walk, no candidate expansion
+            else:
+                batches = self._batches(np.flatnonzero(active), paths, lengths, max_path_length)
+            for walks in batches:
+                current = paths[walks, lengths[walks] - 1]
+                if alias_tables is not None:
+                    next_nodes = self._alias_step(walks, current, paths, novelty_weight, base_weights,
+                                                  alias_tables, rng)
+                else:
+                    next_nodes = self._step(walks, current, paths, novelty_weight, base_weights, rng)
+
+                stuck = next_nodes < 0  # No neighbors: the walk ends without reaching the target
+                active[walks[stuck]] = False
+                moved = walks[~stuck]
+                next_nodes = next_nodes[~stuck]
+                paths[moved, lengths[moved]] = next_nodes
+                lengths[moved] += 1
+
+                arrived = next_nodes == end
+                reached[moved[arrived]] = True
+                active[moved[arrived | (lengths[moved] >= max_path_length)]] = False
+
+        return paths, lengths, reached
+
+    def _batches(self, walks: np.ndarray, paths: np.ndarray, lengths: np.ndarray, max_path_length: int):
+        """Split active walks so the candidate entries of one batch stay within max_batch_entries"""
+        current = paths[walks, lengths[walks] - 1]
+        cost = (self.csr.indptr[current + 1] - self.csr.indptr[current]) * max_path_length
+        budget = np.cumsum(cost) // max(1, self.max_batch_entries)
+        for value in np.unique(budget):
+            yield walks[budget == value]
+
+    def _step(self, walks: np.ndarray, current: np.ndarray, paths: np.ndarray,
+              novelty_weight: float, base_weights: np.ndarray, rng: np.random.Generator) -> np.ndarray:
+        """
+        Choose the next node of every walk in the batch
+        Returns:
+            Next node IDs, -1 for walks at nodes without neighbors
+        """
+        indptr = self.csr.indptr
+        starts = indptr[current]
+        degrees = indptr[current + 1] - starts
+        next_nodes = np.full(len(walks), -1, dtype=np.int64)
+        live = degrees > 0
+        if not live.any():
+            return next_nodes
+
+        starts, degrees, live_walks = starts[live], degrees[live], walks[live]
+        offsets = np.zeros(len(degrees), dtype=np.int64)
+        np.cumsum(degrees[:-1], out=offsets[1:])
+        total = int(degrees.sum())
+        segment = np.repeat(np.arange(len(degrees)), degrees)
+        edges = np.arange(total) - offsets[segment] + starts[segment]
+
+        neighbors = self.csr.indices[edges]
+        visited = (paths[live_walks[segment]] == neighbors[:, None]).any(axis=1)
+        weights = base_weights[edges] * np.where(visited, 1.0, novelty_weight)
+        np.maximum(weights, self.MIN_WEIGHT, out=weights)
+
+        # Inverse-CDF sampling within each walk's neighbor segment
+        cumulative = np.cumsum(weights)
+        segment_end = cumulative[offsets + degrees - 1]
+        segment_start = segment_end - np.add.reduceat(weights, offsets)
+        draws = segment_start + rng.random(len(degrees)) * (segment_end - segment_start)
+        picks = np.searchsorted(cumulative, draws, side="right")
+        picks = np.clip(picks, offsets, offsets + degrees - 1)
+
+        next_nodes[live] = neighbors[picks]
+        return next_nodes
+
+    def _alias_step(self, walks: np.ndarray, current: np.ndarray, paths: np.ndarray,
+                    novelty_weight: float, base_weights: np.ndarray, tables: AliasTables,
+                    rng: np.random.Generator) -> np.ndarray:
+        """
+        Choose the next node of every walk in O(1) expected time
+        Proposes from the alias tables over the envelope weights and accepts with
+        probability actual weight / envelope weight, which only depends on whether
+        the proposed neighbor is already on the walk
+        Returns:
+            Next node IDs, -1 for walks at nodes without neighbors
+        """
+        indptr = self.csr.indptr
+        starts = indptr[current]
+        degrees = indptr[current + 1] - starts
+        next_nodes = np.full(len(walks), -1, dtype=np.int64)
+        pending = np.flatnonzero(degrees > 0)
+        boost = max(1.0, novelty_weight)
+
+        while len(pending):
+            slots = starts[pending] + (rng.random(len(pending)) * degrees[pending]).astype(np.int64)
+            keep = rng.random(len(pending)) < tables.prob[slots]
+            edges = np.where(keep, slots, tables.alias[slots])
+            neighbors = self.csr.indices[edges]
+
+            visited = (paths[walks[pending]] == neighbors[:, None]).any(axis=1)
+            base = base_weights[edges]
+            weight = np.maximum(base * np.where(visited, 1.0, novelty_weight), self.MIN_WEIGHT)
+            envelope = np.maximum(base * boost, self.MIN_WEIGHT)
+            accepted = rng.random(len(pending)) * envelope < weight
+
+            next_nodes[pending[accepted]] = neighbors[accepted]
+            pending = pending[~accepted]
+        return next_nodes
@@ -4,6 +4,7 @@ Based on SciAgents architecture (Ghafarollahi & Buehler, 2024)
 """
 from typing import Dict, List, Optional
 from .llm_manager import LLMManager
+from .cancellation import CancellationToken
 import json
 
 class OntologistAgent:
@@ -11,7 +12,7 @@ class OntologistAgent:
     def __init__(self, llm_manager: LLMManager):
         self.llm_manager = llm_manager
 
-    def define_concepts(self, query: str) -> Dict:
+    def define_concepts(self, query: str, cancel_token: Optional[CancellationToken] = None) -> Dict:
         """Analyze query and identify key biological concepts"""
         prompt = f"""
         Analyze this scientific query for key molecular and cellular concepts:
@@ -43,7 +44,7 @@ class OntologistAgent:
         """
 
         print("\nOntologist analyzing concepts...")
-        response = self.llm_manager.generate_response(prompt, "anthropic", "json")
+        response = self.llm_manager.generate_response(prompt, "anthropic", "json", cancel_token=cancel_token)
         print(f"Ontologist response type: {type(response)}")
         print(f"Ontologist response: {json.dumps(response, indent=2)[:200]}...")
 
@@ -58,20 +59,20 @@ class ScientistAgent:
     def __init__(self, llm_manager: LLMManager):
         self.llm_manager = llm_manager
 
-    def generate_hypothesis(self, concepts: Dict) -> Dict:
+    def generate_hypothesis(self, concepts: Dict, cancel_token: Optional[CancellationToken] = None) -> Dict:
         """Generate detailed scientific hypothesis"""
         # Handle different input formats for flexibility in debate
         if "original_hypothesis" in concepts and "critique" in concepts:
             # This is a rebuttal request during debate
-            return self._generate_rebuttal(concepts)
+            return self._generate_rebuttal(concepts, cancel_token)
         elif "refined_hypothesis" in concepts and "critique" in concepts:
             # This is also a rebuttal scenario
-            return self._generate_rebuttal(concepts)
+            return self._generate_rebuttal(concepts, cancel_token)
         else:
             # Standard hypothesis generation
-            return self._generate_initial_hypothesis(concepts)
+            return self._generate_initial_hypothesis(concepts, cancel_token)
 
-    def _generate_initial_hypothesis(self, concepts: Dict) -> Dict:
+    def _generate_initial_hypothesis(self, concepts: Dict, cancel_token: Optional[CancellationToken] = None) -> Dict:
         """Generate initial scientific hypothesis"""
         prompt = f"""
         Based on these biological concepts:
@@ -114,7 +115,7 @@ class ScientistAgent:
         """
 
         print("\nScientist generating hypothesis...")
-        response = self.llm_manager.generate_response(prompt, "anthropic", "json")
+        response = self.llm_manager.generate_response(prompt, "anthropic", "json", cancel_token=cancel_token)
         print(f"Scientist response: {json.dumps(response, indent=2)[:200]}...")
 
         if not isinstance(response, dict) or not response:
@@ -123,7 +124,7 @@ class ScientistAgent:
 
         return response
 
-    def _generate_rebuttal(self, context: Dict) -> Dict:
+    def _generate_rebuttal(self, context: Dict, cancel_token: Optional[CancellationToken] = None) -> Dict:
         """Generate rebuttal to critique during debate"""
         # Determine which hypothesis to use
         hypothesis = context.get("refined_hypothesis", context.get("original_hypothesis", {}))
@@ -148,7 +149,7 @@ class ScientistAgent:
         """
 
         print("\nScientist generating rebuttal...")
-        response = self.llm_manager.generate_response(prompt, "anthropic", "json")
+        response = self.llm_manager.generate_response(prompt, "anthropic", "json", cancel_token=cancel_token)
 
         if not isinstance(response, dict) or not response:
             print("Error: Invalid response from Scientist rebuttal")
@@ -161,7 +162,7 @@ class ExpanderAgent:
     def __init__(self, llm_manager: LLMManager):
         self.llm_manager = llm_manager
 
-    def expand_hypothesis(self, hypothesis: Dict) -> Dict:
+    def expand_hypothesis(self, hypothesis: Dict, cancel_token: Optional[CancellationToken] = None) -> Dict:
         """Expand and refine hypothesis based on context"""
         # Handle combined context for debate
         if "original_hypothesis" in hypothesis and "critique" in hypothesis:
@@ -225,7 +226,7 @@ class ExpanderAgent:
             """
 
         print("\nExpander refining hypothesis...")
-        response = self.llm_manager.generate_response(prompt, "anthropic", "json")
+        response = self.llm_manager.generate_response(prompt, "anthropic", "json", cancel_token=cancel_token)
 
         if not isinstance(response, dict) or not response:
             print("Error: Invalid response from Expander")
@@ -238,7 +239,7 @@ class CriticAgent:
     def __init__(self, llm_manager: LLMManager):
         self.llm_manager = llm_manager
 
-    def review_hypothesis(self, hypothesis: Dict) -> Dict:
+    def review_hypothesis(self, hypothesis: Dict, cancel_token: Optional[CancellationToken] = None) -> Dict:
         """Critically evaluate hypothesis"""
         prompt = f"""
         Critically evaluate this scientific hypothesis:
@@ -269,7 +270,7 @@ class CriticAgent:
         """
 
         print("\nCritic evaluating hypothesis...")
-        response = self.llm_manager.generate_response(prompt, "anthropic", "json")
+        response = self.llm_manager.generate_response(prompt, "anthropic", "json", cancel_token=cancel_token)
 
         if not isinstance(response, dict) or not response:
             print("Error: Invalid response from Critic")
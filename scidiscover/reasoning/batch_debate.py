@@ -0,0 +1,201 @@
+"""
+Batch runner for debating families of related scientific queries
+Runs debates concurrently with isolated per-debate state and shared concept extraction
+"""
+from typing import Callable, Dict, FrozenSet, Iterator, List, Optional, Set
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from .cancellation import CancellationToken, DebateCancelled
+import re
+import sys
+import threading
+
+QUERY_STOPWORDS = {'what', 'how', 'why', 'when', 'where', 'which', 'who', 'there', 'their',
+                   'does', 'about', 'between', 'through', 'during', 'with', 'from', 'into', 'the',
+                   'and', 'for', 'are', 'its', 'can', 'was', 'has', 'have', 'been', 'not', 'but',
+                   'this', 'that', 'these', 'those', 'via', 'than', 'then', 'they', 'them'}
+MIN_SHARED_FRACTION = 0.6  # Share of content terms that makes two queries one family with a shared core extraction
+
+
+def query_terms(query: str) -> Set[str]:
+    """Content-bearing terms of a query, used to detect overlapping queries"""
+    return set(ordered_terms(query))
+
+
+def ordered_terms(query: str) -> List[str]:
+    """Content-bearing terms of a query in order of appearance, without repetitions"""
+    words = re.findall(r"[a-z0-9][a-z0-9\-]+", query.lower())
+    return list(dict.fromkeys(w for w in words if len(w) > 2 and w not in QUERY_STOPWORDS))
+
+
+def core_query(query: str, core: FrozenSet[str]) -> str:
+    """The query without the words carrying content terms outside core (e.g. its tissue)"""
+    words = [word for word in query.split() if query_terms(word) <= core]
+    return " ".join(words)
+
+
+class ConceptCache:
+    """
+    Shares concept extraction results between queries asking about the same concepts
+
+    Queries of a batch that mostly share their content terms (e.g. one mechanism across
+    several tissues) form a family. The family's shared core is extracted once, from the
+    query with the query-specific words removed, and each query adds its own specific terms
+    (the tissue, the cell type) as concepts. Concepts specific to one query are therefore
+    never mixed into another's. Other queries are extracted on their own, and rephrasings
+    of one query (word order, case, stopwords) and concurrent duplicates share one extraction.
+    """
+    def __init__(self, extract_fn: Callable[..., List[str]], min_shared_fraction: float = MIN_SHARED_FRACTION):
+        """
+        Args:
+            extract_fn: Function extracting concepts for a single query
+            min_shared_fraction: Fraction of a query's terms another query must share to be in its family
+        """
+        self.extract_fn = extract_fn
+        self.min_shared_fraction = min_shared_fraction
+        self.entries: Dict[FrozenSet[str], Future] = {}  # Extracted terms -> Future resolving to the concepts
+        self.cores: Dict[FrozenSet[str], FrozenSet[str]] = {}  # Query terms -> terms of its family's shared core
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def plan(self, queries: List[str]) -> None:
+        """
+        Find the families among queries that will be looked up, so they can share their core extraction
+        Args:
+            queries: Queries of a batch
+        """
+        term_sets = {frozenset(query_terms(query)) for query in queries}
+        term_sets.discard(frozenset())
+        for terms in term_sets:
+            family = [
+                other for other in term_sets
+                if len(terms & other) >= self.min_shared_fraction * max(len(terms), len(other))
+            ]
+            core = frozenset.intersection(*family)
+            if len(family) > 1 and core:
+                with self._lock:
+                    self.cores[terms] = core
+
+    def get(self, query: str, *extract_args) -> List[str]:
+        """
+        Concepts for a query: its family's shared core concepts plus its own specific terms,
+        or its own extraction (once per set of content terms) outside a family
+        Args:
+            query: Scientific query
+            extract_args: Extra arguments passed to extract_fn on a miss
+        Returns:
+            List of concepts
+        """
+        terms = frozenset(query_terms(query))
+        core = self.cores.get(terms)
+        if core is None:
+            return self._lookup(terms or query.strip().lower(), query, extract_args)
+
+        concepts = self._lookup(core, core_query(query, core), extract_args)
+        known = {concept.lower() for concept in concepts if isinstance(concept, str)}
+        for term in ordered_terms(query):
+            if term not in core and term not in known:
+                concepts.append(term)
+                known.add(term)
+        return concepts
+
+    def _lookup(self, key, query: str, extract_args: tuple) -> List[str]:
+        """Concepts extracted from query, extracted once per key"""
+        with self._lock:
+            future = self.entries.get(key)
+            owner = future is None
+            if owner:
+                future = Future()
+                self.entries[key] = future
+                self.misses += 1
+            else:
+                self.hits += 1
+
+        if not owner:
+            # Waits if the same lookup is still running on another thread
+            print("Reusing concept extraction of an equivalent query")
+            return list(future.result())
+
+        try:
+            future.set_result(list(self.extract_fn(query, *extract_args)))
+        finally:
+            if not future.done():
+                # Extraction raised (including cancellation and interrupts): later queries
+                # retry it, and waiting queries get the error instead of blocking forever
+                with self._lock:
+                    self.entries.pop(key, None)
+                future.set_exception(sys.exc_info()[1])
+        return list(future.result())
+
+
+class BatchDebateRunner:
+    """
+    Runs debates for N related queries concurrently under a global concurrency cap
+    Each debate gets its own orchestrator state; results are streamed as they finish
+    """
+    def __init__(self, sci_agent, max_concurrency: int = 3):
+        """
+        Args:
+            sci_agent: SciAgent providing concept extraction and the template orchestrator
+            max_concurrency: Maximum number of debates running at the same time
+        """
+        self.sci_agent = sci_agent
+        self.max_concurrency = max(1, max_concurrency)
+        self.concept_cache = ConceptCache(sci_agent.extract_debate_concepts)
+
+    def run(self, queries: List[str], novelty_score: float = 0.5,
+            deadline: Optional[float] = None,
+            cancel_token: Optional[CancellationToken] = None) -> Iterator[Dict]:
+        """
+        Debate every query and yield each result as soon as its debate completes
+        Args:
+            queries: Related scientific queries
+            novelty_score: Target novelty level (0-1) for all debates
+            deadline: Optional per-debate wall-clock budget in seconds
+            cancel_token: Optional token cancelling all running and queued debates
+        Yields:
+            Dicts with index, query, concepts, analysis and debate_history (plus error on failure)
+        """
+        print(f"Starting batch debate of {len(queries)} queries (max {self.max_concurrency} concurrent)")
+        self.concept_cache.plan(queries)
+        pool = ThreadPoolExecutor(max_workers=self.max_concurrency)
+        try:
+            futures = [
+                pool.submit(self._run_one, index, query, novelty_score, deadline, cancel_token)
+                for index, query in enumerate(queries)
+            ]
+            for future in as_completed(futures):
+                yield future.result()
+        finally:
+            # Stop queued debates if the consumer stops iterating early
+            pool.shutdown(wait=False, cancel_futures=True)
+            print(f"Batch debate finished: concept cache hits {self.concept_cache.hits}, "
+                  f"misses {self.concept_cache.misses}")
+
+    def _run_one(self, index: int, query: str, novelty_score: float,
+                 deadline: Optional[float], cancel_token: Optional[CancellationToken]) -> Dict:
+        """Run one isolated debate"""
+        orchestrator = self.sci_agent.debate_orchestrator.spawn()
+        result = {"index": index, "query": query, "concepts": [], "debate_history": []}
+        try:
+            if cancel_token:
+                cancel_token.raise_if_cancelled()
+            # Extract on the debate's own LLM manager copy, whose stream and call observers are its own
+            result["concepts"] = self.concept_cache.get(query, cancel_token, orchestrator.ontologist)
+            result["analysis"] = orchestrator.orchestrate_debate(
+                query,
+                result["concepts"],
+                novelty_score=novelty_score,
+                deadline=deadline,
+                cancel_token=cancel_token
+            )
+        except DebateCancelled:
+            print(f"Batch debate for query {index} cancelled before it started")
+            result["analysis"] = self.sci_agent.llm_manager._generate_default_response(query)
+            result["analysis"]["cancelled"] = True
+        except Exception as e:
+            print(f"Error in batch debate for query {index}: {str(e)}")
+            result["error"] = str(e)
+            result["analysis"] = self.sci_agent.llm_manager._generate_default_response(query)
+        result["debate_history"] = orchestrator.get_debate_history()
+        return result
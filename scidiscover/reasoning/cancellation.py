@@ -0,0 +1,79 @@
+"""
+Cooperative cancellation for long-running analyses
+A token shared by the UI, the orchestrator, the agents and the LLM manager
+"""
+from typing import Callable, Optional
+import threading
+
+
+class DebateCancelled(Exception):
+    """Raised inside an analysis once its cancellation token has been cancelled"""
+
+
+class CancellationToken:
+    """
+    Thread-safe cancellation flag with callbacks
+    Callbacks (e.g. closing an in-flight Claude stream) run immediately on cancel()
+    """
+    def __init__(self):
+        self._event = threading.Event()
+        self._callbacks = {}
+        self._next_id = 0
+        self._lock = threading.Lock()
+        self.reason = None
+
+    @property
+    def cancelled(self) -> bool:
+        """Whether cancellation has been requested"""
+        return self._event.is_set()
+
+    def cancel(self, reason: str = "Cancelled by user") -> None:
+        """Request cancellation and run all registered callbacks"""
+        with self._lock:
+            if self._event.is_set():
+                return
+            self.reason = reason
+            self._event.set()
+            callbacks = list(self._callbacks.values())
+            self._callbacks.clear()
+
+        print(f"Cancellation requested: {reason}")
+        for callback in callbacks:
+            try:
+                callback()
+            except Exception as e:
+                print(f"Error in cancellation callback: {str(e)}")
+
+    def raise_if_cancelled(self) -> None:
+        """Raise DebateCancelled if cancellation has been requested"""
+        if self._event.is_set():
+            raise DebateCancelled(self.reason)
+
+    def register(self, callback: Callable[[], None]) -> Optional[int]:
+        """
+        Register a callback to run on cancellation
+        Args:
+            callback: Function without arguments
+        Returns:
+            Handle for unregister(), or None if already cancelled (the callback then runs immediately)
+        """
+        with self._lock:
+            if not self._event.is_set():
+                handle = self._next_id
+                self._next_id += 1
+                self._callbacks[handle] = callback
+                return handle
+
+        callback()
+        return None
+
+    def unregister(self, handle: Optional[int]) -> None:
+        """Remove a callback registered with register()"""
+        if handle is None:
+            return
+        with self._lock:
+            self._callbacks.pop(handle, None)
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Block until cancelled or the timeout expires; returns whether cancelled"""
+        return self._event.wait(timeout)
@@ -0,0 +1,170 @@
+"""
+Event stream for debate progress
+Thread-safe publish/subscribe of typed debate events with per-subscriber backpressure
+"""
+from typing import Any, Dict, List, Optional
+from dataclasses import dataclass, field
+import asyncio
+import datetime
+import queue
+import threading
+
+# Event types
+EVENT_DEBATE_STARTED = "debate_started"
+EVENT_STEP_STARTED = "step_started"
+EVENT_TOKEN_PROGRESS = "token_progress"
+EVENT_STEP_FINISHED = "step_finished"
+EVENT_HISTORY_ENTRY = "history_entry"
+EVENT_SCORE = "score"
+EVENT_CONVERGED = "converged"
+EVENT_DEBATE_FINISHED = "debate_finished"
+EVENT_DEBATE_CANCELLED = "debate_cancelled"
+
+# Backpressure policies for slow subscribers
+POLICY_DROP_OLDEST = "drop_oldest"  # Never blocks the debate; the subscriber loses the oldest events
+POLICY_BLOCK = "block"  # Blocks the publisher up to block_timeout, then drops the new event
+
+
+@dataclass
+class DebateEvent:
+    """A single debate progress event"""
+    type: str
+    debate_id: str
+    round: Optional[int] = None
+    role: Optional[str] = None
+    data: Dict[str, Any] = field(default_factory=dict)
+    timestamp: str = field(default_factory=lambda: datetime.datetime.now().isoformat())
+
+
+class _Closed:
+    """Sentinel waking up consumers of a closed subscription"""
+
+
+class DebateEventSubscription:
+    """
+    Bounded event queue of one subscriber
+    Iterate synchronously (for event in subscription) or asynchronously (async for event in subscription)
+    """
+    def __init__(self, bus: "DebateEventBus", max_queue: int, policy: str, block_timeout: float):
+        self.bus = bus
+        self.policy = policy
+        self.block_timeout = block_timeout
+        self.dropped = 0
+        self.closed = False
+        self._queue = queue.Queue(maxsize=max_queue)
+
+    def offer(self, event: DebateEvent) -> None:
+        """Deliver an event according to the backpressure policy (called by the bus)"""
+        if self.closed:
+            return
+        if self.policy == POLICY_BLOCK:
+            try:
+                self._queue.put(event, timeout=self.block_timeout)
+            except queue.Full:
+                self.dropped += 1
+            return
+
+        while True:
+            try:
+                self._queue.put_nowait(event)
+                return
+            except queue.Full:
+                try:
+                    self._queue.get_nowait()
+                    self.dropped += 1
+                except queue.Empty:
+                    pass
+
+    def get(self, timeout: Optional[float] = None) -> Optional[DebateEvent]:
+        """
+        Next event, or None if the timeout expires or the subscription is closed
+        Args:
+            timeout: Seconds to wait; None waits until an event arrives
+        """
+        if self.closed and self._queue.empty():
+            return None
+        try:
+            event = self._queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+        return None if isinstance(event, _Closed) else event
+
+    def close(self) -> None:
+        """Stop receiving events and wake up any waiting consumer"""
+        if self.closed:
+            return
+        self.closed = True
+        self.bus.unsubscribe(self)
+        try:
+            self._queue.put_nowait(_Closed())
+        except queue.Full:
+            # Nobody waits on a full queue; its consumer sees the closed flag once it has drained the queue
+            pass
+
+    def __iter__(self):
+        while True:
+            event = self.get()
+            if event is None:
+                return
+            yield event
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self) -> DebateEvent:
+        event = await asyncio.to_thread(self.get)
+        if event is None:
+            raise StopAsyncIteration
+        return event
+
+
+class DebateEventBus:
+    """
+    Fan-out of debate events to any number of subscribers (UIs, loggers, metrics)
+    Publishing never raises and, with the default policy, never blocks the debate thread
+    """
+    def __init__(self):
+        self._subscribers = []
+        self._lock = threading.Lock()
+
+    def subscribe(self, max_queue: int = 256, policy: str = POLICY_DROP_OLDEST,
+                  block_timeout: float = 1.0) -> DebateEventSubscription:
+        """
+        Register a new subscriber
+        Args:
+            max_queue: Maximum number of undelivered events buffered for this subscriber
+            policy: POLICY_DROP_OLDEST or POLICY_BLOCK
+            block_timeout: Maximum seconds the publisher waits under POLICY_BLOCK
+        Returns:
+            The subscription to consume events from
+        """
+        subscription = DebateEventSubscription(self, max_queue, policy, block_timeout)
+        with self._lock:
+            self._subscribers.append(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: DebateEventSubscription) -> None:
+        """Remove a subscriber"""
+        with self._lock:
+            if subscription in self._subscribers:
+                self._subscribers.remove(subscription)
+
+    def publish(self, event: DebateEvent) -> None:
+        """Deliver an event to all current subscribers"""
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for subscription in subscribers:
+            try:
+                subscription.offer(event)
+            except Exception as e:
+                print(f"Error delivering debate event: {str(e)}")
+
+    def has_subscribers(self) -> bool:
+        """Whether anyone is listening (lets publishers skip building expensive events)"""
+        with self._lock:
+            return bool(self._subscribers)
+
+    def subscribers(self) -> List[DebateEventSubscription]:
+        """Current subscriptions"""
+        with self._lock:
+            return list(self._subscribers)
@@ -0,0 +1,219 @@
+"""
+Bounded-context memory for multi-agent debates
+Keeps every debate prompt within a fixed token budget while the full history is stored out of band
+"""
+from typing import Dict, List, Optional, Any, Tuple
+import copy
+import datetime
+import json
+import os
+
+
+class DebateMemory:
+    """
+    Rolling debate memory with a fixed per-prompt token budget
+
+    List items (insights, limitations, pathways, ...) are tagged with the debate round in which
+    they first appeared. When a payload exceeds the budget, items from older rounds are summarised
+    first, then dropped lowest-value first; items introduced in the latest round (the deltas) keep
+    full fidelity. Every archived entry stays available through get_full_history().
+    """
+    CHARS_PER_TOKEN = 4  # Rough estimate for English scientific text
+    SUMMARY_CHARS = 160  # Length older items are summarised down to
+    MIN_STRING_CHARS = 400  # Floor when truncating long free-text fields as a last resort
+    OMISSION_NOTE_CHARS = 80  # Serialised size of the note replacing the items dropped from a list
+
+    def __init__(self, token_budget: int = 6000, archive_path: Optional[str] = None):
+        """
+        Args:
+            token_budget: Maximum estimated tokens per prompt for the structures serialised into it
+            archive_path: Optional JSONL file that receives the full debate history
+        """
+        self.token_budget = token_budget
+        self.archive_path = archive_path
+        self.current_round = 0
+        self.item_rounds = {}  # Canonical item text -> round in which it first appeared
+        self.history = []  # Full-fidelity history, never serialised into prompts
+
+        if self.archive_path:
+            archive_dir = os.path.dirname(self.archive_path)
+            if archive_dir:
+                os.makedirs(archive_dir, exist_ok=True)
+
+    def reset(self) -> None:
+        """Clear all state before a new debate"""
+        self.current_round = 0
+        self.item_rounds = {}
+        self.history = []
+
+    def start_round(self, round_num: int) -> None:
+        """Mark the start of a debate round; items first seen from now on belong to it"""
+        self.current_round = round_num
+
+    def observe(self, payload: Any) -> None:
+        """Register the list items of a payload so their originating round is known"""
+        for _, _, item in self._iter_list_items(payload):
+            self.item_rounds.setdefault(self._item_key(item), self.current_round)
+
+    def archive(self, agent_name: str, action_type: str, content: Any) -> None:
+        """
+        Store a full-fidelity debate entry out of band
+        Args:
+            agent_name: Agent that produced the content
+            action_type: Debate action (critique, refinement, ...)
+            content: The complete, uncompacted content
+        """
+        self.observe(content)
+        entry = {
+            "round": self.current_round,
+            "agent": agent_name,
+            "action": action_type,
+            "content": content,
+            "timestamp": datetime.datetime.now().isoformat()
+        }
+        self.history.append(entry)
+
+        if self.archive_path:
+            try:
+                with open(self.archive_path, "a") as f:
+                    f.write(json.dumps(entry, default=str) + "\n")
+            except OSError as e:
+                print(f"Failed to write debate memory archive: {str(e)}")
+
+    def get_full_history(self) -> List[Dict]:
+        """Get the complete, uncompacted debate history"""
+        return self.history
+
+    def estimate_tokens(self, payload: Any) -> int:
+        """Estimate the prompt tokens used by serialising a payload"""
+        return len(json.dumps(payload, indent=2, default=str)) // self.CHARS_PER_TOKEN
+
+    def compact(self, payload: Any, token_budget: Optional[int] = None, parts: int = 1) -> Any:
+        """
+        Return a copy of the payload that fits its share of the token budget
+        Args:
+            payload: Hypothesis, critique or other structure to be serialised into a prompt
+            token_budget: Override for the default per-prompt budget
+            parts: Number of compacted structures the prompt embeds; each gets an equal share
+        Returns:
+            The payload unchanged (copied) if it fits, otherwise a compacted copy
+        """
+        budget = max(1, (token_budget or self.token_budget) // max(1, parts))
+        compacted = copy.deepcopy(payload)
+        self.observe(compacted)
+
+        if self.estimate_tokens(compacted) <= budget:
+            return compacted
+
+        # Stage 1: summarise items carried over from older rounds
+        older = self._older_items(compacted)
+        for container, index, item in older:
+            if isinstance(item, str) and len(item) > self.SUMMARY_CHARS:
+                summary = self._summarise(item)
+                # The summary inherits the round of the item it replaces
+                self.item_rounds.setdefault(self._item_key(summary), self.item_rounds[self._item_key(item)])
+                container[index] = summary
+        if self.estimate_tokens(compacted) <= budget:
+            return compacted
+
+        # Stage 2: drop older items, oldest and least informative first
+        compacted = self._drop_older_items(compacted, budget)
+        if self.estimate_tokens(compacted) <= budget:
+            return compacted
+
+        # Stage 3: truncate the longest free-text fields, including the latest deltas
+        return self._truncate_strings(compacted, budget)
+
+    def _drop_older_items(self, payload: Any, budget: int) -> Any:
+        """Drop older list items until the estimated size fits the budget"""
+        excess = (self.estimate_tokens(payload) - budget) * self.CHARS_PER_TOKEN
+        seen = set()
+        candidates = []
+        for container, index, item in self._older_items(payload):
+            key = self._item_key(item)
+            duplicate = key in seen
+            seen.add(key)
+            size = len(json.dumps(item, indent=2, default=str)) + 8
+            # Duplicates go first, then the oldest rounds, then the shortest (least detailed) items
+            candidates.append((not duplicate, self.item_rounds.get(key, 0), size, id(container), index, size))
+
+        candidates.sort(key=lambda c: (c[0], c[1], c[2]))
+
+        to_drop = {}
+        freed = 0
+        for _, _, _, container_id, index, size in candidates:
+            if freed >= excess:
+                break
+            if container_id not in to_drop:
+                # The first item dropped from a list adds an omission note to it
+                freed -= self.OMISSION_NOTE_CHARS
+            to_drop.setdefault(container_id, set()).add(index)
+            freed += size
+
+        if not to_drop:
+            return payload
+
+        for container, _, _ in list(self._iter_list_items(payload)):
+            indices = to_drop.pop(id(container), None)
+            if not indices:
+                continue
+            kept = [item for i, item in enumerate(container) if i not in indices]
+            kept.append(f"[{len(indices)} earlier item(s) omitted; full history retained out of band]")
+            container[:] = kept
+
+        return payload
+
+    def _truncate_strings(self, payload: Any, budget: int) -> Any:
+        """Truncate the longest string fields until the payload fits the budget"""
+        limit = max(self.MIN_STRING_CHARS, budget * self.CHARS_PER_TOKEN // 4)
+        while self.estimate_tokens(payload) > budget and limit >= self.MIN_STRING_CHARS:
+            payload = self._truncate_recursive(payload, limit)
+            limit //= 2
+        return payload
+
+    def _truncate_recursive(self, value: Any, limit: int) -> Any:
+        if isinstance(value, str):
+            return value if len(value) <= limit else value[:limit].rstrip() + " ..."
+        if isinstance(value, dict):
+            return {k: self._truncate_recursive(v, limit) for k, v in value.items()}
+        if isinstance(value, list):
+            return [self._truncate_recursive(v, limit) for v in value]
+        return value
+
+    def _older_items(self, payload: Any) -> List[Tuple[list, int, Any]]:
+        """List items that first appeared before the current round"""
+        return [
+            (container, index, item)
+            for container, index, item in self._iter_list_items(payload)
+            if self.item_rounds.get(self._item_key(item), self.current_round) < self.current_round
+        ]
+
+    def _iter_list_items(self, value: Any):
+        """Yield (container, index, item) for every leaf-level list item in a nested structure"""
+        if isinstance(value, dict):
+            for child in value.values():
+                yield from self._iter_list_items(child)
+        elif isinstance(value, list):
+            for index, item in enumerate(value):
+                if isinstance(item, (dict, list)) and not self._is_leaf_record(item):
+                    yield from self._iter_list_items(item)
+                else:
+                    yield value, index, item
+
+    @staticmethod
+    def _is_leaf_record(item: Any) -> bool:
+        """Small flat records such as {"name": ..., "role": ...} are treated as single items"""
+        return isinstance(item, dict) and all(not isinstance(v, (dict, list)) for v in item.values())
+
+    @staticmethod
+    def _item_key(item: Any) -> str:
+        if isinstance(item, str):
+            return " ".join(item.lower().split())
+        return json.dumps(item, sort_keys=True, default=str)
+
+    def _summarise(self, text: str) -> str:
+        """Shorten an item to its first sentence, capped at SUMMARY_CHARS"""
+        first_sentence = text.split(". ")[0]
+        if len(first_sentence) > self.SUMMARY_CHARS:
+            first_sentence = first_sentence[:self.SUMMARY_CHARS].rsplit(" ", 1)[0]
+        return first_sentence.rstrip(".") + " ..."
@@ -5,9 +5,44 @@ Based on the interactive debate methodology from Google's AI Coscientist
 from typing import Dict, List, Optional, Callable
 from .llm_manager import LLMManager
 from .agents import OntologistAgent, ScientistAgent, ExpanderAgent, CriticAgent
+from .debate_memory import DebateMemory
+from .debate_profiler import DebateProfiler
+from .cancellation import CancellationToken, DebateCancelled
+from .debate_events import (
+    DebateEvent, DebateEventBus, EVENT_DEBATE_STARTED, EVENT_STEP_STARTED, EVENT_TOKEN_PROGRESS,
+    EVENT_STEP_FINISHED, EVENT_HISTORY_ENTRY, EVENT_SCORE, EVENT_CONVERGED, EVENT_DEBATE_FINISHED,
+    EVENT_DEBATE_CANCELLED
+)
+from .debate_scheduler import (
+    DEFAULT_LATENCY_STATS, THINKING_MODES, DebateScheduler, ROLE_SCIENTIST, ROLE_CRITIC, ROLE_EXPANDER,
+    ROLE_SPECIALIST, ROLE_REBUTTAL, ROLE_MERGE, ROLE_EVALUATE, ROLE_SYNTHESIS, ROLE_COMPACT_ROUND
+)
+from .scoring import (
+    DEFAULT_SCORE_CACHE, PRIOR_STDEV, SCORE_DIMENSIONS, ScoreEstimate, aggregate_samples, hypothesis_hash,
+    parse_score_samples
+)
+from ..config import (
+    DEBATE_MEMORY_TOKEN_BUDGET, DEBATE_EVALUATION_MODE, DEBATE_ROUND_STRATEGY,
+    DEBATE_SCORING_MODE, DEBATE_SCORE_SAMPLES
+)
+import copy
 import json
 import datetime
 import re
+import time
+import uuid
+
+# How hypotheses are scored during a debate
+EVALUATION_MODE_CRITIC = "critic"  # Score every hypothesis by the confidence_score of a critique of it
+EVALUATION_MODE_SEPARATE = "separate"  # Dedicated evaluation call after every merge
+SCORING_MODE_SINGLE = "single"  # One overall score per evaluation call
+SCORING_MODE_SAMPLED = "self_consistency"  # k dimension-score samples per call, aggregated with a confidence interval
+
+# How the agents of a debate round are called
+ROUND_STRATEGY_FULL = "full"  # One independent call per agent (critic, expander, specialists, scientist, merge)
+ROUND_STRATEGY_COMPACT = "compact"  # A single structured call playing all agents of the round
+ROUND_STRATEGY_AUTO = "auto"  # Compact in the "low" and "none" thinking modes, full otherwise
+COMPACT_THINKING_MODES = ("low", "none")
 
 class DebateOrchestrator:
     """
@@ -47,10 +82,35 @@ class DebateOrchestrator:
         }
 
         self.debate_history = []
+        # Bounded-context memory: prompts see compacted views, full history is kept out of band
+        self.memory = DebateMemory(token_budget=DEBATE_MEMORY_TOKEN_BUDGET)
         self.base_debate_rounds = 3
         self.update_callback = None  # Callback for real-time updates
         self.convergence_threshold = 0.8  # Threshold for debate convergence
         self.max_debate_rounds = 5  # Maximum number of rounds regardless of convergence
+        self.evaluation_mode = DEBATE_EVALUATION_MODE  # "critic" fuses scoring into the critiques
+        self.round_strategy = DEBATE_ROUND_STRATEGY  # "compact" trades agent independence for fewer calls
+        self.scoring_mode = DEBATE_SCORING_MODE  # "self_consistency" scores with confidence intervals
+        self.score_samples = DEBATE_SCORE_SAMPLES  # Samples per self-consistency evaluation
+        self.score_cache = DEFAULT_SCORE_CACHE  # Scores keyed by scorer settings and canonical hypothesis hash, shared across debates
+        self.latency_stats = DEFAULT_LATENCY_STATS  # Observed per-role latencies, shared across debates
+
+        # Event stream for progress consumers (UIs, loggers, metrics)
+        self.events = DebateEventBus()
+        self.debate_id = uuid.uuid4().hex[:8]
+        self.current_round = None
+        self.current_role = None
+        self.llm_manager.stream_listener = self._on_stream_progress
+
+        # Per-debate cost/latency breakdown, fed by timed steps and completed LLM calls
+        self.profiler = DebateProfiler()
+        self.llm_manager.call_observer = self.profiler.record_call
+
+        # Cooperative cancellation and best-so-far state of the running debate
+        self.cancel_token = None
+        self.best_hypothesis = {}
+        self.best_score = 0.0
+        self.best_estimate = None
 
     def set_update_callback(self, callback: Callable):
         """
@@ -62,7 +122,34 @@ class DebateOrchestrator:
         self.update_callback = callback
         print("Debate update callback registered")
 
-    def orchestrate_debate(self, query: str, concepts: List[str], novelty_score: float = 0.5) -> Dict:
+    def spawn(self) -> "DebateOrchestrator":
+        """
+        Create an orchestrator for an independent, concurrently running debate
+
+        The new orchestrator shares the API clients, latency statistics, specialist
+        definitions and update callback, but has its own debate history, memory and
+        thinking-mode state, so debates can run side by side without interfering.
+        """
+        # A shallow copy shares the HTTP clients but isolates per-debate thinking-mode changes
+        orchestrator = DebateOrchestrator(copy.copy(self.llm_manager))
+        orchestrator.specialized_agents = self.specialized_agents
+        orchestrator.base_debate_rounds = self.base_debate_rounds
+        orchestrator.convergence_threshold = self.convergence_threshold
+        orchestrator.max_debate_rounds = self.max_debate_rounds
+        orchestrator.evaluation_mode = self.evaluation_mode
+        orchestrator.round_strategy = self.round_strategy
+        orchestrator.scoring_mode = self.scoring_mode
+        orchestrator.score_samples = self.score_samples
+        orchestrator.score_cache = self.score_cache
+        orchestrator.latency_stats = self.latency_stats
+        orchestrator.memory.token_budget = self.memory.token_budget
+        orchestrator.update_callback = self.update_callback
+        orchestrator.events = self.events  # Events carry a per-debate debate_id
+        return orchestrator
+
+    def orchestrate_debate(self, query: str, concepts: List[str], novelty_score: float = 0.5,
+                           deadline: Optional[float] = None,
+                           cancel_token: Optional[CancellationToken] = None) -> Dict:
         """
         Run a multi-agent debate to refine a scientific hypothesis
 
@@ -70,14 +157,56 @@ class DebateOrchestrator:
             query: The scientific question to analyze
             concepts: Key concepts identified in the query
             novelty_score: Target novelty level (0-1)
+            deadline: Optional wall-clock budget in seconds; rounds, specialists and
+                      thinking budgets are then scheduled to fit within it
+            cancel_token: Optional token; cancelling it stops the debate, closes the
+                          active Claude stream and returns the best hypothesis so far
 
         Returns:
             A refined scientific analysis after multiple debate rounds
+            (marked with "cancelled": True if the debate was cancelled)
         """
+        # The scheduler may lower the thinking mode per round; always restore the user's choice
+        original_thinking_mode = self.llm_manager.thinking_mode
+        self.cancel_token = cancel_token
+        self.best_hypothesis = {}
+        self.best_score = 0.0
+        self.best_estimate = None
+        try:
+            return self._run_debate(query, concepts, novelty_score, deadline)
+        except DebateCancelled as e:
+            print(f"Debate cancelled ({e}); returning best hypothesis so far with score {self.best_score}")
+            self.current_round = None
+            self._publish(EVENT_DEBATE_CANCELLED, reason=str(e), best_score=self.best_score)
+            analysis = self._fallback_analysis(self.best_hypothesis, self.best_score)
+            analysis["validation"] = "Debate cancelled before completion; showing the best hypothesis reached so far"
+            analysis["cancelled"] = True
+            analysis["performance"] = self.profiler.report()
+            return analysis
+        finally:
+            self.llm_manager.set_thinking_mode(original_thinking_mode)
+            self.cancel_token = None
+
+    def _run_debate(self, query: str, concepts: List[str], novelty_score: float,
+                    deadline: Optional[float]) -> Dict:
+        """Debate loop behind orchestrate_debate"""
         print(f"Starting scientific debate on: {query}")
         print(f"With concepts: {concepts}")
         print(f"Targeting novelty level: {novelty_score}")
 
+        self.memory.reset()
+        self.profiler.start()
+        self.debate_id = uuid.uuid4().hex[:8]
+        self.current_round = 0
+        self._publish(EVENT_DEBATE_STARTED, query=query, concepts=concepts, deadline=deadline)
+        scheduler = None
+        if deadline is not None:
+            scheduler = DebateScheduler(deadline, self.llm_manager.thinking_mode, self.latency_stats,
+                                        fused_evaluation=self._fused_scoring(),
+                                        compact_modes=self._compact_thinking_modes(),
+                                        scoring_fallback=self.scoring_mode == SCORING_MODE_SAMPLED)
+            print(f"Deadline-aware scheduling enabled: {deadline:.0f}s budget")
+
         # Determine query complexity to set adaptive debate parameters
         query_complexity = self._evaluate_query_complexity(query, concepts)
 
@@ -93,88 +222,497 @@ class DebateOrchestrator:
         selected_specialists = self._select_specialized_agents(query, concepts)
         print(f"Selected specialized agents: {[agent for agent in selected_specialists]}")
 
+        if scheduler:
+            # The initial hypothesis and its evaluation come out of the same budget as the rounds
+            initial_mode = scheduler.plan_initial()
+            self.llm_manager.set_thinking_mode(initial_mode)
+            print(f"Initial hypothesis plan: thinking={initial_mode}")
+
         # Initial hypothesis generation by scientist
-        hypothesis = self._generate_initial_hypothesis(query, concepts)
+        hypothesis = self._timed_call(ROLE_SCIENTIST, self._generate_initial_hypothesis, query, concepts)
 
         # Track the best hypothesis and its score
-        best_hypothesis = hypothesis
-        best_score = self._evaluate_hypothesis(hypothesis)
-
-        print(f"Initial hypothesis generated with score: {best_score}")
+        self.best_hypothesis = hypothesis
+        # In critic evaluation mode a hypothesis is scored by the next critique of it
+        unscored_hypothesis = None
+        previous_estimate = None
+        if self._fused_scoring():
+            unscored_hypothesis = hypothesis
+            print("Initial hypothesis generated; it will be scored by the first critique")
+        else:
+            previous_estimate = self._cached_score(hypothesis)
+            self._record_score(hypothesis, previous_estimate, None, 0)
         self._add_to_debate_history("ScientistAgent", "initial_hypothesis", hypothesis)
 
+        if scheduler:
+            # Each round is re-planned below as latency observations accumulate
+            full_rounds = scheduler.plan_rounds(target_debate_rounds, selected_specialists)
+            print(f"Full-quality rounds expected to fit the deadline: {full_rounds} of {target_debate_rounds}")
+
         # Run multiple rounds of debate with convergence checking
         round_num = 1
         convergence = False
-        previous_score = best_score
 
         while round_num <= target_debate_rounds and not convergence:
-            print(f"\n=== Starting debate round {round_num} ===")
+            round_specialists = selected_specialists
+            local_merge = False
+            if scheduler:
+                plan = scheduler.plan_round(selected_specialists)
+                if plan is None:
+                    print(f"Deadline leaves no time for round {round_num}; proceeding to synthesis")
+                    break
+                round_specialists = plan["specialists"]
+                local_merge = plan["local_merge"]
+                self.llm_manager.set_thinking_mode(plan["thinking_mode"])
+                print(f"Round {round_num} plan: thinking={plan['thinking_mode']}, "
+                      f"specialists={round_specialists}, local_merge={local_merge}")
 
-            # Critic challenges the hypothesis
-            critique = self._generate_critique(hypothesis, selected_specialists)
+            print(f"\n=== Starting debate round {round_num} ===")
+            self.current_round = round_num
+            self.memory.start_round(round_num)
+
+            round_output = None
+            if self._use_compact_round():
+                # All agents of the round answer in one structured response
+                print(f"Round {round_num} uses the compact single-call strategy")
+                round_output = self._timed_call(
+                    ROLE_COMPACT_ROUND, self._generate_compact_round, hypothesis, round_specialists, query
+                )
+                if round_output is None:
+                    print("Compact round response unusable; falling back to separate agent calls")
+                    if scheduler:
+                        # Only a minimal full round is reserved in the deadline plan
+                        round_specialists, local_merge = [], True
+            if round_output is not None:
+                critique = round_output["critique"]
+            else:
+                # Critic challenges the hypothesis
+                critique = self._timed_call(ROLE_CRITIC, self._generate_critique, hypothesis, round_specialists)
             self._add_to_debate_history("CriticAgent", "critique", critique)
             print(f"Critic has challenged the hypothesis with {len(critique.get('evaluation', {}).get('limitations', []))} limitations")
 
-            # Expander refines based on critique
-            refined_hypothesis = self._refine_hypothesis(hypothesis, critique)
-            self._add_to_debate_history("ExpanderAgent", "refinement", refined_hypothesis)
-            print(f"Expander has refined the hypothesis with {len(refined_hypothesis.get('expanded_mechanisms', {}).get('additional_pathways', []))} new pathways")
-
-            # Specialized agent contributions if available
-            if selected_specialists:
-                for specialist_key in selected_specialists:
-                    specialist_input = self._generate_specialist_contribution(
-                        specialist_key, 
-                        refined_hypothesis, 
-                        critique,
-                        query
-                    )
-                    agent_name = self.specialized_agents[specialist_key]["role"]
-                    self._add_to_debate_history(agent_name, "specialist_input", specialist_input)
-                    print(f"{agent_name} provided specialized input")
-
-                    # Integrate specialist contributions
-                    refined_hypothesis = self._integrate_specialist_input(
-                        refined_hypothesis, 
-                        specialist_input
+            if unscored_hypothesis is not None:
+                # The critique doubles as the evaluation of the previous round's hypothesis
+                current_estimate = self._critic_estimate(unscored_hypothesis, round_specialists, critique)
+                if current_estimate is not None:
+                    convergence = self._record_score(
+                        unscored_hypothesis, current_estimate, previous_estimate, round_num - 1
                     )
+                previous_estimate = current_estimate
+                unscored_hypothesis = None
+                if convergence:
+                    break
+
+            if round_output is not None:
+                hypothesis = self._apply_compact_round(round_output, round_specialists)
+            else:
+                hypothesis = self._run_round_agents(hypothesis, critique, round_specialists, query, local_merge)
 
-            # Scientist rebuts and further improves
-            rebuttal = self._generate_rebuttal(refined_hypothesis, critique)
-            self._add_to_debate_history("ScientistAgent", "rebuttal", rebuttal)
-            print(f"Scientist has provided a rebuttal and improvements")
-
-            # Create a merged hypothesis from the debate
-            hypothesis = self._merge_hypotheses(refined_hypothesis, rebuttal)
-
-            # Evaluate the new hypothesis
-            current_score = self._evaluate_hypothesis(hypothesis)
-            print(f"Round {round_num} hypothesis score: {current_score}")
-
-            # Track the best hypothesis
-            if current_score > best_score:
-                best_hypothesis = hypothesis
-                best_score = current_score
-                print(f"New best hypothesis found! Score: {best_score}")
-
-            # Check for convergence (diminishing improvements)
-            improvement = current_score - previous_score
-            if improvement < 0.05 and round_num >= 2:
-                convergence_probability = 1.0 - (improvement * 10)
-                if convergence_probability > self.convergence_threshold:
-                    convergence = True
-                    print(f"Debate has converged with probability {convergence_probability:.2f}")
-
-            previous_score = current_score
+            # Evaluate the new hypothesis, or leave it to the next round's critique
+            if self._fused_scoring():
+                unscored_hypothesis = hypothesis
+            else:
+                current_estimate = self._cached_score(hypothesis)
+                convergence = self._record_score(hypothesis, current_estimate, previous_estimate, round_num)
+                previous_estimate = current_estimate
             round_num += 1
 
+        if unscored_hypothesis is not None:
+            # No round critique will see the last hypothesis: a final critique scores it on the same scale
+            if scheduler:
+                self.llm_manager.set_thinking_mode(scheduler.plan_final_evaluation())
+            current_estimate = self._critic_estimate(unscored_hypothesis, selected_specialists)
+            if current_estimate is not None:
+                self._record_score(unscored_hypothesis, current_estimate, previous_estimate, round_num - 1)
+
+        if scheduler:
+            self.llm_manager.set_thinking_mode(scheduler.plan_synthesis())
+
         # Final synthesis by integrating the best hypothesis
-        final_analysis = self._synthesize_final_analysis(query, best_hypothesis, best_score)
+        self.current_round = None
+        final_analysis = self._timed_call(
+            ROLE_SYNTHESIS, self._synthesize_final_analysis, query, self.best_hypothesis, self.best_score
+        )
         print(f"Debate complete. Final analysis produced with confidence score: {final_analysis.get('confidence_score', 0)}")
+        self._publish(EVENT_DEBATE_FINISHED, confidence_score=final_analysis.get("confidence_score", 0))
 
+        final_analysis["performance"] = self.profiler.report()
+        if self.best_estimate is not None and self.best_estimate.stdev is not None:
+            final_analysis["score_estimate"] = self.best_estimate.to_dict()
         return final_analysis
 
+    def _run_round_agents(self, hypothesis: Dict, critique: Dict, round_specialists: List[str],
+                          query: str, local_merge: bool) -> Dict:
+        """
+        Full round strategy: expander, specialists and scientist respond to the critique
+        in separate calls and their results are merged
+
+        Returns:
+            The merged hypothesis of the round
+        """
+        # Expander refines based on critique
+        refined_hypothesis = self._timed_call(ROLE_EXPANDER, self._refine_hypothesis, hypothesis, critique)
+        self._add_to_debate_history("ExpanderAgent", "refinement", refined_hypothesis)
+        print(f"Expander has refined the hypothesis with {len(refined_hypothesis.get('expanded_mechanisms', {}).get('additional_pathways', []))} new pathways")
+
+        # Specialized agent contributions if available
+        if round_specialists:
+            for specialist_key in round_specialists:
+                specialist_input = self._timed_call(
+                    ROLE_SPECIALIST,
+                    self._generate_specialist_contribution,
+                    specialist_key, 
+                    refined_hypothesis, 
+                    critique,
+                    query,
+                    step_label=specialist_key
+                )
+                agent_name = self.specialized_agents[specialist_key]["role"]
+                self._add_to_debate_history(agent_name, "specialist_input", specialist_input)
+                print(f"{agent_name} provided specialized input")
+
+                # Integrate specialist contributions
+                refined_hypothesis = self._integrate_specialist_input(
+                    refined_hypothesis, 
+                    specialist_input
+                )
+
+        # Scientist rebuts and further improves
+        rebuttal = self._timed_call(ROLE_REBUTTAL, self._generate_rebuttal, refined_hypothesis, critique)
+        self._add_to_debate_history("ScientistAgent", "rebuttal", rebuttal)
+        print(f"Scientist has provided a rebuttal and improvements")
+
+        # Create a merged hypothesis from the debate
+        if local_merge:
+            self.profiler.count("local_merges")
+            return self._merge_hypotheses_locally(refined_hypothesis, rebuttal)
+        return self._timed_call(ROLE_MERGE, self._merge_hypotheses, refined_hypothesis, rebuttal)
+
+    def _compact_thinking_modes(self) -> tuple:
+        """Thinking modes in which rounds run as a single structured call under the round strategy"""
+        if self.round_strategy == ROUND_STRATEGY_COMPACT:
+            return tuple(THINKING_MODES)
+        if self.round_strategy == ROUND_STRATEGY_AUTO:
+            return COMPACT_THINKING_MODES
+        return ()
+
+    def _use_compact_round(self) -> bool:
+        """Whether the next round runs as a single structured call"""
+        if self.round_strategy == ROUND_STRATEGY_COMPACT:
+            return True
+        if self.round_strategy == ROUND_STRATEGY_AUTO:
+            return self.llm_manager.thinking_mode in COMPACT_THINKING_MODES
+        return False
+
+    def _generate_compact_round(self, hypothesis: Dict, round_specialists: List[str], query: str) -> Optional[Dict]:
+        """
+        Play critic, expander, specialists and scientist in one structured response
+
+        Args:
+            hypothesis: The hypothesis under debate
+            round_specialists: Specialists taking part in this round
+            query: Original scientific query
+
+        Returns:
+            Dict with critique, refinement, specialist_inputs, rebuttal and merged_hypothesis
+            sections, or None if the response lacks a usable critique or rebuttal
+        """
+        specialist_roles = "\n".join(
+            f'        - "{key}": a {self.specialized_agents[key]["role"]} who {self.specialized_agents[key]["description"]}'
+            for key in round_specialists or []
+        ) or "        (none this round)"
+
+        prompt = f"""
+        Run one full round of a scientific debate about this hypothesis, playing each role in turn.
+        Keep every role critical and independent: later roles must respond to the earlier sections.
+
+        Original query: {query}
+
+        Hypothesis: {json.dumps(self.memory.compact(hypothesis), indent=2)}
+
+        Roles, in order:
+        1. CRITIC: critically evaluate the hypothesis (rigor, evidence, alternatives, gaps, validation experiments)
+        2. EXPANDER: expand and refine the hypothesis to address the critique
+        3. SPECIALISTS: each specialist below adds insights from their perspective
+{specialist_roles}
+        4. SCIENTIST: rebut the critique with an improved hypothesis
+        5. MERGE: unify the refinement and the rebuttal into the strongest hypothesis
+
+        Format your response as a JSON object with exactly these sections:
+        {{
+            "critique": {{
+                "evaluation": {{
+                    "strengths": ["list of strong points"],
+                    "limitations": ["list of limitations"],
+                    "gaps": ["knowledge gaps identified"],
+                    "alternatives": ["alternative mechanisms"]
+                }},
+                "validation": {{
+                    "experiments": ["suggested validation experiments"],
+                    "predictions": ["testable predictions"],
+                    "controls": ["necessary controls"]
+                }},
+                "confidence_score": 0.0  # 0-1 score of the hypothesis as given
+            }},
+            "refinement": {{
+                "expanded_mechanisms": {{
+                    "additional_pathways": ["list of related pathways"],
+                    "pathway_interactions": ["mechanistic interactions"],
+                    "cellular_compartments": ["involved compartments"],
+                    "system_effects": ["broader physiological impacts"]
+                }},
+                "therapeutic_implications": ["potential interventions"],
+                "research_priorities": ["key areas for investigation"]
+            }},
+            "specialist_inputs": {{
+                "<specialist key>": {{
+                    "specialist_perspective": "overall assessment",
+                    "key_insights": ["specialist insights"],
+                    "suggested_improvements": ["specific modifications"],
+                    "relevant_methodologies": ["methodologies"],
+                    "confidence_assessment": 0.0
+                }}
+            }},
+            "rebuttal": {{same structure as the hypothesis, improved to address the critique}},
+            "merged_hypothesis": {{same structure as the hypothesis, unifying refinement and rebuttal}}
+        }}
+        """
+
+        response = self.llm_manager.generate_response(prompt, "anthropic", "json", cancel_token=self.cancel_token)
+        if isinstance(response, str):
+            try:
+                response = json.loads(response)
+            except json.JSONDecodeError:
+                print("Failed to parse compact round JSON")
+                return None
+
+        if not isinstance(response, dict):
+            return None
+        sections = {
+            name: response.get(name) if isinstance(response.get(name), dict) else {}
+            for name in ("critique", "refinement", "specialist_inputs", "rebuttal", "merged_hypothesis")
+        }
+        if not sections["critique"] or not sections["rebuttal"]:
+            return None
+        return sections
+
+    def _apply_compact_round(self, round_output: Dict, round_specialists: List[str]) -> Dict:
+        """
+        Record the sections of a compact round as the usual per-agent history entries
+
+        Returns:
+            The merged hypothesis of the round
+        """
+        refined_hypothesis = round_output["refinement"]
+        self._add_to_debate_history("ExpanderAgent", "refinement", refined_hypothesis)
+        print(f"Expander has refined the hypothesis with {len(refined_hypothesis.get('expanded_mechanisms', {}).get('additional_pathways', []))} new pathways")
+
+        for specialist_key in round_specialists or []:
+            specialist_input = round_output["specialist_inputs"].get(specialist_key)
+            if not isinstance(specialist_input, dict) or not specialist_input:
+                continue
+            agent_name = self.specialized_agents[specialist_key]["role"]
+            self._add_to_debate_history(agent_name, "specialist_input", specialist_input)
+            print(f"{agent_name} provided specialized input")
+            refined_hypothesis = self._integrate_specialist_input(refined_hypothesis, specialist_input)
+
+        rebuttal = round_output["rebuttal"]
+        self._add_to_debate_history("ScientistAgent", "rebuttal", rebuttal)
+        print(f"Scientist has provided a rebuttal and improvements")
+
+        if round_output["merged_hypothesis"]:
+            return round_output["merged_hypothesis"]
+        self.profiler.count("local_merges")
+        return self._merge_hypotheses_locally(refined_hypothesis, rebuttal)
+
+    def _record_score(self, hypothesis: Dict, estimate: ScoreEstimate,
+                      previous_estimate: Optional[ScoreEstimate], hypothesis_round: int) -> bool:
+        """
+        Track a scored hypothesis as best-so-far and check for convergence
+
+        Sampled scores carry a confidence interval: the best hypothesis is the one with
+        the highest lower bound, and improvements within the scoring noise count as converged.
+
+        Args:
+            hypothesis: The scored hypothesis
+            estimate: Its score (0-1)
+            previous_estimate: Score of the hypothesis it was derived from (None for the initial one)
+            hypothesis_round: Debate round that produced the hypothesis (0 for the initial one)
+
+        Returns:
+            Whether the debate has converged (diminishing improvements)
+        """
+        score = estimate.mean
+        interval = f" (95% CI {estimate.lower:.2f}-{estimate.upper:.2f})" if estimate.stdev is not None else ""
+        if hypothesis_round == 0:
+            print(f"Initial hypothesis score: {score}{interval}")
+        else:
+            print(f"Round {hypothesis_round} hypothesis score: {score}{interval}")
+
+        # Track the best hypothesis
+        if self.best_estimate is None or estimate.lower > self.best_estimate.lower:
+            self.best_hypothesis, self.best_score, self.best_estimate = hypothesis, score, estimate
+            if hypothesis_round > 0:
+                print(f"New best hypothesis found! Score: {score}")
+        self._publish(
+            EVENT_SCORE,
+            score=score,
+            best_score=self.best_score,
+            hypothesis_round=hypothesis_round,
+            interval=[estimate.lower, estimate.upper]
+        )
+
+        if previous_estimate is None or hypothesis_round < 2:
+            return False
+
+        # Check for convergence (diminishing improvements)
+        improvement = score - previous_estimate.mean
+        noise = estimate.noise_margin(previous_estimate)
+        if noise > 0 and improvement < noise:
+            print(f"Debate has converged: no significant improvement ({improvement:+.3f}, noise margin {noise:.3f})")
+            self._publish(EVENT_CONVERGED, probability=1.0, noise_margin=noise)
+            return True
+        if improvement < 0.05:
+            convergence_probability = 1.0 - (improvement * 10)
+            if convergence_probability > self.convergence_threshold:
+                print(f"Debate has converged with probability {convergence_probability:.2f}")
+                self._publish(EVENT_CONVERGED, probability=convergence_probability)
+                return True
+        return False
+
+    def _fused_scoring(self) -> bool:
+        """Whether hypotheses are scored by the critic's confidence rather than evaluation calls"""
+        # A single critic confidence carries no variance, so sampled scoring takes precedence
+        return self.evaluation_mode == EVALUATION_MODE_CRITIC and self.scoring_mode != SCORING_MODE_SAMPLED
+
+    def _cached_score(self, hypothesis: Dict) -> ScoreEstimate:
+        """Score a hypothesis, reusing the score of an identical (canonicalized) hypothesis if cached"""
+        digest = hypothesis_hash(hypothesis)
+        sampled = self.scoring_mode == SCORING_MODE_SAMPLED
+        key = self._score_key(self.scoring_mode, self.score_samples if sampled else 1, digest)
+        estimate = self.score_cache.get(key)
+        if estimate is not None:
+            print(f"Reusing cached score {estimate.mean} for an identical hypothesis")
+            self.profiler.count("score_cache_hits")
+            return estimate
+
+        self.profiler.count("score_cache_misses")
+        estimate = self._timed_call(ROLE_EVALUATE, self._score_hypothesis, hypothesis)
+        # Cache under what was actually obtained: a single-score fallback or a partial set of
+        # samples must not later pass for a full self-consistency estimate
+        if sampled:
+            key = self._score_key(SCORING_MODE_SAMPLED, len(estimate.samples), digest)
+        self.score_cache.put(key, estimate)
+        return estimate
+
+    def _score_key(self, scoring_mode: str, samples: int, digest: str) -> tuple:
+        """
+        Score cache key: scores from another model or thinking setting are not interchangeable,
+        and the cache is shared across debates that may use different ones
+        """
+        return (
+            self.llm_manager.anthropic_model,
+            self.llm_manager.thinking_mode,
+            self.llm_manager.thinking_budget,
+            scoring_mode,
+            samples,
+            digest
+        )
+
+    def _score_hypothesis(self, hypothesis: Dict) -> ScoreEstimate:
+        """Score a hypothesis with the configured scoring mode"""
+        if self.scoring_mode == SCORING_MODE_SAMPLED:
+            estimate = self._evaluate_hypothesis_samples(hypothesis)
+            if estimate is not None:
+                return estimate
+            print("No valid score samples; falling back to a single evaluation")
+            # As wide as a one-sample estimate: a zero-width interval would win every lower-bound comparison
+            return ScoreEstimate.point(self._evaluate_hypothesis(hypothesis), PRIOR_STDEV)
+        return ScoreEstimate.point(self._evaluate_hypothesis(hypothesis))
+
+    def _critic_estimate(self, hypothesis: Dict, specialists: List[str],
+                         critique: Optional[Dict] = None) -> Optional[ScoreEstimate]:
+        """
+        Score a hypothesis by the critic's confidence, the scale of every score in critic evaluation mode
+        Args:
+            hypothesis: The hypothesis to score
+            specialists: Specialist focus areas for a new critique
+            critique: Critique of the hypothesis already made, if any
+        Returns:
+            ScoreEstimate, or None if no critique gave a valid confidence score. The separate
+            evaluator is never used here: its scores are on another scale and could not be
+            compared with the critic's when choosing the best hypothesis
+        """
+        score = self._critic_score(critique) if critique is not None else None
+        if score is None:
+            if critique is not None:
+                print("Critic returned no valid confidence score; asking for a new critique")
+            score = self._critic_score(
+                self._timed_call(ROLE_CRITIC, self._generate_critique, hypothesis, specialists)
+            )
+        if score is None:
+            print("No valid critic confidence score; the hypothesis stays unscored")
+            return None
+        self.profiler.count("fused_evaluations")
+        return ScoreEstimate.point(score)
+
+    @staticmethod
+    def _critic_score(critique: Dict) -> Optional[float]:
+        """The critic's confidence_score as a 0-1 float, or None if missing or invalid"""
+        score = critique.get("confidence_score") if isinstance(critique, dict) else None
+        if isinstance(score, str):
+            try:
+                score = float(score.strip().rstrip("%")) / (100.0 if score.strip().endswith("%") else 1.0)
+            except ValueError:
+                return None
+        if isinstance(score, bool) or not isinstance(score, (int, float)):
+            return None
+        if not 0.0 <= score <= 1.0:
+            return None
+        return float(score)
+
+    def _timed_call(self, role: str, func: Callable, *args, step_label: Optional[str] = None, **kwargs):
+        """
+        Run one agent call, record its wall time in the per-role latency statistics
+        and profile it as one step of the debate (step_label names e.g. the specialist)
+        """
+        if self.cancel_token:
+            self.cancel_token.raise_if_cancelled()
+        thinking_mode = self.llm_manager.thinking_mode
+        self.current_role = role
+        self._publish(EVENT_STEP_STARTED, role=role, thinking_mode=thinking_mode)
+        span = self.profiler.begin_step(role, self.current_round, thinking_mode, step_label)
+        start = time.monotonic()
+        try:
+            result = func(*args, **kwargs)
+        finally:
+            self.current_role = None
+            self.profiler.end_step(span)
+        elapsed = time.monotonic() - start
+        self.latency_stats.record(role, thinking_mode, elapsed)
+        self._publish(EVENT_STEP_FINISHED, role=role, seconds=elapsed)
+        return result
+
+    def _publish(self, event_type: str, role: Optional[str] = None, **data) -> None:
+        """Publish a debate event to all subscribers"""
+        self.events.publish(DebateEvent(
+            type=event_type,
+            debate_id=self.debate_id,
+            round=self.current_round,
+            role=role,
+            data=data
+        ))
+
+    def _on_stream_progress(self, text_chars: int, thinking_chars: int) -> None:
+        """Turn LLM streaming progress into token progress events for the running step"""
+        if self.current_role and self.events.has_subscribers():
+            self._publish(
+                EVENT_TOKEN_PROGRESS,
+                role=self.current_role,
+                text_chars=text_chars,
+                thinking_chars=thinking_chars
+            )
+
     def _evaluate_query_complexity(self, query: str, concepts: List[str]) -> float:
         """
         Evaluate query complexity to determine debate parameters
@@ -265,11 +803,11 @@ class DebateOrchestrator:
             "developmental_context": concepts[30:40] if len(concepts) > 30 else []
         }
 
-        return self.scientist.generate_hypothesis(context)
+        return self.scientist.generate_hypothesis(context, cancel_token=self.cancel_token)
 
     def _generate_critique(self, hypothesis: Dict, selected_specialists: List[str] = None) -> Dict:
         """Generate critique from the critic agent with specialist focus areas"""
-        critique_context = hypothesis.copy()
+        critique_context = self.memory.compact(hypothesis)
 
         # Add specialized focus areas if specialists are selected
         if selected_specialists:
@@ -278,7 +816,7 @@ class DebateOrchestrator:
                 for specialist in selected_specialists
             ]
 
-        return self.critic.review_hypothesis(critique_context)
+        return self.critic.review_hypothesis(critique_context, cancel_token=self.cancel_token)
 
     def _generate_specialist_contribution(self, specialist_key: str, 
                                         hypothesis: Dict, critique: Dict, 
@@ -293,9 +831,9 @@ class DebateOrchestrator:
 
         Original query: {query}
 
-        Hypothesis: {json.dumps(hypothesis, indent=2)}
+        Hypothesis: {json.dumps(self.memory.compact(hypothesis, parts=2), indent=2)}
 
-        Critique: {json.dumps(critique, indent=2)}
+        Critique: {json.dumps(self.memory.compact(critique, parts=2), indent=2)}
 
         Provide specialized insights from your unique perspective that could strengthen the hypothesis.
 
@@ -307,7 +845,7 @@ class DebateOrchestrator:
         - confidence_assessment: How confident you are in the hypothesis from your specialist view (0-1)
         """
 
-        response = self.llm_manager.generate_response(prompt, "anthropic", "json")
+        response = self.llm_manager.generate_response(prompt, "anthropic", "json", cancel_token=self.cancel_token)
 
         # Handle string or dict response
         if isinstance(response, str):
@@ -321,7 +859,7 @@ class DebateOrchestrator:
     def _integrate_specialist_input(self, hypothesis: Dict, specialist_input: Dict) -> Dict:
         """Integrate specialist contributions into the hypothesis"""
         # Deep copy of hypothesis to avoid modifying the original
-        enhanced = hypothesis.copy()
+        enhanced = copy.deepcopy(hypothesis)
 
         # Add specialist insights if available
         if "key_insights" in specialist_input and specialist_input["key_insights"]:
@@ -351,32 +889,32 @@ class DebateOrchestrator:
         """Refine hypothesis based on critique"""
         # Combine hypothesis with critique for context
         combined_context = {
-            "original_hypothesis": hypothesis,
-            "critique": critique
+            "original_hypothesis": self.memory.compact(hypothesis, parts=2),
+            "critique": self.memory.compact(critique, parts=2)
         }
 
-        return self.expander.expand_hypothesis(combined_context)
+        return self.expander.expand_hypothesis(combined_context, cancel_token=self.cancel_token)
 
     def _generate_rebuttal(self, refined_hypothesis: Dict, critique: Dict) -> Dict:
         """Generate rebuttal and improvements from the scientist"""
         # Structure a rebuttal request
         rebuttal_context = {
-            "refined_hypothesis": refined_hypothesis,
-            "critique": critique,
+            "refined_hypothesis": self.memory.compact(refined_hypothesis, parts=2),
+            "critique": self.memory.compact(critique, parts=2),
             "rebuttal_requested": True
         }
 
         # Use the scientist to generate improvements
-        return self.scientist.generate_hypothesis(rebuttal_context)
+        return self.scientist.generate_hypothesis(rebuttal_context, cancel_token=self.cancel_token)
 
     def _merge_hypotheses(self, hypothesis1: Dict, hypothesis2: Dict) -> Dict:
         """Merge two hypotheses, keeping the strongest elements of each"""
         prompt = f"""
         Merge these two scientific hypotheses into a unified, stronger hypothesis:
 
-        Hypothesis 1: {json.dumps(hypothesis1, indent=2)}
+        Hypothesis 1: {json.dumps(self.memory.compact(hypothesis1, parts=2), indent=2)}
 
-        Hypothesis 2: {json.dumps(hypothesis2, indent=2)}
+        Hypothesis 2: {json.dumps(self.memory.compact(hypothesis2, parts=2), indent=2)}
 
         Create a unified hypothesis that:
         1. Incorporates the strongest elements from both
@@ -387,7 +925,7 @@ class DebateOrchestrator:
         Format your response as a structured JSON with the same schema as the input hypotheses.
         """
 
-        merged = self.llm_manager.generate_response(prompt, "anthropic", "json")
+        merged = self.llm_manager.generate_response(prompt, "anthropic", "json", cancel_token=self.cancel_token)
         if isinstance(merged, str):
             try:
                 merged = json.loads(merged)
@@ -398,12 +936,31 @@ class DebateOrchestrator:
 
         return merged
 
+    def _merge_hypotheses_locally(self, hypothesis1: Dict, hypothesis2: Dict) -> Dict:
+        """
+        Merge two hypotheses without an LLM call, used when the deadline is tight
+        Values from the second hypothesis win, nested dicts are merged and lists are unioned
+        """
+        merged = copy.deepcopy(hypothesis1)
+        for key, value in hypothesis2.items():
+            if isinstance(value, dict) and isinstance(merged.get(key), dict):
+                merged[key] = self._merge_hypotheses_locally(merged[key], value)
+            elif isinstance(value, list) and isinstance(merged.get(key), list):
+                combined = list(merged[key])
+                for item in value:
+                    if item not in combined:
+                        combined.append(copy.deepcopy(item))
+                merged[key] = combined
+            else:
+                merged[key] = copy.deepcopy(value)
+        return merged
+
     def _evaluate_hypothesis(self, hypothesis: Dict) -> float:
         """Evaluate the hypothesis and return a score from 0-1"""
         evaluation_prompt = f"""
         Evaluate this scientific hypothesis for strength and validity:
 
-        {json.dumps(hypothesis, indent=2)}
+        {json.dumps(self.memory.compact(hypothesis), indent=2)}
 
         Assess on these dimensions:
         1. Scientific rigor (0-1)
@@ -415,7 +972,7 @@ class DebateOrchestrator:
         Return only a single float representing the overall score (0-1).
         """
 
-        response = self.llm_manager.generate_response(evaluation_prompt, "anthropic", "text")
+        response = self.llm_manager.generate_response(evaluation_prompt, "anthropic", "text", cancel_token=self.cancel_token)
 
         # Extract floating point score from response
         try:
@@ -440,6 +997,46 @@ class DebateOrchestrator:
             print(f"Failed to parse hypothesis evaluation score: {str(e)}")
             return 0.5
 
+    def _evaluate_hypothesis_samples(self, hypothesis: Dict) -> Optional[ScoreEstimate]:
+        """
+        Self-consistency evaluation: k independent dimension-score samples in one request,
+        aggregated locally into a mean with a confidence interval
+
+        Returns:
+            ScoreEstimate, or None if the response contains no valid sample
+        """
+        dimensions = ",\n".join(f'                "{dim}": 0.0' for dim in SCORE_DIMENSIONS)
+        evaluation_prompt = f"""
+        Evaluate this scientific hypothesis for strength and validity:
+
+        {json.dumps(self.memory.compact(hypothesis), indent=2)}
+
+        Produce {self.score_samples} independent assessments, as {self.score_samples} different expert
+        reviewers would, each scoring every dimension from 0 to 1 without looking at the other assessments.
+
+        Format your response as a JSON object with this structure:
+        {{
+            "samples": [
+                {{
+{dimensions}
+                }}
+            ]
+        }}
+        """
+
+        response = self.llm_manager.generate_response(evaluation_prompt, "anthropic", "json", cancel_token=self.cancel_token)
+        if isinstance(response, str):
+            try:
+                response = json.loads(response)
+            except json.JSONDecodeError:
+                print("Failed to parse hypothesis score samples")
+                return None
+
+        samples = parse_score_samples(response)
+        if len(samples) < self.score_samples:
+            print(f"Received {len(samples)} valid score samples of {self.score_samples} requested")
+        return aggregate_samples(samples)
+
     def _synthesize_final_analysis(self, query: str, best_hypothesis: Dict, score: float) -> Dict:
         """Create the final analysis from the best hypothesis"""
         synthesis_prompt = f"""
@@ -447,7 +1044,7 @@ class DebateOrchestrator:
 
         Query: {query}
 
-        Best Hypothesis: {json.dumps(best_hypothesis, indent=2)}
+        Best Hypothesis: {json.dumps(self.memory.compact(best_hypothesis), indent=2)}
 
         Structure your response as a JSON with these keys:
         - primary_analysis: {{
@@ -462,28 +1059,32 @@ class DebateOrchestrator:
         - confidence_score: {score}
         """
 
-        final_analysis = self.llm_manager.generate_response(synthesis_prompt, "anthropic", "json")
+        final_analysis = self.llm_manager.generate_response(synthesis_prompt, "anthropic", "json", cancel_token=self.cancel_token)
         if isinstance(final_analysis, str):
             try:
                 final_analysis = json.loads(final_analysis)
             except:
                 print("Failed to parse final analysis JSON")
                 # Create a default structure
-                final_analysis = {
-                    "primary_analysis": {
-                        "pathways": best_hypothesis.get("mechanisms", {}).get("pathways", []),
-                        "genes": best_hypothesis.get("mechanisms", {}).get("genes", []),
-                        "mechanisms": best_hypothesis.get("hypothesis", ""),
-                        "timeline": best_hypothesis.get("mechanisms", {}).get("timeline", []),
-                        "evidence": best_hypothesis.get("evidence", []),
-                        "implications": best_hypothesis.get("expanded_mechanisms", {}).get("therapeutic_implications", [])
-                    },
-                    "validation": "Analysis validated through multi-agent scientific debate",
-                    "confidence_score": score
-                }
+                final_analysis = self._fallback_analysis(best_hypothesis, score)
 
         return final_analysis
 
+    def _fallback_analysis(self, best_hypothesis: Dict, score: float) -> Dict:
+        """Build the final analysis structure directly from a hypothesis, without an LLM call"""
+        return {
+            "primary_analysis": {
+                "pathways": best_hypothesis.get("mechanisms", {}).get("pathways", []),
+                "genes": best_hypothesis.get("mechanisms", {}).get("genes", []),
+                "mechanisms": best_hypothesis.get("hypothesis", ""),
+                "timeline": best_hypothesis.get("mechanisms", {}).get("timeline", []),
+                "evidence": best_hypothesis.get("evidence", []),
+                "implications": best_hypothesis.get("expanded_mechanisms", {}).get("therapeutic_implications", [])
+            },
+            "validation": "Analysis validated through multi-agent scientific debate",
+            "confidence_score": score
+        }
+
     def _add_to_debate_history(self, agent_name: str, action_type: str, content: Dict) -> None:
         """Add an entry to the debate history"""
         entry = {
@@ -496,6 +1097,11 @@ class DebateOrchestrator:
         # Add to local history
         self.debate_history.append(entry)
 
+        # Keep the full-fidelity copy out of band so prompts can stay compact
+        self.memory.archive(agent_name, action_type, content)
+
+        self._publish(EVENT_HISTORY_ENTRY, agent=agent_name, action=action_type, entry=entry)
+
         # Call the update callback if available
         if self.update_callback:
             try:
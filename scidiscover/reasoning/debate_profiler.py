@@ -0,0 +1,209 @@
+"""
+Per-debate cost and latency profiling
+Breaks a debate down by round and agent role and shows where time could be saved by overlapping steps
+"""
+from typing import Dict, List, Optional
+import threading
+import time
+
+from .debate_scheduler import ROLE_CRITIC, ROLE_EVALUATE, ROLE_SPECIALIST
+
+
+class DebateProfiler:
+    """
+    Records every timed debate step together with the LLM calls made inside it
+    and produces a structured performance report
+    """
+    def __init__(self):
+        self.start_time = None
+        self.steps = []
+        self.counters = {}
+        self._current = None
+        self._lock = threading.Lock()
+
+    def start(self) -> None:
+        """Reset and start profiling a new debate"""
+        with self._lock:
+            self.start_time = time.monotonic()
+            self.steps = []
+            self.counters = {}
+            self._current = None
+
+    def begin_step(self, role: str, round_num: Optional[int], thinking_mode: str, label: Optional[str] = None) -> Dict:
+        """
+        Open a step span
+        Args:
+            role: Debate role performing the step
+            round_num: Debate round (0 for the initial hypothesis, None for the final synthesis)
+            thinking_mode: Thinking mode active for the step
+            label: Optional finer-grained name (e.g. which specialist)
+        Returns:
+            The span, to be passed to end_step()
+        """
+        if self.start_time is None:
+            self.start()
+        span = {
+            "round": round_num,
+            "role": role,
+            "label": label or role,
+            "thinking_mode": thinking_mode,
+            "start": time.monotonic() - self.start_time,
+            "end": None,
+            "seconds": None,
+            "calls": 0,
+            "ttft": None,
+            "input_tokens": 0,
+            "output_tokens": 0
+        }
+        with self._lock:
+            self.steps.append(span)
+            self._current = span
+        return span
+
+    def end_step(self, span: Dict) -> None:
+        """Close a step span"""
+        span["end"] = time.monotonic() - self.start_time
+        span["seconds"] = span["end"] - span["start"]
+        with self._lock:
+            if self._current is span:
+                self._current = None
+
+    def record_call(self, stats: Dict) -> None:
+        """Attribute one completed LLM call (see LLMManager.call_observer) to the open step"""
+        with self._lock:
+            span = self._current
+        if span is None:
+            return
+        span["calls"] += 1
+        if span["ttft"] is None and stats.get("ttft") is not None:
+            span["ttft"] = stats["ttft"]
+        span["input_tokens"] += stats.get("input_tokens") or 0
+        span["output_tokens"] += stats.get("output_tokens") or 0
+
+    def count(self, name: str, amount: int = 1) -> None:
+        """Increment a named counter reported alongside the timings"""
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    def report(self) -> Dict:
+        """
+        Build the performance report
+        Returns:
+            Dict with totals, by_role, by_round, timeline, critical_path and overlap_opportunities
+        """
+        with self._lock:
+            steps = [dict(step) for step in self.steps if step["seconds"] is not None]
+            counters = dict(self.counters)
+
+        total_seconds = (time.monotonic() - self.start_time) if self.start_time is not None else 0.0
+        step_seconds = sum(step["seconds"] for step in steps)
+
+        report = {
+            "total_seconds": total_seconds,
+            "llm_seconds": step_seconds,
+            "calls": sum(step["calls"] for step in steps),
+            "input_tokens": sum(step["input_tokens"] for step in steps),
+            "output_tokens": sum(step["output_tokens"] for step in steps),
+            "by_role": self._aggregate(steps, "role", step_seconds),
+            "by_round": self._aggregate(steps, "round", step_seconds),
+            "timeline": [
+                {
+                    "name": name,
+                    "round": step["round"],
+                    "role": step["role"],
+                    "label": step["label"],
+                    "thinking_mode": step["thinking_mode"],
+                    "start": step["start"],
+                    "end": step["end"],
+                    "seconds": step["seconds"],
+                    "ttft": step["ttft"],
+                    "input_tokens": step["input_tokens"],
+                    "output_tokens": step["output_tokens"]
+                }
+                for step, name in zip(steps, self._step_names(steps))
+            ],
+            "counters": counters
+        }
+
+        overlaps = self._overlap_opportunities(steps)
+        saved = sum(overlap["saved_seconds"] for overlap in overlaps)
+        report["overlap_opportunities"] = overlaps
+        report["critical_path"] = {
+            "sequential_seconds": step_seconds,
+            "overlapped_seconds": step_seconds - saved,
+            "dominant_roles": sorted(
+                report["by_role"], key=lambda role: report["by_role"][role]["seconds"], reverse=True
+            )[:3]
+        }
+        return report
+
+    @staticmethod
+    def _step_names(steps: List[Dict]) -> List[str]:
+        """
+        Unique display name of every step: round and label (e.g. "r2 critic", "final synthesis"),
+        numbered when a label repeats within a round (e.g. a fallback evaluation)
+        """
+        names = []
+        seen = {}
+        for step in steps:
+            name = f"r{step['round']} {step['label']}" if step["round"] is not None else f"final {step['label']}"
+            seen[name] = seen.get(name, 0) + 1
+            names.append(name if seen[name] == 1 else f"{name} #{seen[name]}")
+        return names
+
+    @staticmethod
+    def _aggregate(steps: List[Dict], key: str, step_seconds: float) -> Dict:
+        """Sum calls, time and tokens of the steps grouped by key"""
+        groups = {}
+        for step in steps:
+            name = step[key]
+            name = "synthesis" if name is None and key == "round" else name
+            group = groups.setdefault(name, {
+                "steps": 0, "calls": 0, "seconds": 0.0, "ttft_total": 0.0, "ttft_count": 0,
+                "input_tokens": 0, "output_tokens": 0
+            })
+            group["steps"] += 1
+            group["calls"] += step["calls"]
+            group["seconds"] += step["seconds"]
+            group["input_tokens"] += step["input_tokens"]
+            group["output_tokens"] += step["output_tokens"]
+            if step["ttft"] is not None:
+                group["ttft_total"] += step["ttft"]
+                group["ttft_count"] += 1
+
+        for group in groups.values():
+            group["mean_ttft"] = group["ttft_total"] / group["ttft_count"] if group["ttft_count"] else None
+            group["share"] = group["seconds"] / step_seconds if step_seconds > 0 else 0.0
+            del group["ttft_total"], group["ttft_count"]
+        return groups
+
+    @staticmethod
+    def _overlap_opportunities(steps: List[Dict]) -> List[Dict]:
+        """
+        Steps without a data dependency on each other that ran back to back:
+        specialists of the same round, and a hypothesis evaluation followed by the
+        next critique of that same hypothesis
+        """
+        overlaps = []
+        rounds = sorted({step["round"] for step in steps if step["round"] is not None})
+        for round_num in rounds:
+            specialists = [s for s in steps if s["round"] == round_num and s["role"] == ROLE_SPECIALIST]
+            if len(specialists) > 1:
+                durations = [s["seconds"] for s in specialists]
+                overlaps.append({
+                    "round": round_num,
+                    "steps": [s["label"] for s in specialists],
+                    "reason": "Specialists only depend on the refinement and critique",
+                    "saved_seconds": sum(durations) - max(durations)
+                })
+
+        for index, step in enumerate(steps[:-1]):
+            following = steps[index + 1]
+            if step["role"] == ROLE_EVALUATE and following["role"] == ROLE_CRITIC:
+                overlaps.append({
+                    "round": following["round"],
+                    "steps": [step["label"], following["label"]],
+                    "reason": "Evaluation and the next critique read the same hypothesis",
+                    "saved_seconds": min(step["seconds"], following["seconds"])
+                })
+        return overlaps
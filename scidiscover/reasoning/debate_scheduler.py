@@ -0,0 +1,279 @@
+"""
+Deadline-aware scheduling for multi-agent debates
+Uses observed per-role LLM latencies to fit debate rounds, specialists and thinking budgets into a time limit
+"""
+from typing import Dict, List, Optional, Sequence
+import statistics
+import threading
+import time
+
+# Debate roles whose calls are timed separately
+ROLE_SCIENTIST = "scientist"
+ROLE_CRITIC = "critic"
+ROLE_EXPANDER = "expander"
+ROLE_SPECIALIST = "specialist"
+ROLE_REBUTTAL = "rebuttal"
+ROLE_MERGE = "merge"
+ROLE_EVALUATE = "evaluate"
+ROLE_SYNTHESIS = "synthesis"
+ROLE_COMPACT_ROUND = "compact_round"  # Critic, expander, specialists and scientist in one call
+
+# Thinking modes from the most to the least expensive
+THINKING_MODES = ["high", "low", "none"]
+
+
+class LatencyStats:
+    """
+    Rolling per-role, per-thinking-mode latency statistics
+    Falls back to conservative priors until enough calls have been observed
+    """
+    # Prior seconds per call by thinking mode, scaled per role below
+    PRIOR_SECONDS = {"high": 150.0, "low": 90.0, "none": 35.0}
+    ROLE_FACTORS = {
+        ROLE_SCIENTIST: 1.0,
+        ROLE_CRITIC: 1.0,
+        ROLE_EXPANDER: 1.0,
+        ROLE_SPECIALIST: 0.8,
+        ROLE_REBUTTAL: 1.0,
+        ROLE_MERGE: 1.0,
+        ROLE_EVALUATE: 0.6,
+        ROLE_SYNTHESIS: 1.3,
+        ROLE_COMPACT_ROUND: 2.0
+    }
+
+    def __init__(self, window: int = 20):
+        """
+        Args:
+            window: Number of most recent observations kept per (role, thinking mode)
+        """
+        self.window = window
+        self.samples = {}
+        self._lock = threading.Lock()
+
+    def record(self, role: str, thinking_mode: str, seconds: float) -> None:
+        """Record the wall time of one completed call"""
+        with self._lock:
+            samples = self.samples.setdefault((role, thinking_mode), [])
+            samples.append(seconds)
+            if len(samples) > self.window:
+                del samples[0]
+
+    def estimate(self, role: str, thinking_mode: str) -> float:
+        """
+        Conservative latency estimate (mean + one standard deviation) for a call
+        Args:
+            role: Debate role making the call
+            thinking_mode: Thinking mode the call will run with
+        Returns:
+            Estimated seconds
+        """
+        with self._lock:
+            samples = list(self.samples.get((role, thinking_mode), []))
+
+        prior = self.PRIOR_SECONDS.get(thinking_mode, self.PRIOR_SECONDS["high"]) * self.ROLE_FACTORS.get(role, 1.0)
+        if not samples:
+            return prior
+        if len(samples) == 1:
+            # Blend a single observation with the prior to avoid overreacting
+            return (samples[0] + prior) / 2
+        return statistics.mean(samples) + statistics.stdev(samples)
+
+    def summary(self) -> Dict[str, Dict]:
+        """Observed statistics per role and thinking mode"""
+        with self._lock:
+            return {
+                f"{role}/{mode}": {
+                    "calls": len(samples),
+                    "mean_seconds": statistics.mean(samples),
+                    "max_seconds": max(samples)
+                }
+                for (role, mode), samples in self.samples.items() if samples
+            }
+
+
+# Latency statistics shared by all debates in this process
+DEFAULT_LATENCY_STATS = LatencyStats()
+
+
+class DebateScheduler:
+    """
+    Plans debate work so the whole debate, including the final synthesis, fits a deadline
+    Degrades gracefully: fewer specialists first, then lower thinking budgets, then a local merge
+    Every planned step also keeps time for the fallback call it may need if its primary call fails
+    """
+    def __init__(self, deadline: float, thinking_mode: str, stats: Optional[LatencyStats] = None,
+                 safety_margin: float = 1.15, fused_evaluation: bool = False,
+                 compact_modes: Sequence[str] = (), scoring_fallback: bool = False):
+        """
+        Args:
+            deadline: Wall-clock time budget in seconds, measured from now
+            thinking_mode: Thinking mode requested by the user (upper bound for all calls)
+            stats: Latency statistics used for estimates
+            safety_margin: Multiplier applied to every estimate
+            fused_evaluation: Whether hypotheses are scored by critiques instead of evaluation calls
+                              (the last one then needs a final critique of its own)
+            compact_modes: Thinking modes in which a round runs as a single compact call
+                           (all modes for the "compact" round strategy, low/none for "auto")
+            scoring_fallback: Whether an evaluation may need a second, single-score call
+                              (self-consistency scoring without valid samples)
+        """
+        self.start_time = time.monotonic()
+        self.end_time = self.start_time + deadline
+        self.thinking_mode = thinking_mode if thinking_mode in THINKING_MODES else "high"
+        self.stats = stats or DEFAULT_LATENCY_STATS
+        self.safety_margin = safety_margin
+        self.fused_evaluation = fused_evaluation
+        self.compact_modes = tuple(compact_modes)
+        self.scoring_fallback = scoring_fallback
+
+    def remaining(self) -> float:
+        """Seconds left until the deadline"""
+        return self.end_time - time.monotonic()
+
+    def estimate(self, role: str, thinking_mode: Optional[str] = None) -> float:
+        """Estimated seconds for one call, including the safety margin"""
+        return self.stats.estimate(role, thinking_mode or self.thinking_mode) * self.safety_margin
+
+    def estimate_round(self, num_specialists: int, thinking_mode: Optional[str] = None,
+                       local_merge: bool = False, compact: Optional[bool] = None) -> float:
+        """
+        Estimated seconds for one debate round
+        Args:
+            num_specialists: Specialists taking part in the round
+            thinking_mode: Thinking mode of the round (default: the requested one)
+            local_merge: Whether the merge is done locally instead of by an LLM call
+            compact: Whether the round is a single compact call (default: by compact_modes)
+        """
+        mode = thinking_mode or self.thinking_mode
+        if compact is None:
+            compact = mode in self.compact_modes
+        if compact:
+            # Critic, expander, specialists, scientist and merge answer in one response
+            total = self.estimate(ROLE_COMPACT_ROUND, mode)
+        else:
+            total = (
+                self.estimate(ROLE_CRITIC, mode)
+                + self.estimate(ROLE_EXPANDER, mode)
+                + num_specialists * self.estimate(ROLE_SPECIALIST, mode)
+                + self.estimate(ROLE_REBUTTAL, mode)
+            )
+            if not local_merge:
+                total += self.estimate(ROLE_MERGE, mode)
+        if not self.fused_evaluation:
+            total += self.estimate(ROLE_EVALUATE, mode)
+        return total
+
+    def fallback_reserve(self, thinking_mode: Optional[str] = None, compact: Optional[bool] = None) -> float:
+        """
+        Seconds a round may need beyond estimate_round when its primary calls fail
+        Only one round's fallbacks are reserved: every round is re-planned from the time actually left
+        Args:
+            thinking_mode: Thinking mode of the round (default: the requested one)
+            compact: Whether the round is a single compact call (default: by compact_modes)
+        """
+        mode = thinking_mode or self.thinking_mode
+        if compact is None:
+            compact = mode in self.compact_modes
+        reserve = 0.0
+        if compact:
+            # An unusable compact response is redone as critic, expander and scientist calls, merged locally
+            reserve += (
+                self.estimate(ROLE_CRITIC, mode)
+                + self.estimate(ROLE_EXPANDER, mode)
+                + self.estimate(ROLE_REBUTTAL, mode)
+            )
+        if self.fused_evaluation:
+            # A critique without a valid confidence score is followed by a new critique
+            reserve += self.estimate(ROLE_CRITIC, mode)
+        elif self.scoring_fallback:
+            # Unusable score samples are followed by a single-score evaluation
+            reserve += self.estimate(ROLE_EVALUATE, mode)
+        return reserve
+
+    def synthesis_reserve(self) -> float:
+        """Seconds that must stay available for the final synthesis (and the final critique scoring the last hypothesis)"""
+        reserve = self.estimate(ROLE_SYNTHESIS, self._cheapest_mode())
+        if self.fused_evaluation:
+            reserve += self.estimate(ROLE_CRITIC, self._cheapest_mode())
+        return reserve
+
+    def plan_initial(self) -> str:
+        """
+        Thinking mode for the initial hypothesis: the richest one whose generation (and
+        evaluation, unless fused into the first critique) leaves the synthesis reserve intact
+        """
+        available = self.remaining() - self.synthesis_reserve()
+        for mode in self._modes():
+            needed = self.estimate(ROLE_SCIENTIST, mode)
+            if not self.fused_evaluation:
+                needed += self.estimate(ROLE_EVALUATE, mode)
+                if self.scoring_fallback:
+                    needed += self.estimate(ROLE_EVALUATE, mode)
+            if needed <= available:
+                return mode
+        return self._cheapest_mode()
+
+    def plan_rounds(self, target_rounds: int, specialists: List[str]) -> int:
+        """
+        Number of rounds that fit the remaining time at full quality
+        Args:
+            target_rounds: Rounds suggested by the query complexity heuristic
+            specialists: Specialists selected for the query
+        Returns:
+            Number of rounds expected to fit without degradation (at least 1)
+        """
+        available = self.remaining() - self.synthesis_reserve() - self.fallback_reserve()
+        per_round = self.estimate_round(len(specialists))
+        fitting = int(available // per_round) if per_round > 0 else target_rounds
+        return max(1, min(target_rounds, fitting))
+
+    def plan_round(self, specialists: List[str]) -> Optional[Dict]:
+        """
+        Choose the configuration of the next round
+        Args:
+            specialists: Specialists selected for the query, in priority order
+        Returns:
+            Dict with "specialists", "thinking_mode" and "local_merge", or None if no round
+            (with the fallback calls it may need) fits
+        """
+        available = self.remaining() - self.synthesis_reserve()
+        for local_merge in (False, True):
+            for mode in self._modes():
+                reserve = self.fallback_reserve(mode)
+                for count in range(len(specialists), -1, -1):
+                    if self.estimate_round(count, mode, local_merge) + reserve <= available:
+                        return {
+                            "specialists": specialists[:count],
+                            "thinking_mode": mode,
+                            "local_merge": local_merge
+                        }
+        return None
+
+    def plan_final_evaluation(self) -> str:
+        """
+        Thinking mode for the final critique scoring the last hypothesis when evaluation is
+        fused into critiques: the richest one that leaves the synthesis itself enough time
+        """
+        available = self.remaining() - self.estimate(ROLE_SYNTHESIS, self._cheapest_mode())
+        for mode in self._modes():
+            if self.estimate(ROLE_CRITIC, mode) <= available:
+                return mode
+        return self._cheapest_mode()
+
+    def plan_synthesis(self) -> str:
+        """
+        Thinking mode for the final synthesis: the richest one that still fits
+        An unparsable synthesis falls back to a local analysis, so no further call is reserved
+        """
+        remaining = self.remaining()
+        for mode in self._modes():
+            if self.estimate(ROLE_SYNTHESIS, mode) <= remaining:
+                return mode
+        return self._cheapest_mode()
+
+    def _modes(self) -> List[str]:
+        """Allowed thinking modes, richest first"""
+        return THINKING_MODES[THINKING_MODES.index(self.thinking_mode):]
+
+    def _cheapest_mode(self) -> str:
+        return THINKING_MODES[-1]
@@ -93,7 +93,7 @@ class KGReasoningAgent:
 
             # Extract subgraph using seed path if available
             relevant_subgraph = (
-                self.kg_manager.extract_subgraph(seed_path.get("nodes", []))
+                self.kg_manager.extract_subgraph(seed_path.get("nodes", []), copy=False)
                 if seed_path and "nodes" in seed_path
                 else self.kg_manager.graph
             )
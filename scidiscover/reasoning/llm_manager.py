@@ -3,6 +3,8 @@ from openai import OpenAI
 from anthropic import Anthropic
 from typing import Dict, Any, Optional, Union
 import json
+import time
+from .cancellation import CancellationToken, DebateCancelled
 from scidiscover.config import (
     OPENAI_API_KEY, ANTHROPIC_API_KEY, OPENAI_MODEL, 
     ANTHROPIC_MODEL, ANTHROPIC_MAX_TOKENS_HIGH, ANTHROPIC_MAX_TOKENS_LOW, ANTHROPIC_MAX_TOKENS_NONE,
@@ -28,6 +30,12 @@ class LLMManager:
         # This model supports extended thinking capabilities
         self.anthropic_model = ANTHROPIC_MODEL
 
+        # Optional listener for streaming progress: called as listener(text_chars, thinking_chars)
+        self.stream_listener = None
+        self.stream_listener_interval = 2000  # Characters between listener notifications
+        # Optional observer of completed Claude calls: called as observer(stats_dict)
+        self.call_observer = None
+
         # Set token limits based on the selected mode
         self.high_demand_mode = high_demand_mode
         self.thinking_mode = "high" if high_demand_mode else "low"
@@ -55,9 +63,20 @@ class LLMManager:
             self.max_tokens = ANTHROPIC_MAX_TOKENS_NONE
             self.thinking_budget = ANTHROPIC_THINKING_BUDGET_NONE
 
-    def generate_response(self, prompt: str, model_preference: str = "anthropic", response_format: str = "text") -> Union[str, Dict]:
-        """Generate response using specified LLM"""
+    def generate_response(self, prompt: str, model_preference: str = "anthropic", response_format: str = "text",
+                          cancel_token: Optional[CancellationToken] = None) -> Union[str, Dict]:
+        """
+        Generate response using specified LLM
+        Args:
+            prompt: Prompt text
+            model_preference: "anthropic" or "openai"
+            response_format: "text" or "json"
+            cancel_token: Optional token; cancelling it closes the active stream and raises DebateCancelled
+        """
         try:
+            if cancel_token:
+                cancel_token.raise_if_cancelled()
+
             print(f"\nGenerating response with {model_preference}...")
             print(f"Using model: {self.anthropic_model if model_preference == 'anthropic' else OPENAI_MODEL}")
             print(f"Prompt: {prompt[:500]}...")  # Print first 500 chars of prompt for debugging
@@ -100,24 +119,55 @@ class LLMManager:
                         "budget_tokens": self.thinking_budget
                     }
 
+                call_start = time.monotonic()
+                first_token_time = None
+
                 with self.anthropic_client.beta.messages.stream(**api_params) as stream:
                     # Initialize to store thinking process
                     thinking_text = ""
+                    last_notified = 0
+
+                    # Cancelling closes the HTTP stream immediately, even while waiting for the next chunk
+                    cancel_handle = cancel_token.register(stream.close) if cancel_token else None
 
                     print("Streaming response from Claude...")
-                    for chunk in stream:
-                        # Handle content chunks
-                        if hasattr(chunk, 'delta') and hasattr(chunk.delta, 'text'):
-                            # Print progress indicator
-                            print(".", end="", flush=True)
-                            full_content += chunk.delta.text
-
-                        # Handle thinking chunks
-                        if hasattr(chunk, 'thinking') and chunk.thinking:
-                            thinking_text += chunk.thinking
-                            print("T", end="", flush=True)  # 'T' indicates thinking updated
+                    try:
+                        for chunk in stream:
+                            if first_token_time is None and hasattr(chunk, 'delta'):
+                                first_token_time = time.monotonic()
+
+                            # Handle content chunks
+                            if hasattr(chunk, 'delta') and hasattr(chunk.delta, 'text'):
+                                # Print progress indicator
+                                print(".", end="", flush=True)
+                                full_content += chunk.delta.text
+
+                            # Handle thinking chunks
+                            if hasattr(chunk, 'thinking') and chunk.thinking:
+                                thinking_text += chunk.thinking
+                                print("T", end="", flush=True)  # 'T' indicates thinking updated
+
+                            # Report streaming progress at a bounded rate
+                            streamed = len(full_content) + len(thinking_text)
+                            if self.stream_listener and streamed - last_notified >= self.stream_listener_interval:
+                                last_notified = streamed
+                                self._notify_stream_listener(len(full_content), len(thinking_text))
+                    except Exception:
+                        if cancel_token and cancel_token.cancelled:
+                            raise DebateCancelled(cancel_token.reason)
+                        raise
+                    finally:
+                        if cancel_token:
+                            cancel_token.unregister(cancel_handle)
+
+                    if cancel_token:
+                        cancel_token.raise_if_cancelled()
 
                     print()  # New line after progress indicators
+                    if self.stream_listener:
+                        self._notify_stream_listener(len(full_content), len(thinking_text))
+                    if self.call_observer:
+                        self._notify_call_observer(stream, call_start, first_token_time, full_content, thinking_text)
 
                     # Log thinking process if available
                     if thinking_text:
@@ -192,10 +242,44 @@ class LLMManager:
                 return content
 
             return "" if response_format == "text" else {}
+        except DebateCancelled:
+            print("\nLLM response generation cancelled")
+            raise
         except Exception as e:
             print(f"Error in LLM response generation: {str(e)}")
             return {} if response_format == "json" else ""
 
+    def _notify_stream_listener(self, text_chars: int, thinking_chars: int) -> None:
+        """Call the stream listener without letting listener errors break the stream"""
+        try:
+            self.stream_listener(text_chars, thinking_chars)
+        except Exception as e:
+            print(f"Error in stream listener: {str(e)}")
+
+    def _notify_call_observer(self, stream, call_start: float, first_token_time: Optional[float],
+                              content: str, thinking_text: str) -> None:
+        """Report timing and token usage of a completed streaming call to the call observer"""
+        stats = {
+            "seconds": time.monotonic() - call_start,
+            "ttft": (first_token_time - call_start) if first_token_time else None,
+            "thinking_mode": self.thinking_mode,
+            "input_tokens": None,
+            "output_tokens": None,
+            "text_chars": len(content),
+            "thinking_chars": len(thinking_text)
+        }
+        try:
+            usage = stream.get_final_message().usage
+            stats["input_tokens"] = usage.input_tokens
+            stats["output_tokens"] = usage.output_tokens
+        except Exception as e:
+            print(f"Token usage unavailable: {str(e)}")
+
+        try:
+            self.call_observer(stats)
+        except Exception as e:
+            print(f"Error in call observer: {str(e)}")
+
     def analyze_scientific_query(self, query: str, concepts: list, novelty_score: float = 0.5) -> Dict[str, Any]:
         """
         Scientific analysis specialized function for more reliable Claude responses
@@ -2,12 +2,15 @@
 Main SciAgent implementation following SciAgents architecture
 Enhanced with KG-COI graph reasoning
 """
-from typing import Dict, List, Optional, Callable
+from typing import Dict, Iterator, List, Optional, Callable
 from .llm_manager import LLMManager
 from .agents import OntologistAgent, ScientistAgent, ExpanderAgent, CriticAgent
 from .kg_reasoning import KGReasoningAgent
 from .debate_orchestrator import DebateOrchestrator
+from .batch_debate import BatchDebateRunner
+from .cancellation import CancellationToken, DebateCancelled
 import json
+import time
 
 class SciAgent:
     """
@@ -114,7 +117,9 @@ class SciAgent:
             # Return a default response in case of any error
             return self.llm_manager._generate_default_response(query)
 
-    def analyze_mechanism_with_debate(self, query: str, novelty_score: float = 0.5) -> Dict:
+    def analyze_mechanism_with_debate(self, query: str, novelty_score: float = 0.5,
+                                      deadline: Optional[float] = None,
+                                      cancel_token: Optional[CancellationToken] = None) -> Dict:
         """
         Perform scientific analysis using the debate-driven methodology
         This implements the "generate, debate, and evolve" approach from Coscientist
@@ -122,46 +127,34 @@ class SciAgent:
         Args:
             query: Scientific query to analyze
             novelty_score: Target novelty level (0: established, 1: novel)
+            deadline: Optional wall-clock budget in seconds for the whole analysis,
+                      including concept extraction
+            cancel_token: Optional token to stop the analysis early
 
         Returns:
             A comprehensive scientific analysis refined through multi-agent debate
+            (marked with "cancelled": True if it was stopped early)
         """
         try:
+            start_time = time.monotonic()
             print(f"Starting debate-driven analysis of query: {query}")
             print(f"Novelty score: {novelty_score}")
             print(f"Using thinking mode: {self.thinking_mode.title()}")
 
             # Step 1: Extract concepts
-            concepts = []
-            try:
-                # Extract concepts with the ontologist
-                concepts_result = self.ontologist.define_concepts(query)
-                if concepts_result and isinstance(concepts_result, dict):
-                    # Extract concepts from various categories
-                    for category in ["molecular_components", "cellular_processes", 
-                                  "regulatory_mechanisms", "developmental_context"]:
-                        if category in concepts_result:
-                            concepts.extend(concepts_result[category])
-
-                # Ensure we have meaningful concepts
-                if not concepts:
-                    # Fallback: Extract key terms from the query
-                    concepts = [term.strip().lower() for term in query.split() 
-                                if len(term) > 4 and term.lower() not in 
-                                ['what', 'how', 'why', 'when', 'where', 'which', 'there', 'their']]
-                    concepts = list(set(concepts))  # Remove duplicates
-            except Exception as e:
-                print(f"Concept extraction error in debate analysis: {str(e)}")
-                # Default concepts for fallback
-                concepts = ["immune", "pathway", "regulation", "signaling", "development"]
-
+            concepts = self.extract_debate_concepts(query, cancel_token=cancel_token)
             print(f"Debate analysis with concepts: {concepts}")
 
-            # Step 2: Run the multi-agent debate
+            # Step 2: Run the multi-agent debate within whatever time concept extraction left
+            remaining = None
+            if deadline is not None:
+                remaining = max(0.0, deadline - (time.monotonic() - start_time))
             debate_result = self.debate_orchestrator.orchestrate_debate(
                 query,
                 concepts,
-                novelty_score=novelty_score
+                novelty_score=novelty_score,
+                deadline=remaining,
+                cancel_token=cancel_token
             )
 
             # Step 3: Optional - Validate with knowledge graph if needed
@@ -170,6 +163,68 @@ class SciAgent:
             # Return the debate-refined analysis
             return debate_result
 
+        except DebateCancelled:
+            # Cancelled before the debate produced any hypothesis
+            print("Debate-driven analysis cancelled during concept extraction")
+            result = self.llm_manager._generate_default_response(query)
+            result["cancelled"] = True
+            return result
         except Exception as e:
             print(f"Error in debate-driven analysis: {str(e)}")
-            return self.llm_manager._generate_default_response(query)
\ No newline at end of file
+            return self.llm_manager._generate_default_response(query)
+
+    def analyze_batch_with_debate(self, queries: List[str], novelty_score: float = 0.5,
+                                  max_concurrency: int = 3,
+                                  deadline: Optional[float] = None,
+                                  cancel_token: Optional[CancellationToken] = None) -> Iterator[Dict]:
+        """
+        Debate a family of related queries concurrently
+        Args:
+            queries: Related scientific queries (e.g. one mechanism across several tissues)
+            novelty_score: Target novelty level (0: established, 1: novel)
+            max_concurrency: Maximum number of debates running at once
+            deadline: Optional per-debate wall-clock budget in seconds
+            cancel_token: Optional token cancelling every debate of the batch
+        Returns:
+            Iterator yielding each query's result as soon as its debate completes
+        """
+        runner = BatchDebateRunner(self, max_concurrency=max_concurrency)
+        return runner.run(queries, novelty_score=novelty_score, deadline=deadline, cancel_token=cancel_token)
+
+    def extract_debate_concepts(self, query: str, cancel_token: Optional[CancellationToken] = None,
+                                ontologist: Optional[OntologistAgent] = None) -> List[str]:
+        """
+        Extract the key concepts of a query for debate-driven analysis
+        Args:
+            query: Scientific query to analyze
+            cancel_token: Optional token; cancellation is propagated as DebateCancelled
+            ontologist: Ontologist to call (default: this agent's, on the shared LLM manager)
+        Returns:
+            List of concepts, falling back to query terms or defaults if extraction fails
+        """
+        concepts = []
+        try:
+            # Extract concepts with the ontologist
+            concepts_result = (ontologist or self.ontologist).define_concepts(query, cancel_token=cancel_token)
+            if concepts_result and isinstance(concepts_result, dict):
+                # Extract concepts from various categories
+                for category in ["molecular_components", "cellular_processes", 
+                              "regulatory_mechanisms", "developmental_context"]:
+                    if category in concepts_result:
+                        concepts.extend(concepts_result[category])
+
+            # Ensure we have meaningful concepts
+            if not concepts:
+                # Fallback: Extract key terms from the query
+                concepts = [term.strip().lower() for term in query.split() 
+                            if len(term) > 4 and term.lower() not in 
+                            ['what', 'how', 'why', 'when', 'where', 'which', 'there', 'their']]
+                concepts = list(set(concepts))  # Remove duplicates
+        except DebateCancelled:
+            raise
+        except Exception as e:
+            print(f"Concept extraction error in debate analysis: {str(e)}")
+            # Default concepts for fallback
+            concepts = ["immune", "pathway", "regulation", "signaling", "development"]
+
+        return concepts
@@ -0,0 +1,229 @@
+"""
+Scoring support for debate hypotheses
+Self-consistency aggregation with confidence intervals and a canonical-hash score cache
+"""
+from typing import Any, Dict, Hashable, List, Optional
+from collections import OrderedDict
+from dataclasses import dataclass, field
+import hashlib
+import json
+import math
+import re
+import statistics
+import threading
+
+# Dimensions every score sample rates from 0 to 1
+SCORE_DIMENSIONS = [
+    "scientific_rigor",
+    "mechanistic_detail",
+    "evidence_support",
+    "internal_consistency",
+    "explanatory_power"
+]
+
+Z_95 = 1.96  # Normal quantile of a two-sided 95% confidence interval
+PRIOR_STDEV = 0.1  # Score spread assumed for an estimate backed by a single sample
+
+# Hypothesis fields whose lists are sets: item order and duplicates carry no meaning.
+# Lists under any other key (timelines, mechanism steps, ranked priorities, paths) keep their order.
+UNORDERED_FIELDS = frozenset([
+    "pathways", "additional_pathways", "genes", "evidence", "supported_claims", "missing_evidence",
+    "pathway_interactions", "cellular_compartments", "system_effects", "molecular_components",
+    "cellular_processes", "supporting_concepts", "biomarker_candidates",
+    "therapeutic_implications", "therapeutic_potential",
+    "strengths", "limitations", "gaps", "alternatives", "alternative_mechanisms",
+    "experiments", "predictions", "controls",
+    "key_insights", "specialist_insights", "suggested_improvements", "methodological_improvements",
+    "relevant_methodologies", "innovative_aspects", "technical_innovations", "technical_requirements",
+    "potential_challenges", "established_foundations", "cross_disciplinary_insights"
+])
+
+
+@dataclass
+class ScoreEstimate:
+    """
+    Hypothesis score with its uncertainty
+    A single unsampled score (stdev None) has a zero-width interval; only compare such
+    scores with each other, never with sampled estimates
+    """
+    mean: float
+    stdev: Optional[float] = None
+    samples: List[float] = field(default_factory=list)
+    dimensions: Dict[str, float] = field(default_factory=dict)
+
+    @classmethod
+    def point(cls, score: float, stdev: Optional[float] = None) -> "ScoreEstimate":
+        """
+        Estimate from a single score
+        Args:
+            score: The score
+            stdev: Assumed spread, making it a one-sample estimate comparable with sampled ones
+                   (None: no variance information, zero-width interval)
+        """
+        if stdev is None:
+            return cls(mean=score)
+        return cls(mean=score, stdev=stdev, samples=[score])
+
+    @property
+    def n(self) -> int:
+        """Number of samples behind the estimate"""
+        return max(1, len(self.samples))
+
+    @property
+    def stderr(self) -> float:
+        """Standard error of the mean (0 for a single unsampled score)"""
+        if self.stdev is None:
+            return 0.0
+        return self.stdev / math.sqrt(self.n)
+
+    @property
+    def lower(self) -> float:
+        """Lower bound of the 95% confidence interval"""
+        return max(0.0, self.mean - Z_95 * self.stderr)
+
+    @property
+    def upper(self) -> float:
+        """Upper bound of the 95% confidence interval"""
+        return min(1.0, self.mean + Z_95 * self.stderr)
+
+    def noise_margin(self, other: "ScoreEstimate") -> float:
+        """Smallest difference to other that is distinguishable from scoring noise at 95%"""
+        return Z_95 * math.sqrt(self.stderr ** 2 + other.stderr ** 2)
+
+    def to_dict(self) -> Dict:
+        """Serializable summary"""
+        return {
+            "mean": self.mean,
+            "stdev": self.stdev,
+            "n": self.n,
+            "interval": [self.lower, self.upper],
+            "dimensions": self.dimensions
+        }
+
+
+def parse_score_samples(response: Any) -> List[Dict[str, float]]:
+    """
+    Extract valid dimension-score samples from an evaluator response
+    Args:
+        response: Parsed JSON response, expected as {"samples": [{dimension: score, ...}, ...]}
+    Returns:
+        Samples with every dimension present and clamped to 0-1; invalid samples are skipped
+    """
+    if isinstance(response, dict):
+        response = response.get("samples", [])
+    if not isinstance(response, list):
+        return []
+
+    samples = []
+    for sample in response:
+        if not isinstance(sample, dict):
+            continue
+        try:
+            values = {dim: float(sample[dim]) for dim in SCORE_DIMENSIONS}
+        except (KeyError, TypeError, ValueError):
+            continue
+        if any(math.isnan(value) for value in values.values()):
+            continue
+        samples.append({dim: min(1.0, max(0.0, value)) for dim, value in values.items()})
+    return samples
+
+
+def aggregate_samples(samples: List[Dict[str, float]], prior_stdev: float = PRIOR_STDEV) -> Optional[ScoreEstimate]:
+    """
+    Aggregate dimension-score samples into one estimate
+    Args:
+        samples: Valid samples from parse_score_samples
+        prior_stdev: Spread assumed when only one sample is available
+    Returns:
+        ScoreEstimate of the overall score (mean over dimensions), or None without samples
+    """
+    if not samples:
+        return None
+    overall = [sum(sample.values()) / len(sample) for sample in samples]
+    stdev = statistics.stdev(overall) if len(overall) > 1 else prior_stdev
+    dimensions = {
+        dim: sum(sample[dim] for sample in samples) / len(samples)
+        for dim in SCORE_DIMENSIONS
+    }
+    return ScoreEstimate(mean=sum(overall) / len(overall), stdev=stdev, samples=overall, dimensions=dimensions)
+
+
+def canonicalize(value: Any, unordered: bool = False) -> Any:
+    """
+    Canonical form of a hypothesis for comparison: sorted keys, normalized whitespace,
+    and deduplicated, sorted lists for the set-like fields in UNORDERED_FIELDS
+    Args:
+        value: Hypothesis or part of one
+        unordered: Whether value is the list of a set-like field
+    """
+    if isinstance(value, dict):
+        return {
+            str(key).strip(): canonicalize(item, str(key).strip() in UNORDERED_FIELDS)
+            for key, item in sorted(value.items(), key=lambda kv: str(kv[0]))
+        }
+    if isinstance(value, set) or isinstance(value, (list, tuple)) and unordered:
+        items = {}
+        for item in value:
+            canonical = canonicalize(item)
+            items.setdefault(json.dumps(canonical, sort_keys=True), canonical)
+        return [items[key] for key in sorted(items)]
+    if isinstance(value, (list, tuple)):
+        return [canonicalize(item) for item in value]
+    if isinstance(value, str):
+        return re.sub(r"\s+", " ", value).strip()
+    return value
+
+
+def hypothesis_hash(hypothesis: Any) -> str:
+    """Stable hash of the canonical form of a hypothesis"""
+    canonical = json.dumps(canonicalize(hypothesis), sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class ScoreCache:
+    """
+    Thread-safe LRU cache of hypothesis scores keyed by scorer settings and canonical hypothesis hash
+    Shared across debates so identical hypotheses are never scored twice by the same scorer
+    """
+    def __init__(self, max_entries: int = 1024):
+        """
+        Args:
+            max_entries: Maximum number of cached scores before the least recently used is evicted
+        """
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[ScoreEstimate]:
+        """Cached score for a key, or None"""
+        with self._lock:
+            estimate = self._entries.get(key)
+            if estimate is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return estimate
+
+    def put(self, key: Hashable, estimate: ScoreEstimate) -> None:
+        """Store a score, evicting the least recently used entry when full"""
+        with self._lock:
+            self._entries[key] = estimate
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop all cached scores"""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+
+# Score cache shared by all debates of the process
+DEFAULT_SCORE_CACHE = ScoreCache()
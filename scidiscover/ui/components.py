@@ -127,6 +127,71 @@ def render_entity_table(entities):
     else:
         st.warning("No entities were identified.")
 
+def render_performance_report(report):
+    """Render the per-debate cost/latency breakdown with a step timeline"""
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("Total Time", f"{report.get('total_seconds', 0):.0f}s")
+    col2.metric("LLM Calls", report.get("calls", 0))
+    col3.metric("Input Tokens", f"{report.get('input_tokens', 0):,}")
+    col4.metric("Output Tokens", f"{report.get('output_tokens', 0):,}")
+
+    counters = report.get("counters", {})
+    if counters:
+        st.caption(" · ".join(f"{name.replace('_', ' ').title()}: {count}" for name, count in sorted(counters.items())))
+
+    st.markdown("#### Time by Role")
+    role_rows = []
+    for role, group in sorted(report.get("by_role", {}).items(), key=lambda item: -item[1]["seconds"]):
+        role_rows.append({
+            "Role": role,
+            "Steps": group["steps"],
+            "Calls": group["calls"],
+            "Seconds": round(group["seconds"], 1),
+            "Share": f"{group['share']:.0%}",
+            "Mean TTFT (s)": round(group["mean_ttft"], 1) if group["mean_ttft"] is not None else "-",
+            "Output Tokens": group["output_tokens"]
+        })
+    if role_rows:
+        st.table(role_rows)
+
+    st.markdown("#### Time by Round")
+    round_rows = [
+        {"Round": str(round_num), "Steps": group["steps"], "Seconds": round(group["seconds"], 1),
+         "Share": f"{group['share']:.0%}"}
+        for round_num, group in report.get("by_round", {}).items()
+    ]
+    if round_rows:
+        st.table(round_rows)
+
+    timeline = report.get("timeline", [])
+    if timeline:
+        fig = go.Figure(go.Bar(
+            y=[step["name"] for step in timeline],
+            x=[step["seconds"] for step in timeline],
+            base=[step["start"] for step in timeline],
+            orientation='h',
+            hovertext=[f"{step['thinking_mode']} thinking, {step['output_tokens']} output tokens" for step in timeline]
+        ))
+        fig.update_layout(
+            title="Debate Step Timeline",
+            xaxis_title="Seconds since start",
+            yaxis=dict(autorange="reversed"),
+            height=max(300, 22 * len(timeline)),
+            margin=dict(l=20, r=20, t=40, b=20)
+        )
+        st.plotly_chart(fig, use_container_width=True)
+
+    critical_path = report.get("critical_path", {})
+    overlaps = report.get("overlap_opportunities", [])
+    if overlaps:
+        st.markdown(
+            f"**Overlap opportunities:** sequential step time {critical_path.get('sequential_seconds', 0):.0f}s "
+            f"could drop to ~{critical_path.get('overlapped_seconds', 0):.0f}s"
+        )
+        for overlap in overlaps:
+            st.markdown(f"- Round {overlap['round']}: {', '.join(overlap['steps'])} "
+                        f"(saves ~{overlap['saved_seconds']:.0f}s) - {overlap['reason']}")
+
 def render_collaborative_hypothesis(gamification_manager: GamificationManager, hypothesis_id: str):
     """Render collaborative hypothesis building interface"""
     st.subheader("Collaborative Hypothesis Building")
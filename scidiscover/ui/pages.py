@@ -1,8 +1,69 @@
 import streamlit as st
 from ..reasoning.sci_agent import SciAgent
+from ..reasoning.debate_events import EVENT_STEP_STARTED, EVENT_TOKEN_PROGRESS, EVENT_HISTORY_ENTRY, EVENT_SCORE
+from ..reasoning.cancellation import CancellationToken
+from ..reasoning.debate_scheduler import (
+    ROLE_SCIENTIST, ROLE_CRITIC, ROLE_EXPANDER, ROLE_REBUTTAL, ROLE_MERGE, ROLE_SYNTHESIS, ROLE_COMPACT_ROUND
+)
 from ..knowledge.pubtator import PubTatorClient
+from .components import render_performance_report
+import threading
 import time
 
+# Progress stages shown while a debate runs
+DEBATE_STAGES = [
+    "Initiating scientific debate orchestration...",
+    "Extracting and defining key scientific concepts...",
+    "Generating initial hypothesis by Scientist Agent...",
+    "Critical evaluation by Critic Agent (Round 1)...",
+    "Hypothesis refinement by Expander Agent (Round 1)...",
+    "Scientific rebuttal by Scientist Agent (Round 1)...",
+    "Merging hypothesis improvements (Round 1)...",
+    "Critical evaluation by Critic Agent (Round 2)...",
+    "Hypothesis refinement by Expander Agent (Round 2)...",
+    "Scientific rebuttal by Scientist Agent (Round 2)...",
+    "Merging hypothesis improvements (Round 2)...",
+    "Critical evaluation by Critic Agent (Round 3)...",
+    "Hypothesis refinement by Expander Agent (Round 3)...",
+    "Scientific rebuttal by Scientist Agent (Round 3)...",
+    "Synthesizing final analysis from debate..."
+]
+
+# Position of each debate role within a round's block of stages
+DEBATE_ROLE_STAGE_OFFSETS = {
+    ROLE_CRITIC: 0,
+    ROLE_COMPACT_ROUND: 0,
+    ROLE_EXPANDER: 1,
+    ROLE_REBUTTAL: 2,
+    ROLE_MERGE: 3
+}
+
+
+def _debate_stage_for_event(event):
+    """Map a debate event to an index in DEBATE_STAGES, or None if it does not advance progress"""
+    if event.type != EVENT_STEP_STARTED:
+        return None
+    if event.role == ROLE_SCIENTIST:
+        return 2
+    if event.role == ROLE_SYNTHESIS:
+        return len(DEBATE_STAGES) - 1
+    if event.role in DEBATE_ROLE_STAGE_OFFSETS and event.round:
+        # Rounds beyond those listed keep showing the last listed round
+        stage = 3 + (event.round - 1) * 4 + DEBATE_ROLE_STAGE_OFFSETS[event.role]
+        return min(stage, len(DEBATE_STAGES) - 2)
+    return None
+
+
+def _render_debate_progress(container, stage, detail=None):
+    """Render live debate progress into a placeholder"""
+    with container.container():
+        st.subheader("🔄 Orchestrating multi-agent scientific debate...")
+        st.progress(stage / (len(DEBATE_STAGES) - 1))
+        st.info(f"**Current Stage:** {DEBATE_STAGES[stage]}")
+        if detail:
+            st.caption(detail)
+
+
 def main_page():
     st.title("SciDiscover")
     st.markdown("""
@@ -37,6 +98,8 @@ def main_page():
         st.session_state.analysis_start_time = None
     if 'analysis_elapsed_time' not in st.session_state:
         st.session_state.analysis_elapsed_time = None
+    if 'debate_time_limit' not in st.session_state:
+        st.session_state.debate_time_limit = 0
 
     # Add controls in sidebar
     with st.sidebar:
@@ -66,6 +129,15 @@ def main_page():
             This approach mimics scientific discourse for stronger analyses.
             """)
 
+            # Optional deadline: rounds, specialists and thinking budgets are scheduled to fit it
+            st.session_state.debate_time_limit = st.number_input(
+                "Time Limit (minutes)",
+                min_value=0,
+                max_value=60,
+                value=st.session_state.debate_time_limit,
+                help="0 for no limit. Otherwise the debate adapts its rounds and thinking budget to finish in time"
+            )
+
 
         # Novelty slider
         novelty_score = st.slider(
@@ -157,23 +229,7 @@ def main_page():
     if st.session_state.analysis_running:
         # Define the analysis stages for different analysis methods
         if st.session_state.use_debate:
-            stages = [
-                "Initiating scientific debate orchestration...",
-                "Extracting and defining key scientific concepts...",
-                "Generating initial hypothesis by Scientist Agent...",
-                "Critical evaluation by Critic Agent (Round 1)...",
-                "Hypothesis refinement by Expander Agent (Round 1)...",
-                "Scientific rebuttal by Scientist Agent (Round 1)...",
-                "Merging hypothesis improvements (Round 1)...",
-                "Critical evaluation by Critic Agent (Round 2)...",
-                "Hypothesis refinement by Expander Agent (Round 2)...",
-                "Scientific rebuttal by Scientist Agent (Round 2)...",
-                "Merging hypothesis improvements (Round 2)...",
-                "Critical evaluation by Critic Agent (Round 3)...",
-                "Hypothesis refinement by Expander Agent (Round 3)...",
-                "Scientific rebuttal by Scientist Agent (Round 3)...",
-                "Synthesizing final analysis from debate..."
-            ]
+            stages = DEBATE_STAGES
         else:
             stages = [
                 "Initiating scientific analysis with extended thinking...",
@@ -200,7 +256,9 @@ def main_page():
             st.info(f"**Current Stage:** {stages[current_stage]}")
 
             # Estimated time remaining based on thinking mode
-            if st.session_state.use_debate:
+            if st.session_state.use_debate and st.session_state.debate_time_limit:
+                total_time = f"at most {st.session_state.debate_time_limit} minutes"
+            elif st.session_state.use_debate:
                 if st.session_state.thinking_mode == "high":
                     total_time = "15-25 minutes"
                 elif st.session_state.thinking_mode == "low":
@@ -263,47 +321,83 @@ def main_page():
             st.progress(0)
 
         try:
-            # Register the callback to capture debate history but not for UI updates
-            def update_debate_callback(entry):
-                st.session_state.live_debate_updates.append(entry)
-
-                # Update the stage counter based on agent activities
-                if entry['action'] == 'initial_hypothesis':
-                    st.session_state.analysis_stage = 2
-                elif entry['action'] == 'critique' and len(st.session_state.live_debate_updates) <= 2:
-                    st.session_state.analysis_stage = 3
-                elif entry['action'] == 'refinement' and len(st.session_state.live_debate_updates) <= 4:
-                    st.session_state.analysis_stage = 4
-                elif entry['action'] == 'rebuttal' and len(st.session_state.live_debate_updates) <= 6:
-                    st.session_state.analysis_stage = 5
-                elif entry['action'] == 'critique' and len(st.session_state.live_debate_updates) <= 8:
-                    st.session_state.analysis_stage = 7
-                elif entry['action'] == 'refinement' and len(st.session_state.live_debate_updates) <= 10:
-                    st.session_state.analysis_stage = 8
-                elif entry['action'] == 'rebuttal' and len(st.session_state.live_debate_updates) <= 12:
-                    st.session_state.analysis_stage = 9
-                elif entry['action'] == 'critique' and len(st.session_state.live_debate_updates) <= 14:
-                    st.session_state.analysis_stage = 11
-                elif entry['action'] == 'refinement' and len(st.session_state.live_debate_updates) <= 16:
-                    st.session_state.analysis_stage = 12
-                elif entry['action'] == 'rebuttal':
-                    st.session_state.analysis_stage = 13
-
-            # Pass the callback to sci_agent
-            sci_agent.set_debate_callback(update_debate_callback)
-
             # Update progress to concept extraction
             st.session_state.analysis_stage = 1
 
             if st.session_state.use_debate:
-                # Run the debate-driven analysis
-                analysis = sci_agent.analyze_mechanism_with_debate(
-                    query,
-                    novelty_score=novelty_score
+                # Run the debate on a worker thread and consume its event stream here, so only
+                # the script thread touches session_state and the debate thread is never blocked
+                subscription = sci_agent.debate_orchestrator.events.subscribe()
+                cancel_token = CancellationToken()
+                outcome = {}
+                deadline = st.session_state.debate_time_limit * 60 if st.session_state.debate_time_limit else None
+
+                def run_debate():
+                    try:
+                        outcome["analysis"] = sci_agent.analyze_mechanism_with_debate(
+                            query,
+                            novelty_score=novelty_score,
+                            deadline=deadline,
+                            cancel_token=cancel_token
+                        )
+                    except Exception as e:
+                        outcome["error"] = e
+
+                worker = threading.Thread(target=run_debate, daemon=True)
+                worker.start()
+                _render_debate_progress(analysis_progress_container, st.session_state.analysis_stage)
+
+                # Stop cancels from its click callback, which closes the active stream right away
+                # instead of waiting for the loop below to reach its next Streamlit call
+                st.button(
+                    "Stop Analysis",
+                    key="stop_analysis",
+                    on_click=cancel_token.cancel,
+                    args=("Analysis stopped from the UI",)
                 )
 
+                try:
+                    while True:
+                        event = subscription.get(timeout=0.5)
+                        if event is None:
+                            if not worker.is_alive():
+                                break
+                            continue
+
+                        detail = None
+                        if event.type == EVENT_HISTORY_ENTRY:
+                            st.session_state.live_debate_updates.append(event.data["entry"])
+                        elif event.type == EVENT_TOKEN_PROGRESS:
+                            detail = f"Streaming {event.role}: {event.data['text_chars']} characters, {event.data['thinking_chars']} thinking characters"
+                        elif event.type == EVENT_SCORE:
+                            detail = f"Latest hypothesis score: {event.data['score']:.2f} (best {event.data['best_score']:.2f})"
+
+                        stage = _debate_stage_for_event(event)
+                        if stage is not None and stage > st.session_state.analysis_stage:
+                            st.session_state.analysis_stage = stage
+                        if stage is not None or detail:
+                            _render_debate_progress(analysis_progress_container, st.session_state.analysis_stage, detail)
+                finally:
+                    subscription.close()
+                    if worker.is_alive():
+                        # The script run was interrupted (e.g. by navigating away): stop the debate
+                        # and keep its best-so-far result
+                        cancel_token.cancel("Analysis stopped from the UI")
+                        worker.join(timeout=30)
+                        if "analysis" in outcome:
+                            st.session_state.analysis_results = outcome["analysis"]
+                            st.session_state.debate_history = sci_agent.debate_orchestrator.debate_history
+                        st.session_state.analysis_running = False
+                        st.session_state.analysis_stage = 0
+                    else:
+                        worker.join()
+
+                if "error" in outcome:
+                    raise outcome["error"]
+                analysis = outcome["analysis"]
+
                 # Final synthesis stage
-                st.session_state.analysis_stage = 14
+                st.session_state.analysis_stage = len(DEBATE_STAGES) - 1
 
                 # Store debate history if available
                 if hasattr(sci_agent.debate_orchestrator, 'debate_history'):
@@ -355,6 +449,9 @@ def main_page():
         # Display Primary Analysis
         st.header("Molecular Mechanism Analysis")
 
+        if analysis.get("cancelled"):
+            st.warning("The analysis was stopped before completion. Showing the best hypothesis reached so far.")
+
         # Show confidence score and elapsed time
         confidence = analysis.get("confidence_score", 0)
         col1, col2, col3 = st.columns(3)
@@ -460,6 +557,11 @@ def main_page():
                     st.caption(f"Timestamp: {entry['timestamp']}")
                     st.markdown("---")
 
+        # Per-debate cost/latency breakdown
+        if analysis.get("performance") and st.session_state.use_debate:
+            with st.expander("View Performance Report", expanded=False):
+                render_performance_report(analysis["performance"])
+
         # Add citation for extended thinking capabilities
         st.markdown("---")
         # Show the appropriate token information based on thinking mode
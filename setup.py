@@ -16,6 +16,7 @@ setup(
         "plotly>=6.0.0",
         "streamlit>=1.42.2",
         "numpy>=1.26.0",
+        "scipy>=1.11.0",
         "graphviz>=0.20.1",
         "python-dotenv>=1.0.0",
         "requests>=2.31.0",
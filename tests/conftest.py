@@ -0,0 +1,161 @@
+"""
+Shared fixtures: small concept graphs and a scripted LLM for debate tests
+"""
+import random
+
+import networkx as nx
+import pytest
+
+from scidiscover.reasoning.debate_orchestrator import (
+    DebateOrchestrator, EVALUATION_MODE_SEPARATE, ROUND_STRATEGY_FULL, SCORING_MODE_SINGLE
+)
+from scidiscover.reasoning.debate_scheduler import LatencyStats
+from scidiscover.reasoning.scoring import SCORE_DIMENSIONS, ScoreCache
+
+
+def make_concept_graph(num_nodes: int = 40, seed: int = 7) -> nx.Graph:
+    """Connected small-world graph with concept names, evidence weights above and below 1 and evidence lists"""
+    rng = random.Random(seed)
+    base = nx.connected_watts_strogatz_graph(num_nodes, 4, 0.3, seed=seed)
+    graph = nx.Graph()
+    for node in base.nodes():
+        graph.add_node(f"concept_{node}", type="concept")
+    for u, v in base.edges():
+        graph.add_edge(
+            f"concept_{u}", f"concept_{v}",
+            relationship=rng.choice(["activates", "inhibits", "binds"]),
+            weight=rng.uniform(0.2, 3.0),
+            evidence=[f"study_{rng.randrange(100)}" for _ in range(rng.randint(1, 3))]
+        )
+    return graph
+
+
+@pytest.fixture
+def concept_graph() -> nx.Graph:
+    return make_concept_graph()
+
+
+@pytest.fixture
+def concept_digraph() -> nx.DiGraph:
+    graph = make_concept_graph().to_directed()
+    rng = random.Random(11)
+    # Drop one direction of some edges so that reachability is not symmetric
+    for u, v in list(graph.edges()):
+        if graph.has_edge(v, u) and rng.random() < 0.3:
+            graph.remove_edge(u, v)
+    return graph
+
+
+class ScriptedLLM:
+    """
+    Stand-in for LLMManager that answers every debate prompt by its kind
+    Scores are taken in order from the configured lists (the last one repeats)
+    """
+    def __init__(self):
+        self.anthropic_model = "test-model"
+        self.stream_listener = None
+        self.call_observer = None
+        self.calls = []  # Kind of every prompt answered, in order
+        self.critic_scores = [0.6]
+        self.evaluation_scores = ["0.5"]
+        self.score_samples = [[0.5] * 5]
+        self.compact_responses = []  # Compact round responses (None falls back to a valid round)
+        self.on_call = None  # Optional hook called with the prompt kind before answering
+        self.set_thinking_mode("high")
+        self._counts = {}
+
+    def set_thinking_mode(self, mode="high"):
+        self.thinking_mode = mode
+        self.thinking_budget = {"high": 64000, "low": 32000}.get(mode, 0)
+
+    @staticmethod
+    def kind(prompt: str) -> str:
+        markers = [
+            ("Run one full round of a scientific debate", "compact_round"),
+            ("independent assessments", "score_samples"),
+            ("Evaluate this scientific hypothesis", "evaluate"),
+            ("Critically evaluate this scientific hypothesis", "critic"),
+            ("Expand and refine this research hypothesis", "expander"),
+            ("Generate a detailed rebuttal", "rebuttal"),
+            ("Merge these two scientific hypotheses", "merge"),
+            ("Create a comprehensive scientific analysis", "synthesis"),
+            ("Analyze this scientific query", "ontologist"),
+            ("Based on these biological concepts", "scientist"),
+        ]
+        for marker, kind in markers:
+            if marker in prompt:
+                return kind
+        return "specialist"
+
+    def _next(self, name: str, values: list):
+        count = self._counts.get(name, 0)
+        self._counts[name] = count + 1
+        return values[min(count, len(values) - 1)]
+
+    def generate_response(self, prompt, model_preference="anthropic", response_format="text", cancel_token=None):
+        if cancel_token:
+            cancel_token.raise_if_cancelled()
+        kind = self.kind(prompt)
+        self.calls.append(kind)
+        if self.on_call:
+            self.on_call(kind)
+        if cancel_token:
+            cancel_token.raise_if_cancelled()
+        number = self._counts.get(kind, 0)
+        self._counts[kind] = number + 1
+
+        if kind == "critic":
+            return {
+                "evaluation": {"strengths": ["clear"], "limitations": ["small cohort"]},
+                "validation": {"experiments": ["knockout"]},
+                "confidence_score": self._next("critic_score", self.critic_scores)
+            }
+        if kind == "evaluate":
+            return self._next("evaluation_score", self.evaluation_scores)
+        if kind == "score_samples":
+            samples = self._next("samples", self.score_samples)
+            return {"samples": [{dim: value for dim in SCORE_DIMENSIONS} for value in samples]}
+        if kind == "compact_round":
+            response = self._next("compact", self.compact_responses) if self.compact_responses else None
+            if response is not None:
+                return response
+            return {
+                "critique": {"evaluation": {"limitations": ["gap"]},
+                             "confidence_score": self._next("critic_score", self.critic_scores)},
+                "refinement": {"expanded_mechanisms": {"additional_pathways": [f"compact pathway {number}"]}},
+                "specialist_inputs": {},
+                "rebuttal": {"hypothesis": f"compact rebuttal {number}"},
+                "merged_hypothesis": {"hypothesis": f"compact hypothesis {number}"}
+            }
+        if kind == "expander":
+            return {"expanded_mechanisms": {"additional_pathways": [f"pathway {number}"]}}
+        if kind == "rebuttal":
+            return {"hypothesis": f"rebuttal {number}", "mechanisms": {"pathways": ["Wnt"]}}
+        if kind == "merge":
+            return {"hypothesis": f"merged hypothesis {number}", "mechanisms": {"pathways": ["Wnt"]}}
+        if kind == "synthesis":
+            return {"primary_analysis": {"pathways": ["Wnt"]}, "validation": "ok", "confidence_score": 0.0}
+        if kind == "scientist":
+            return {"hypothesis": "initial hypothesis", "mechanisms": {"pathways": ["Wnt"]}, "evidence": []}
+        if kind == "ontologist":
+            return {"molecular_components": ["Wnt"], "cellular_processes": ["regeneration"]}
+        return {"specialist_perspective": "fine", "key_insights": [f"insight {number}"]}
+
+
+@pytest.fixture
+def scripted_llm() -> ScriptedLLM:
+    return ScriptedLLM()
+
+
+@pytest.fixture
+def orchestrator(scripted_llm):
+    """Two-round debate orchestrator on the scripted LLM with its own score cache and latency statistics"""
+    orchestrator = DebateOrchestrator(scripted_llm)
+    orchestrator.base_debate_rounds = 2
+    orchestrator.max_debate_rounds = 2
+    orchestrator.evaluation_mode = EVALUATION_MODE_SEPARATE
+    orchestrator.round_strategy = ROUND_STRATEGY_FULL
+    orchestrator.scoring_mode = SCORING_MODE_SINGLE
+    orchestrator.score_cache = ScoreCache()
+    orchestrator.latency_stats = LatencyStats()
+    return orchestrator
@@ -0,0 +1,116 @@
+"""
+Concept extraction sharing between the queries of a batch
+"""
+import threading
+
+import pytest
+
+from scidiscover.reasoning.batch_debate import ConceptCache, core_query, query_terms
+from scidiscover.reasoning.cancellation import DebateCancelled
+
+TISSUE_QUERIES = [
+    "How does IL-17 signaling drive chronic inflammation in skin?",
+    "How does IL-17 signaling drive chronic inflammation in gut?",
+    "How does IL-17 signaling drive chronic inflammation in lung?",
+]
+
+
+class RecordingExtractor:
+    """Extraction function returning one concept per content term and recording its calls"""
+    def __init__(self):
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def __call__(self, query, *args):
+        with self._lock:
+            self.calls.append(query)
+        return sorted(f"{term} concept" for term in query_terms(query))
+
+
+def test_query_family_shares_one_core_extraction():
+    extract = RecordingExtractor()
+    cache = ConceptCache(extract)
+    cache.plan(TISSUE_QUERIES)
+    results = [cache.get(query) for query in TISSUE_QUERIES]
+
+    assert extract.calls == ["How does IL-17 signaling drive chronic inflammation in"]
+    assert (cache.misses, cache.hits) == (1, 2)
+    for tissue, concepts in zip(["skin", "gut", "lung"], results):
+        assert "il-17 concept" in concepts and "inflammation concept" in concepts
+        assert concepts[-1] == tissue
+    # Specific terms of one query never leak into another's concepts
+    assert "skin" not in results[1] and "gut" not in results[0]
+
+
+def test_unrelated_queries_get_their_own_extraction():
+    extract = RecordingExtractor()
+    cache = ConceptCache(extract)
+    queries = TISSUE_QUERIES[:1] + ["Which microbiome metabolites regulate neonatal T-cell maturation?"]
+    cache.plan(queries)
+    for query in queries:
+        cache.get(query)
+    assert extract.calls == queries
+
+
+def test_rephrased_queries_share_an_extraction_without_planning():
+    extract = RecordingExtractor()
+    cache = ConceptCache(extract)
+    first = cache.get("IL-17 signaling in skin inflammation")
+    second = cache.get("skin inflammation: IL-17 signaling?")
+    assert first == second
+    assert len(extract.calls) == 1 and cache.hits == 1
+
+
+def test_core_query_removes_query_specific_words():
+    core = frozenset(query_terms(TISSUE_QUERIES[0])) - {"skin"}
+    assert core_query(TISSUE_QUERIES[0], core) == "How does IL-17 signaling drive chronic inflammation in"
+
+
+@pytest.mark.parametrize("error", [DebateCancelled("stop"), KeyboardInterrupt()])
+def test_failed_extraction_releases_waiting_queries(error):
+    started, release = threading.Event(), threading.Event()
+
+    def extract(query, *args):
+        started.set()
+        release.wait(5)
+        raise error
+
+    cache = ConceptCache(extract)
+    owner_errors, waiter_errors = [], []
+
+    def lookup(errors):
+        try:
+            cache.get(TISSUE_QUERIES[0])
+        except BaseException as e:
+            errors.append(e)
+
+    owner = threading.Thread(target=lookup, args=(owner_errors,))
+    owner.start()
+    assert started.wait(5)
+    waiter = threading.Thread(target=lookup, args=(waiter_errors,))
+    waiter.start()
+    while cache.hits == 0:  # The waiter has found the pending entry
+        threading.Event().wait(0.01)
+    release.set()
+    owner.join(5)
+    waiter.join(5)
+
+    assert not owner.is_alive() and not waiter.is_alive()
+    assert owner_errors == [error] and waiter_errors == [error]
+    assert cache.entries == {}
+
+
+def test_failed_extraction_is_retried_by_later_queries():
+    attempts = []
+
+    def extract(query, *args):
+        attempts.append(query)
+        if len(attempts) == 1:
+            raise RuntimeError("API unavailable")
+        return ["concept"]
+
+    cache = ConceptCache(extract)
+    with pytest.raises(RuntimeError):
+        cache.get(TISSUE_QUERIES[0])
+    assert cache.get(TISSUE_QUERIES[0]) == ["concept"]
+    assert len(attempts) == 2
@@ -0,0 +1,107 @@
+"""
+Cooperative cancellation: token callbacks and closing an in-flight Claude stream
+"""
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from scidiscover.reasoning.cancellation import CancellationToken, DebateCancelled
+from scidiscover.reasoning.llm_manager import LLMManager
+
+
+class FakeStream:
+    """Claude stream that sends one chunk, then waits for more until closed"""
+    def __init__(self, chunks, wait_after_chunks: bool):
+        self.chunks = chunks
+        self.wait_after_chunks = wait_after_chunks
+        self.close_calls = 0
+        self._closed = threading.Event()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def __iter__(self):
+        for text in self.chunks:
+            yield SimpleNamespace(delta=SimpleNamespace(text=text))
+        if self.wait_after_chunks:
+            if self._closed.wait(timeout=5):
+                raise RuntimeError("stream closed")
+            raise AssertionError("stream was never closed")
+
+    def close(self):
+        self.close_calls += 1
+        self._closed.set()
+
+    def get_final_message(self):
+        return SimpleNamespace(usage=SimpleNamespace(input_tokens=1, output_tokens=1))
+
+
+def llm_with_stream(stream: FakeStream) -> LLMManager:
+    llm = LLMManager()
+    llm.anthropic_client = SimpleNamespace(
+        beta=SimpleNamespace(messages=SimpleNamespace(stream=lambda **params: stream))
+    )
+    return llm
+
+
+def test_cancel_runs_callbacks_once():
+    token = CancellationToken()
+    calls = []
+    token.register(lambda: calls.append("first"))
+    token.register(lambda: 1 / 0)  # A failing callback does not stop the others
+    token.register(lambda: calls.append("third"))
+    token.cancel("stop")
+    token.cancel("again")
+
+    assert calls == ["first", "third"]
+    assert token.cancelled and token.reason == "stop"
+    with pytest.raises(DebateCancelled, match="stop"):
+        token.raise_if_cancelled()
+
+
+def test_unregistered_callbacks_do_not_run_and_late_ones_run_at_once():
+    token = CancellationToken()
+    calls = []
+    handle = token.register(lambda: calls.append("unregistered"))
+    token.unregister(handle)
+    token.cancel()
+    assert calls == []
+    assert token.register(lambda: calls.append("late")) is None
+    assert calls == ["late"]
+
+
+def test_cancel_closes_the_active_stream():
+    stream = FakeStream(['{"hypothesis": '], wait_after_chunks=True)
+    llm = llm_with_stream(stream)
+    token = CancellationToken()
+    threading.Timer(0.05, token.cancel, args=("Stopped from the UI",)).start()
+
+    start = time.monotonic()
+    with pytest.raises(DebateCancelled, match="Stopped from the UI"):
+        llm.generate_response("prompt", "anthropic", "json", cancel_token=token)
+    assert time.monotonic() - start < 2
+    assert stream.close_calls == 1
+
+
+def test_finished_stream_is_not_closed_by_a_later_cancel():
+    stream = FakeStream(['{"hypothesis": "Wnt"}'], wait_after_chunks=False)
+    llm = llm_with_stream(stream)
+    token = CancellationToken()
+
+    assert llm.generate_response("prompt", "anthropic", "json", cancel_token=token) == {"hypothesis": "Wnt"}
+    token.cancel()
+    assert stream.close_calls == 0
+
+
+def test_cancelled_token_stops_before_any_request():
+    stream = FakeStream([], wait_after_chunks=False)
+    llm = llm_with_stream(stream)
+    token = CancellationToken()
+    token.cancel()
+    with pytest.raises(DebateCancelled):
+        llm.generate_response("prompt", "anthropic", "json", cancel_token=token)
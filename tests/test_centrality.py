@@ -0,0 +1,80 @@
+"""
+CentralityService against NetworkX betweenness centrality
+"""
+import networkx as nx
+import pytest
+
+from scidiscover.knowledge.kg_coi import CentralityService, KGCOIManager, pivots_for_error
+
+from conftest import make_concept_graph
+
+
+def test_exact_betweenness_matches_networkx(concept_graph):
+    service = CentralityService(exact_threshold=concept_graph.number_of_nodes())
+    scores = service.betweenness(concept_graph, (0,))
+    expected = nx.betweenness_centrality(concept_graph)
+    assert scores.keys() == expected.keys()
+    for node, value in expected.items():
+        assert scores[node] == pytest.approx(value, abs=1e-9)
+
+
+def test_exact_betweenness_matches_networkx_directed(concept_digraph):
+    service = CentralityService(exact_threshold=concept_digraph.number_of_nodes())
+    scores = service.betweenness(concept_digraph, (0,))
+    expected = nx.betweenness_centrality(concept_digraph)
+    for node, value in expected.items():
+        assert scores[node] == pytest.approx(value, abs=1e-9)
+
+
+def test_incremental_update_matches_full_recomputation(concept_graph):
+    service = CentralityService(exact_threshold=concept_graph.number_of_nodes() + 10)
+    service.betweenness(concept_graph, (0,))
+
+    concept_graph.add_edge("concept_0", "new_concept", weight=1.0)
+    concept_graph.add_edge("concept_5", "concept_20", weight=1.0)
+    service.apply_update(concept_graph, (0,), (1,), ["new_concept"],
+                         [("concept_0", "new_concept"), ("concept_5", "concept_20")])
+    scores = service.betweenness(concept_graph, (1,))
+
+    expected = nx.betweenness_centrality(concept_graph)
+    for node, value in expected.items():
+        assert scores[node] == pytest.approx(value, abs=1e-9)
+
+
+def test_sampled_betweenness_is_close_to_exact(concept_graph):
+    service = CentralityService(pivots=30, exact_threshold=0)
+    scores = service.betweenness(concept_graph, (0,))
+    expected = nx.betweenness_centrality(concept_graph)
+    error = max(abs(scores[node] - value) for node, value in expected.items())
+    assert error < 0.1
+
+
+def test_pivots_for_error_trades_accuracy_for_speed():
+    assert pivots_for_error(10000, 0.05) < pivots_for_error(10000, 0.01) <= 10000
+    assert pivots_for_error(50, 0.001) == 50
+    assert pivots_for_error(0, 0.05) == 0
+
+
+def test_manager_updates_cached_centrality_when_concepts_are_added():
+    source = make_concept_graph(num_nodes=30)
+    manager = KGCOIManager()
+    manager.build_concept_graph(list(source.nodes()), [
+        {"source": u, "target": v, "type": data["relationship"]} for u, v, data in source.edges(data=True)
+    ])
+    manager.centrality.betweenness(manager.graph, manager._graph_key())
+    assert manager.centrality.stats["full_builds"] == 1
+    recomputations = manager.centrality.stats["pivot_recomputations"]
+
+    manager.build_concept_graph(["new_concept"], [
+        {"source": "concept_0", "target": "new_concept", "type": "binds"},
+        {"source": "concept_3", "target": "concept_17", "type": "binds"}
+    ])
+    scores = manager.centrality.betweenness(manager.graph, manager._graph_key())
+
+    stats = manager.centrality.stats
+    assert (stats["full_builds"], stats["incremental_updates"]) == (1, 1)
+    # Only the new node and the pivots whose shortest-path DAG the new edge changes are recomputed
+    assert stats["pivot_recomputations"] - recomputations < source.number_of_nodes()
+    expected = nx.betweenness_centrality(manager.graph)
+    for node, value in expected.items():
+        assert scores[node] == pytest.approx(value, abs=1e-9)
@@ -0,0 +1,93 @@
+"""
+Debate event bus: fan-out, backpressure policies and closing subscriptions
+"""
+import threading
+import time
+
+from scidiscover.reasoning.debate_events import (
+    POLICY_BLOCK, POLICY_DROP_OLDEST, DebateEvent, DebateEventBus, EVENT_SCORE
+)
+
+
+def event(number: int) -> DebateEvent:
+    return DebateEvent(type=EVENT_SCORE, debate_id="d1", data={"number": number})
+
+
+def numbers(subscription) -> list:
+    received = []
+    while True:
+        item = subscription.get(timeout=0)
+        if item is None:
+            return received
+        received.append(item.data["number"])
+
+
+def test_every_subscriber_receives_every_event():
+    bus = DebateEventBus()
+    first, second = bus.subscribe(), bus.subscribe()
+    for number in range(3):
+        bus.publish(event(number))
+    assert numbers(first) == numbers(second) == [0, 1, 2]
+
+
+def test_drop_oldest_keeps_the_newest_events_without_blocking():
+    bus = DebateEventBus()
+    subscription = bus.subscribe(max_queue=3, policy=POLICY_DROP_OLDEST)
+    start = time.monotonic()
+    for number in range(5):
+        bus.publish(event(number))
+    assert time.monotonic() - start < 0.5
+    assert subscription.dropped == 2
+    assert numbers(subscription) == [2, 3, 4]
+
+
+def test_block_waits_for_the_consumer_then_drops_the_new_event():
+    bus = DebateEventBus()
+    subscription = bus.subscribe(max_queue=1, policy=POLICY_BLOCK, block_timeout=0.05)
+    bus.publish(event(0))
+    start = time.monotonic()
+    bus.publish(event(1))
+    assert time.monotonic() - start >= 0.05
+    assert subscription.dropped == 1
+    assert numbers(subscription) == [0]
+
+
+def test_block_loses_nothing_when_the_consumer_keeps_up():
+    bus = DebateEventBus()
+    subscription = bus.subscribe(max_queue=1, policy=POLICY_BLOCK, block_timeout=5.0)
+    received = []
+    consumer = threading.Thread(target=lambda: received.extend(e.data["number"] for e in subscription))
+    consumer.start()
+    for number in range(20):
+        bus.publish(event(number))
+    subscription.close()
+    consumer.join(timeout=5)
+    assert not consumer.is_alive()
+    assert subscription.dropped == 0
+    assert received == list(range(20))
+
+
+def test_a_slow_subscriber_does_not_hold_back_the_others():
+    bus = DebateEventBus()
+    slow = bus.subscribe(max_queue=2)
+    fast = bus.subscribe(max_queue=100)
+    for number in range(10):
+        bus.publish(event(number))
+    assert numbers(fast) == list(range(10))
+    assert numbers(slow) == [8, 9]
+    assert slow.dropped == 8
+
+
+def test_close_wakes_a_waiting_consumer_and_unsubscribes():
+    bus = DebateEventBus()
+    subscription = bus.subscribe()
+    result = []
+    consumer = threading.Thread(target=lambda: result.append(subscription.get()))
+    consumer.start()
+    time.sleep(0.05)
+    subscription.close()
+    consumer.join(timeout=5)
+    assert result == [None]
+    assert not bus.has_subscribers()
+    bus.publish(event(0))
+    assert subscription.get(timeout=0) is None
@@ -0,0 +1,78 @@
+"""
+Bounded-context debate memory: compaction stages and the out-of-band history
+"""
+from scidiscover.reasoning.debate_memory import DebateMemory
+
+
+def long_item(topic: str) -> str:
+    return f"{topic} is supported by regeneration studies. " + "Further detail on the assay and the cohort. " * 8
+
+
+def two_round_memory(token_budget: int):
+    """Memory whose round 1 introduced the old pathways and round 2 the new one"""
+    memory = DebateMemory(token_budget=token_budget)
+    memory.start_round(1)
+    old = [long_item(f"Old pathway {i}") for i in range(6)]
+    memory.observe({"pathways": old})
+    memory.start_round(2)
+    new = long_item("New pathway")
+    return memory, {"hypothesis": "Wnt drives fin regrowth", "pathways": old + [new]}, new
+
+
+def test_payload_within_budget_is_returned_as_a_copy():
+    memory, payload, _ = two_round_memory(token_budget=100000)
+    compacted = memory.compact(payload)
+    assert compacted == payload
+    assert compacted is not payload
+    assert compacted["pathways"] is not payload["pathways"]
+
+
+def test_older_items_are_summarised_first_and_deltas_kept():
+    memory, payload, new = two_round_memory(token_budget=100000)
+    summarised = dict(payload, pathways=[memory._summarise(item) for item in payload["pathways"][:-1]] + [new])
+    memory.token_budget = memory.estimate_tokens(summarised)
+
+    compacted = memory.compact(payload)
+    assert compacted == summarised
+    assert compacted["pathways"][0] == "Old pathway 0 is supported by regeneration studies ..."
+    assert compacted["pathways"][-1] == new
+
+
+def test_older_items_are_dropped_when_summaries_do_not_fit():
+    memory, payload, new = two_round_memory(token_budget=100000)
+    memory.token_budget = memory.estimate_tokens({"hypothesis": payload["hypothesis"], "pathways": [new]}) + 40
+
+    compacted = memory.compact(payload)
+    assert memory.estimate_tokens(compacted) <= memory.token_budget
+    assert new in compacted["pathways"]
+    assert "earlier item(s) omitted" in compacted["pathways"][-1]
+    assert len(compacted["pathways"]) < len(payload["pathways"])
+
+
+def test_latest_deltas_are_truncated_only_as_a_last_resort():
+    memory, payload, new = two_round_memory(token_budget=100000)
+    payload["hypothesis"] = "Wnt drives fin regrowth. " * 200
+    memory.token_budget = 300
+
+    compacted = memory.compact(payload)
+    assert memory.estimate_tokens(compacted) <= memory.token_budget
+    assert compacted["hypothesis"].endswith(" ...")
+    assert len(compacted["hypothesis"]) < len(payload["hypothesis"])
+
+
+def test_parts_split_the_budget_between_embedded_structures():
+    memory, payload, _ = two_round_memory(token_budget=100000)
+    memory.token_budget = memory.estimate_tokens(payload) + 10
+    assert memory.compact(payload) == payload
+    assert memory.estimate_tokens(memory.compact(payload, parts=2)) <= memory.token_budget // 2
+
+
+def test_full_history_keeps_uncompacted_entries():
+    memory, payload, _ = two_round_memory(token_budget=50)
+    memory.archive("ScientistAgent", "rebuttal", payload)
+    memory.compact(payload)
+
+    history = memory.get_full_history()
+    assert len(history) == 1
+    assert history[0]["round"] == 2
+    assert history[0]["content"] == payload
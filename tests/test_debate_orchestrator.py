@@ -0,0 +1,201 @@
+"""
+Debate orchestration on a scripted LLM: scoring paths, caching and cancellation
+"""
+import pytest
+
+from scidiscover.reasoning.cancellation import CancellationToken
+from scidiscover.reasoning.debate_events import (
+    EVENT_DEBATE_CANCELLED, EVENT_DEBATE_FINISHED, EVENT_DEBATE_STARTED, EVENT_SCORE, EVENT_STEP_FINISHED,
+    EVENT_STEP_STARTED
+)
+from scidiscover.reasoning.debate_orchestrator import (
+    DebateOrchestrator, EVALUATION_MODE_CRITIC, ROUND_STRATEGY_COMPACT, SCORING_MODE_SAMPLED
+)
+
+from conftest import ScriptedLLM
+
+QUERY = "Why do zebrafish regrow fins?"
+CONCEPTS = ["fin", "regeneration"]
+
+
+def run(orchestrator, **kwargs):
+    return orchestrator.orchestrate_debate(QUERY, CONCEPTS, **kwargs)
+
+
+def rerun(orchestrator, llm):
+    """Run the same debate again on another LLM, sharing the first orchestrator's settings and score cache"""
+    other = DebateOrchestrator(llm)
+    for name in ("base_debate_rounds", "max_debate_rounds", "evaluation_mode", "round_strategy",
+                 "scoring_mode", "score_cache", "latency_stats"):
+        setattr(other, name, getattr(orchestrator, name))
+    return run(other)
+
+
+def test_separate_evaluation_scores_every_hypothesis(orchestrator, scripted_llm):
+    scripted_llm.evaluation_scores = ["0.4", "0.9", "0.7"]
+    run(orchestrator)
+    assert scripted_llm.calls.count("evaluate") == 3
+    assert orchestrator.best_score == 0.9
+    assert orchestrator.best_hypothesis["hypothesis"] == "merged hypothesis 0"
+
+
+def test_critic_mode_scores_every_hypothesis_by_critiques(orchestrator, scripted_llm):
+    orchestrator.evaluation_mode = EVALUATION_MODE_CRITIC
+    scripted_llm.critic_scores = [0.3, 0.5, 0.8]  # Initial, round 1 and (final critique) round 2 hypotheses
+    analysis = run(orchestrator)
+
+    assert "evaluate" not in scripted_llm.calls
+    assert scripted_llm.calls.count("critic") == 3
+    assert scripted_llm.calls[-2:] == ["critic", "synthesis"]
+    assert orchestrator.best_score == 0.8
+    assert orchestrator.best_hypothesis["hypothesis"] == "merged hypothesis 1"
+    assert analysis["performance"]["counters"]["fused_evaluations"] == 3
+
+
+def test_critic_mode_asks_a_new_critique_when_the_score_is_missing(orchestrator, scripted_llm):
+    orchestrator.evaluation_mode = EVALUATION_MODE_CRITIC
+    scripted_llm.critic_scores = [None, 0.4, 0.9, 0.2, 0.1]
+    run(orchestrator)
+
+    assert "evaluate" not in scripted_llm.calls
+    assert scripted_llm.calls.count("critic") == 4
+    # The retried critique (0.4) scored the initial hypothesis; 0.9 scored round 1's
+    assert orchestrator.best_score == 0.9
+    assert orchestrator.best_hypothesis["hypothesis"] == "merged hypothesis 0"
+
+
+def test_critic_mode_never_mixes_in_evaluator_scores(orchestrator, scripted_llm):
+    orchestrator.evaluation_mode = EVALUATION_MODE_CRITIC
+    scripted_llm.critic_scores = ["not a score"]
+    scripted_llm.evaluation_scores = ["0.99"]
+    run(orchestrator)
+
+    assert "evaluate" not in scripted_llm.calls
+    assert orchestrator.best_estimate is None
+    assert orchestrator.best_hypothesis["hypothesis"] == "initial hypothesis"
+
+
+def test_compact_strategy_runs_each_round_as_one_call(orchestrator, scripted_llm):
+    orchestrator.round_strategy = ROUND_STRATEGY_COMPACT
+    scripted_llm.evaluation_scores = ["0.4", "0.6", "0.8"]
+    run(orchestrator)
+
+    assert scripted_llm.calls.count("compact_round") == 2
+    for kind in ("critic", "expander", "rebuttal", "merge"):
+        assert kind not in scripted_llm.calls
+    assert scripted_llm.calls.count("evaluate") == 3
+    assert orchestrator.best_hypothesis["hypothesis"] == "compact hypothesis 1"
+
+
+def test_compact_critique_scores_the_previous_hypothesis_in_critic_mode(orchestrator, scripted_llm):
+    orchestrator.round_strategy = ROUND_STRATEGY_COMPACT
+    orchestrator.evaluation_mode = EVALUATION_MODE_CRITIC
+    scripted_llm.critic_scores = [0.3, 0.9, 0.5]  # Initial and round 1 hypotheses, then the final critique
+    analysis = run(orchestrator)
+
+    assert "evaluate" not in scripted_llm.calls
+    assert scripted_llm.calls.count("compact_round") == 2
+    assert scripted_llm.calls.count("critic") == 1
+    assert orchestrator.best_score == 0.9
+    assert orchestrator.best_hypothesis["hypothesis"] == "compact hypothesis 0"
+    assert analysis["performance"]["counters"]["fused_evaluations"] == 3
+
+
+def test_unusable_compact_round_falls_back_to_separate_agent_calls(orchestrator, scripted_llm):
+    orchestrator.round_strategy = ROUND_STRATEGY_COMPACT
+    scripted_llm.compact_responses = [{"critique": "not a section"}, None]
+    run(orchestrator)
+
+    assert scripted_llm.calls.count("compact_round") == 2
+    assert scripted_llm.calls.count("critic") == 1
+    assert scripted_llm.calls.count("expander") == 1
+    assert scripted_llm.calls.count("rebuttal") == 1
+    # Round 1 fell back to separate calls, round 2 ran compact again
+    first_fallback = scripted_llm.calls.index("critic")
+    assert scripted_llm.calls[first_fallback - 1] == "compact_round"
+    assert scripted_llm.calls.index("compact_round", first_fallback) > first_fallback
+
+
+def test_self_consistency_scores_carry_a_confidence_interval(orchestrator, scripted_llm):
+    orchestrator.scoring_mode = SCORING_MODE_SAMPLED
+    orchestrator.score_samples = 3
+    scripted_llm.score_samples = [[0.4, 0.5, 0.6], [0.7, 0.8, 0.9], [0.5, 0.5, 0.6]]
+    analysis = run(orchestrator)
+
+    assert "evaluate" not in scripted_llm.calls
+    assert orchestrator.best_hypothesis["hypothesis"] == "merged hypothesis 0"
+    assert orchestrator.best_estimate.mean == pytest.approx(0.8)
+    assert orchestrator.best_estimate.lower < 0.8 < orchestrator.best_estimate.upper
+    assert analysis["score_estimate"]["n"] == 3
+
+
+def test_single_score_fallback_is_not_preferred_for_its_missing_variance(orchestrator, scripted_llm):
+    orchestrator.scoring_mode = SCORING_MODE_SAMPLED
+    orchestrator.score_samples = 5
+    # No valid samples for the initial hypothesis: it falls back to one evaluation of 0.75
+    scripted_llm.score_samples = [[], [0.6, 0.62, 0.64, 0.62, 0.62]]
+    scripted_llm.evaluation_scores = ["0.75"]
+    run(orchestrator)
+
+    assert scripted_llm.calls.count("evaluate") == 1
+    # The fallback's interval is that of a single sample, so the tight 0.62 estimate has the higher lower bound
+    assert orchestrator.best_hypothesis["hypothesis"] == "merged hypothesis 0"
+    assert orchestrator.best_estimate.n == 5
+
+
+def test_identical_hypotheses_reuse_cached_scores(orchestrator, scripted_llm):
+    run(orchestrator)
+    llm = ScriptedLLM()
+    analysis = rerun(orchestrator, llm)
+
+    # The scripted debate repeats itself, so every hypothesis was scored by the first run
+    assert "evaluate" not in llm.calls
+    assert analysis["performance"]["counters"]["score_cache_hits"] == 3
+
+
+@pytest.mark.parametrize("change", ["thinking_mode", "model"])
+def test_scores_are_not_reused_across_scorer_settings(orchestrator, scripted_llm, change):
+    run(orchestrator)
+    llm = ScriptedLLM()
+    if change == "thinking_mode":
+        llm.set_thinking_mode("low")
+    else:
+        llm.anthropic_model = "other-model"
+    analysis = rerun(orchestrator, llm)
+
+    assert llm.calls.count("evaluate") == 3
+    assert "score_cache_hits" not in analysis["performance"]["counters"]
+
+
+def test_debate_publishes_its_progress_as_events(orchestrator, scripted_llm):
+    subscription = orchestrator.events.subscribe(max_queue=1000)
+    run(orchestrator)
+    subscription.close()
+    events = list(subscription)
+
+    types = [event.type for event in events]
+    assert types[0] == EVENT_DEBATE_STARTED
+    assert types[-1] == EVENT_DEBATE_FINISHED
+    assert types.count(EVENT_SCORE) == 3
+    assert types.count(EVENT_STEP_STARTED) == types.count(EVENT_STEP_FINISHED) == len(scripted_llm.calls)
+    assert len({event.debate_id for event in events}) == 1
+    assert subscription.dropped == 0
+
+
+def test_cancelled_debate_returns_the_best_hypothesis_so_far(orchestrator, scripted_llm):
+    token = CancellationToken()
+    scripted_llm.on_call = lambda kind: token.cancel("Stopped from the UI") if kind == "expander" else None
+    scripted_llm.set_thinking_mode("low")
+    subscription = orchestrator.events.subscribe(max_queue=1000)
+    analysis = run(orchestrator, cancel_token=token)
+    subscription.close()
+
+    assert analysis["cancelled"] is True
+    assert analysis["primary_analysis"]["mechanisms"] == "initial hypothesis"
+    assert analysis["confidence_score"] == 0.5
+    assert "performance" in analysis
+    assert scripted_llm.calls[-1] == "expander"
+    assert "synthesis" not in scripted_llm.calls
+    assert [event.type for event in subscription][-1] == EVENT_DEBATE_CANCELLED
+    assert scripted_llm.thinking_mode == "low"
+    assert orchestrator.cancel_token is None
@@ -0,0 +1,103 @@
+"""
+Per-debate performance report of the profiler
+"""
+import pytest
+
+from scidiscover.reasoning import debate_profiler
+from scidiscover.reasoning.debate_profiler import DebateProfiler
+from scidiscover.reasoning.debate_scheduler import (
+    ROLE_CRITIC, ROLE_EVALUATE, ROLE_SCIENTIST, ROLE_SPECIALIST, ROLE_SYNTHESIS
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(debate_profiler, "time", clock)
+    return clock
+
+
+def run_step(profiler, clock, role, round_num, seconds, calls=(), label=None):
+    """Profile one step lasting seconds, with the given (input, output) token calls"""
+    span = profiler.begin_step(role, round_num, "high", label)
+    for input_tokens, output_tokens in calls:
+        profiler.record_call({"ttft": 1.0, "input_tokens": input_tokens, "output_tokens": output_tokens})
+    clock.now += seconds
+    profiler.end_step(span)
+
+
+@pytest.fixture
+def report(clock):
+    profiler = DebateProfiler()
+    profiler.start()
+    run_step(profiler, clock, ROLE_SCIENTIST, 0, 9, [(100, 50)])
+    run_step(profiler, clock, ROLE_EVALUATE, 0, 2, [(40, 5)])
+    run_step(profiler, clock, ROLE_CRITIC, 1, 8, [(120, 60)])
+    run_step(profiler, clock, ROLE_SPECIALIST, 1, 4, [(80, 30)], label="methodology")
+    run_step(profiler, clock, ROLE_SPECIALIST, 1, 6, [(80, 40)], label="domain")
+    run_step(profiler, clock, ROLE_EVALUATE, 1, 2, [(40, 5)])
+    run_step(profiler, clock, ROLE_EVALUATE, 1, 3, [(40, 5), (40, 6)])  # Fallback evaluation
+    run_step(profiler, clock, ROLE_CRITIC, 2, 5, [(120, 60)])
+    run_step(profiler, clock, ROLE_SYNTHESIS, None, 12, [(200, 300)])
+    clock.now += 1  # Local work after the last step
+    profiler.count("score_cache_hits", 2)
+    return profiler.report()
+
+
+def test_report_totals(report):
+    assert report["total_seconds"] == pytest.approx(52)
+    assert report["llm_seconds"] == pytest.approx(51)
+    assert report["calls"] == 10
+    assert report["input_tokens"] == 860
+    assert report["output_tokens"] == 561
+    assert report["counters"] == {"score_cache_hits": 2}
+
+
+def test_report_groups_by_role_and_round(report):
+    by_role, by_round = report["by_role"], report["by_round"]
+    assert by_role[ROLE_EVALUATE]["steps"] == 3
+    assert by_role[ROLE_EVALUATE]["calls"] == 4
+    assert by_role[ROLE_EVALUATE]["seconds"] == pytest.approx(7)
+    assert by_role[ROLE_CRITIC]["mean_ttft"] == pytest.approx(1.0)
+    assert sum(group["share"] for group in by_role.values()) == pytest.approx(1.0)
+
+    assert set(by_round) == {0, 1, 2, "synthesis"}
+    assert by_round[1]["seconds"] == pytest.approx(23)
+    assert sum(group["steps"] for group in by_round.values()) == 9
+
+
+def test_timeline_names_are_unique_per_round_and_stage(report):
+    names = [step["name"] for step in report["timeline"]]
+    assert names == [
+        "r0 scientist", "r0 evaluate", "r1 critic", "r1 methodology", "r1 domain",
+        "r1 evaluate", "r1 evaluate #2", "r2 critic", "final synthesis"
+    ]
+    assert [step["start"] for step in report["timeline"]][:3] == [0, 9, 11]
+
+
+def test_overlap_opportunities_and_critical_path(report):
+    overlaps = report["overlap_opportunities"]
+    specialists = [o for o in overlaps if o["steps"] == ["methodology", "domain"]]
+    assert specialists and specialists[0]["saved_seconds"] == pytest.approx(4)
+    evaluations = [(o["round"], o["saved_seconds"]) for o in overlaps if o["steps"] == ["evaluate", "critic"]]
+    assert evaluations == [(1, pytest.approx(2)), (2, pytest.approx(3))]
+
+    critical_path = report["critical_path"]
+    assert critical_path["overlapped_seconds"] == pytest.approx(51 - 4 - 2 - 3)
+    assert critical_path["dominant_roles"] == [ROLE_CRITIC, ROLE_SYNTHESIS, ROLE_SPECIALIST]
+
+
+def test_calls_outside_steps_are_not_attributed(clock):
+    profiler = DebateProfiler()
+    profiler.start()
+    profiler.record_call({"input_tokens": 10, "output_tokens": 10})
+    report = profiler.report()
+    assert report["calls"] == 0 and report["timeline"] == []
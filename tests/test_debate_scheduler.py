@@ -0,0 +1,123 @@
+"""
+Deadline planning of debate rounds, including the time kept for fallback calls
+"""
+import pytest
+
+from scidiscover.reasoning.debate_scheduler import (
+    DebateScheduler, LatencyStats, ROLE_CRITIC, ROLE_EVALUATE, ROLE_EXPANDER, ROLE_REBUTTAL,
+    ROLE_SYNTHESIS, THINKING_MODES
+)
+
+SPECIALISTS = ["methodology", "domain"]
+SLACK = 5.0  # Seconds of slack so that the time spent by the test itself never changes a plan
+
+
+def probe(**kwargs) -> DebateScheduler:
+    """Scheduler used only for its (time-independent) estimates"""
+    return DebateScheduler(1e6, "high", LatencyStats(), **kwargs)
+
+
+def scheduler_for(seconds: float, **kwargs) -> DebateScheduler:
+    return DebateScheduler(seconds, "high", LatencyStats(), **kwargs)
+
+
+def test_latency_estimates_blend_observations_with_priors():
+    stats = LatencyStats()
+    prior = stats.estimate(ROLE_CRITIC, "high")
+    assert prior == LatencyStats.PRIOR_SECONDS["high"]
+
+    stats.record(ROLE_CRITIC, "high", 50.0)
+    assert stats.estimate(ROLE_CRITIC, "high") == pytest.approx((50.0 + prior) / 2)
+
+    stats.record(ROLE_CRITIC, "high", 70.0)
+    assert stats.estimate(ROLE_CRITIC, "high") == pytest.approx(60.0 + 14.142135623730951)
+
+
+def test_ample_time_plans_full_quality_rounds():
+    scheduler = scheduler_for(1e6)
+    assert scheduler.plan_initial() == "high"
+    assert scheduler.plan_round(SPECIALISTS) == {
+        "specialists": SPECIALISTS, "thinking_mode": "high", "local_merge": False
+    }
+    assert scheduler.plan_rounds(3, SPECIALISTS) == 3
+    assert scheduler.plan_synthesis() == "high"
+
+
+def test_tight_deadline_drops_specialists_first():
+    estimates = probe()
+    budget = estimates.synthesis_reserve() + estimates.estimate_round(1, "high") + estimates.fallback_reserve("high")
+    plan = scheduler_for(budget + SLACK).plan_round(SPECIALISTS)
+    assert plan == {"specialists": SPECIALISTS[:1], "thinking_mode": "high", "local_merge": False}
+
+
+def test_tighter_deadline_lowers_thinking_then_merges_locally():
+    estimates = probe()
+    budget = estimates.synthesis_reserve() + estimates.estimate_round(0, "low") + estimates.fallback_reserve("low")
+    assert scheduler_for(budget + SLACK).plan_round(SPECIALISTS)["thinking_mode"] == "low"
+
+    budget = estimates.synthesis_reserve() + estimates.estimate_round(0, "none", local_merge=True)
+    plan = scheduler_for(budget + SLACK).plan_round(SPECIALISTS)
+    assert plan == {"specialists": [], "thinking_mode": "none", "local_merge": True}
+
+
+def test_no_round_when_only_the_synthesis_fits():
+    estimates = probe()
+    scheduler = scheduler_for(estimates.synthesis_reserve() + SLACK)
+    assert scheduler.plan_round(SPECIALISTS) is None
+    assert scheduler.plan_rounds(3, SPECIALISTS) == 1  # Callers always get at least one round
+    assert scheduler.plan_synthesis() == "none"
+
+
+def test_synthesis_gets_the_richest_mode_that_fits():
+    estimates = probe()
+    scheduler = scheduler_for(estimates.estimate(ROLE_SYNTHESIS, "low") + SLACK)
+    assert scheduler.plan_synthesis() == "low"
+
+
+def test_compact_rounds_reserve_a_minimal_full_round_as_fallback():
+    estimates = probe(compact_modes=THINKING_MODES)
+    fallback = (estimates.estimate(ROLE_CRITIC, "high") + estimates.estimate(ROLE_EXPANDER, "high")
+                + estimates.estimate(ROLE_REBUTTAL, "high"))
+    assert estimates.fallback_reserve("high") == pytest.approx(fallback)
+    assert probe().fallback_reserve("high") == 0.0
+
+    # A compact round fits, but not the separate calls that replace it when its response is unusable
+    budget = estimates.synthesis_reserve() + estimates.estimate_round(2, "high")
+    plan = scheduler_for(budget + SLACK, compact_modes=THINKING_MODES).plan_round(SPECIALISTS)
+    assert plan is None or plan["thinking_mode"] != "high"
+
+
+@pytest.mark.parametrize("options, role", [
+    ({"fused_evaluation": True}, ROLE_CRITIC),  # New critique when the confidence score is missing
+    ({"scoring_fallback": True}, ROLE_EVALUATE),  # Single-score evaluation when sampling fails
+])
+def test_scoring_fallbacks_are_reserved(options, role):
+    estimates = probe(**options)
+    assert estimates.fallback_reserve("low") == pytest.approx(estimates.estimate(role, "low"))
+
+    budget = estimates.synthesis_reserve() + estimates.estimate_round(2, "high")
+    plan = scheduler_for(budget + SLACK, **options).plan_round(SPECIALISTS)
+    assert plan != {"specialists": SPECIALISTS, "thinking_mode": "high", "local_merge": False}
+
+
+def test_fused_evaluation_replaces_evaluations_by_a_final_critique():
+    separate, fused = probe(), probe(fused_evaluation=True)
+    evaluate = separate.estimate(ROLE_EVALUATE, "high")
+    assert fused.estimate_round(2) == pytest.approx(separate.estimate_round(2) - evaluate)
+    assert fused.synthesis_reserve() == pytest.approx(
+        separate.synthesis_reserve() + separate.estimate(ROLE_CRITIC, "none")
+    )
+
+
+def test_initial_plan_reserves_the_scoring_fallback():
+    estimates = probe(scoring_fallback=True)
+    budget = (estimates.synthesis_reserve() + estimates.estimate("scientist", "high")
+              + estimates.estimate(ROLE_EVALUATE, "high"))
+    assert scheduler_for(budget + SLACK).plan_initial() == "high"
+    assert scheduler_for(budget + SLACK, scoring_fallback=True).plan_initial() == "low"
+
+
+def test_final_evaluation_leaves_time_for_the_synthesis():
+    estimates = probe(fused_evaluation=True)
+    budget = estimates.estimate(ROLE_SYNTHESIS, "none") + estimates.estimate(ROLE_CRITIC, "low")
+    assert scheduler_for(budget + SLACK, fused_evaluation=True).plan_final_evaluation() == "low"
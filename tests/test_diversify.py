@@ -0,0 +1,63 @@
+"""
+Path diversification against the original selection loop
+"""
+import random
+
+import pytest
+
+from scidiscover.knowledge.kg_coi import KGCOIManager
+
+
+def reference_diversify(paths, num_paths):
+    """Original greedy selection: shortest path first, then the highest average Jaccard distance"""
+    if not paths:
+        return []
+    if len(paths) <= num_paths:
+        return paths
+    paths = sorted(paths, key=len)
+    selected = [paths[0]]
+    remaining = paths[1:]
+    while len(selected) < num_paths and remaining:
+        max_diversity = -1
+        max_index = 0
+        for i, path in enumerate(remaining):
+            diversity = 0
+            for selected_path in selected:
+                intersection = len(set(path) & set(selected_path))
+                union = len(set(path) | set(selected_path))
+                diversity += 1 - (intersection / union)
+            diversity /= len(selected)
+            if diversity > max_diversity:
+                max_diversity = diversity
+                max_index = i
+        selected.append(remaining.pop(max_index))
+    return selected
+
+
+def random_paths(rng, count, num_concepts):
+    return [
+        [f"concept_{rng.randrange(num_concepts)}" for _ in range(rng.randint(2, 8))]
+        for _ in range(count)
+    ]
+
+
+@pytest.mark.parametrize("seed", range(5))
+@pytest.mark.parametrize("num_paths", [1, 3, 10])
+def test_diversify_matches_reference(seed, num_paths):
+    rng = random.Random(seed)
+    paths = random_paths(rng, 60, 15)
+    manager = KGCOIManager()
+    assert manager._diversify_paths(list(paths), num_paths) == reference_diversify(list(paths), num_paths)
+
+
+def test_diversify_keeps_duplicate_paths_in_reference_order():
+    paths = [["a", "b", "c"], ["a", "b", "c"], ["a", "d", "c"], ["x", "y"], ["x", "y"]]
+    manager = KGCOIManager()
+    assert manager._diversify_paths(list(paths), 3) == reference_diversify(list(paths), 3)
+
+
+def test_diversify_small_inputs():
+    manager = KGCOIManager()
+    assert manager._diversify_paths([], 3) == []
+    paths = [["a", "b"], ["a", "c", "b"]]
+    assert manager._diversify_paths(list(paths), 5) == paths
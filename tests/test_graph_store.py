@@ -0,0 +1,72 @@
+"""
+Binary graph files against GraphML round-trips
+"""
+import networkx as nx
+import pytest
+
+from scidiscover.knowledge.compact_graph import CompactGraph
+from scidiscover.knowledge.graph_store import (
+    is_binary_graph_file, load_compact, read_graph_file, read_xml_graph, save_compact,
+    write_graph_file, write_xml_graph
+)
+
+
+def assert_same_graph(graph, expected):
+    assert graph.is_directed() == expected.is_directed()
+    assert sorted(graph.nodes()) == sorted(expected.nodes())
+    for node, data in expected.nodes(data=True):
+        assert dict(graph.nodes[node]) == data
+    assert graph.number_of_edges() == expected.number_of_edges()
+    for u, v, data in expected.edges(data=True):
+        stored = dict(graph[u][v])
+        assert stored.keys() == data.keys()
+        assert stored["weight"] == pytest.approx(data["weight"])
+        assert stored["relationship"] == data["relationship"]
+        assert list(stored["evidence"]) == data["evidence"]
+
+
+@pytest.mark.parametrize("graph_fixture", ["concept_graph", "concept_digraph"])
+def test_binary_round_trip(request, tmp_path, graph_fixture):
+    graph = request.getfixturevalue(graph_fixture)
+    path = str(tmp_path / "graph.kgb")
+    save_compact(CompactGraph.from_networkx(graph), path)
+    assert is_binary_graph_file(path)
+    assert_same_graph(load_compact(path).view(), graph)
+
+
+@pytest.mark.parametrize("graph_fixture", ["concept_graph", "concept_digraph"])
+def test_binary_to_graphml_and_back(request, tmp_path, graph_fixture):
+    graph = request.getfixturevalue(graph_fixture)
+    binary = str(tmp_path / "graph.kgb")
+    graphml = str(tmp_path / "graph.graphml")
+    second_binary = str(tmp_path / "graph_again.kgb")
+
+    write_graph_file(graph, binary)
+    write_graph_file(read_graph_file(binary), graphml)
+    assert not is_binary_graph_file(graphml)
+    restored = read_xml_graph(graphml)
+    assert_same_graph(restored, graph)
+
+    write_graph_file(restored, second_binary)
+    assert_same_graph(read_graph_file(second_binary), graph)
+
+
+def test_graph_files_are_recognized_by_content(tmp_path, concept_graph):
+    legacy = str(tmp_path / "kg_cache.xml")
+    write_xml_graph(concept_graph, legacy)
+    assert_same_graph(read_graph_file(legacy), concept_graph)
+
+    gexf = str(tmp_path / "kg_cache.dat")
+    nx.write_gexf(nx.Graph([("a", "b")]), gexf)
+    assert sorted(read_graph_file(gexf).edges()) == [("a", "b")]
+
+    binary = str(tmp_path / "kg_cache.bin")
+    save_compact(CompactGraph.from_networkx(concept_graph), binary)
+    assert_same_graph(read_graph_file(binary), concept_graph)
+
+
+def test_only_binary_extension_is_written_as_binary(tmp_path, concept_graph):
+    path = str(tmp_path / "kg_cache.xml")
+    write_graph_file(concept_graph, path)
+    assert not is_binary_graph_file(path)
+    assert isinstance(read_graph_file(path), nx.Graph)
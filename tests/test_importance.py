@@ -0,0 +1,135 @@
+"""
+Importance scores against NetworkX PageRank and eigenvector centrality, and against the original get_concept_importance
+"""
+import networkx as nx
+import pytest
+
+from scidiscover.knowledge.importance import (
+    ImportanceEngine, IMPORTANCE_DEGREE, IMPORTANCE_EIGENVECTOR, IMPORTANCE_PAGERANK,
+    IMPORTANCE_STRENGTH, personalized_pagerank_push
+)
+from scidiscover.knowledge.kg_coi import KGCOIManager
+from scidiscover.knowledge.walk_engine import CSRGraph
+
+
+def by_node(csr, values):
+    return dict(zip(csr.nodes, values.tolist()))
+
+
+@pytest.mark.parametrize("weighted", [True, False])
+def test_pagerank_matches_networkx(concept_graph, weighted):
+    csr = CSRGraph.from_networkx(concept_graph)
+    scores = ImportanceEngine(tol=1e-10, max_iter=500).scores(csr, (0,), [IMPORTANCE_PAGERANK], weighted=weighted)
+    expected = nx.pagerank(concept_graph, alpha=0.85, weight="weight" if weighted else None, tol=1e-12, max_iter=500)
+    observed = by_node(csr, scores[IMPORTANCE_PAGERANK])
+    for node, value in expected.items():
+        assert observed[node] == pytest.approx(value, abs=1e-8)
+
+
+def test_pagerank_matches_networkx_directed(concept_digraph):
+    concept_digraph.add_edge("concept_0", "sink", weight=1.0)  # Dangling node
+    csr = CSRGraph.from_networkx(concept_digraph)
+    scores = ImportanceEngine(tol=1e-10, max_iter=500).scores(csr, (0,), [IMPORTANCE_PAGERANK], directed=True)
+    expected = nx.pagerank(concept_digraph, alpha=0.85, weight="weight", tol=1e-12, max_iter=500)
+    observed = by_node(csr, scores[IMPORTANCE_PAGERANK])
+    for node, value in expected.items():
+        assert observed[node] == pytest.approx(value, abs=1e-8)
+
+
+@pytest.mark.parametrize("weighted", [True, False])
+def test_eigenvector_matches_networkx(concept_graph, weighted):
+    csr = CSRGraph.from_networkx(concept_graph)
+    scores = ImportanceEngine(tol=1e-10).scores(csr, (0,), [IMPORTANCE_EIGENVECTOR], weighted=weighted)
+    expected = nx.eigenvector_centrality_numpy(concept_graph, weight="weight" if weighted else None)
+    observed = by_node(csr, scores[IMPORTANCE_EIGENVECTOR])
+    for node, value in expected.items():
+        assert observed[node] == pytest.approx(value, abs=1e-6)
+
+
+def test_degree_and_strength_match_networkx(concept_graph):
+    csr = CSRGraph.from_networkx(concept_graph)
+    scores = ImportanceEngine().scores(csr, (0,), [IMPORTANCE_DEGREE, IMPORTANCE_STRENGTH])
+    n = concept_graph.number_of_nodes()
+    degree = by_node(csr, scores[IMPORTANCE_DEGREE])
+    strength = by_node(csr, scores[IMPORTANCE_STRENGTH])
+    for node in concept_graph:
+        assert degree[node] == pytest.approx(concept_graph.degree(node) / n)
+        assert strength[node] == pytest.approx(concept_graph.degree(node, weight="weight") / n)
+
+
+def test_scores_are_recomputed_when_the_key_changes(concept_graph):
+    engine = ImportanceEngine(tol=1e-10, max_iter=500)
+    engine.scores(CSRGraph.from_networkx(concept_graph), (0,), [IMPORTANCE_PAGERANK])
+
+    concept_graph.add_edge("concept_0", "new_concept", weight=2.0)
+    csr = CSRGraph.from_networkx(concept_graph)
+    observed = by_node(csr, engine.scores(csr, (1,), [IMPORTANCE_PAGERANK])[IMPORTANCE_PAGERANK])
+    expected = nx.pagerank(concept_graph, weight="weight", tol=1e-12, max_iter=500)
+    for node, value in expected.items():
+        assert observed[node] == pytest.approx(value, abs=1e-8)
+
+
+def test_unknown_method_raises(concept_graph):
+    with pytest.raises(ValueError):
+        ImportanceEngine().scores(CSRGraph.from_networkx(concept_graph), (0,), ["closeness"])
+
+
+@pytest.mark.parametrize("epsilon", [1e-3, 1e-5])
+def test_personalized_pagerank_push_bounds(concept_graph, epsilon):
+    seeds = {"concept_0": 2.0, "concept_10": 1.0}
+    approx = personalized_pagerank_push(concept_graph, seeds, alpha=0.85, epsilon=epsilon)
+    expected = nx.pagerank(concept_graph, alpha=0.85, personalization=seeds, weight="weight",
+                           tol=1e-14, max_iter=1000)
+    for node, value in expected.items():
+        error = value - approx.get(node, 0.0)
+        assert -1e-9 <= error <= epsilon * concept_graph.degree(node, weight="weight") + 1e-9
+
+
+def test_personalized_pagerank_push_converges_directed(concept_digraph):
+    concept_digraph.add_edge("concept_0", "sink", weight=1.0)  # Dangling node restarts from the seeds
+    seeds = {"concept_0": 1.0}
+    approx = personalized_pagerank_push(concept_digraph, seeds, alpha=0.85, epsilon=1e-7)
+    expected = nx.pagerank(concept_digraph, alpha=0.85, personalization=seeds, weight="weight",
+                           tol=1e-14, max_iter=1000)
+    for node, value in expected.items():
+        assert approx.get(node, 0.0) == pytest.approx(value, abs=1e-4)
+
+
+def test_personalized_pagerank_push_ignores_unknown_seeds(concept_graph):
+    assert personalized_pagerank_push(concept_graph, {"missing": 1.0}) == {}
+
+
+def reference_importance(graph, method):
+    """Original get_concept_importance: NetworkX defaults, recomputed on every call"""
+    if method == "pagerank":
+        return nx.pagerank(graph)
+    elif method == "betweenness":
+        return nx.betweenness_centrality(graph)
+    elif method == "eigenvector":
+        return nx.eigenvector_centrality_numpy(graph)
+    return {node: score / len(graph) for node, score in dict(graph.degree()).items()}
+
+
+@pytest.mark.parametrize("method", ["pagerank", "betweenness", "eigenvector", "degree", "unknown"])
+def test_get_concept_importance_defaults_match_the_original(concept_graph, method):
+    manager = KGCOIManager()
+    manager.graph = concept_graph
+    observed = manager.get_concept_importance(method)
+    expected = reference_importance(concept_graph, method)
+    assert observed.keys() == expected.keys()
+    for node, value in expected.items():
+        assert observed[node] == pytest.approx(value, abs=1e-6)
+
+
+def test_weighted_importance_is_opt_in(concept_graph):
+    manager = KGCOIManager()
+    manager.graph = concept_graph
+    unweighted = nx.eigenvector_centrality_numpy(concept_graph)
+    weighted = nx.eigenvector_centrality_numpy(concept_graph, weight="weight")
+    observed = manager.get_concept_importance("eigenvector", weighted=True)
+    for node, value in weighted.items():
+        assert observed[node] == pytest.approx(value, abs=1e-6)
+    assert any(abs(observed[node] - unweighted[node]) > 1e-3 for node in concept_graph)
+
+    default_top = [node for node, _ in manager.top_concepts(5, "eigenvector")]
+    assert default_top == sorted(unweighted, key=unweighted.get, reverse=True)[:5]
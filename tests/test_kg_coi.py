@@ -0,0 +1,118 @@
+"""
+KGCOIManager graph changes: the compact backend and rebuilding graphs
+"""
+import networkx as nx
+import pytest
+
+from scidiscover.knowledge.compact_graph import CompactGraph, CompactGraphView, GRAPH_BACKEND_COMPACT
+from scidiscover.knowledge.graph_log import ADD_EDGE
+from scidiscover.knowledge.kg_coi import KGCOIManager
+
+from conftest import make_concept_graph
+
+
+def relationships(graph: nx.Graph) -> list:
+    return [
+        {"source": u, "target": v, "type": data["relationship"], "evidence": [{"year": 2020}] * len(data["evidence"])}
+        for u, v, data in graph.edges(data=True)
+    ]
+
+
+@pytest.fixture
+def manager(tmp_path):
+    manager = KGCOIManager()
+    manager.cache_dir = str(tmp_path)
+    return manager
+
+
+@pytest.fixture
+def conversions(monkeypatch):
+    """Counts of CompactGraph.from_networkx and to_networkx calls"""
+    counts = {"from_networkx": 0, "to_networkx": 0}
+    from_networkx, to_networkx = CompactGraph.from_networkx.__func__, CompactGraph.to_networkx
+
+    def counting_from_networkx(cls, graph):
+        counts["from_networkx"] += 1
+        return from_networkx(cls, graph)
+
+    def counting_to_networkx(self):
+        counts["to_networkx"] += 1
+        return to_networkx(self)
+
+    monkeypatch.setattr(CompactGraph, "from_networkx", classmethod(counting_from_networkx))
+    monkeypatch.setattr(CompactGraph, "to_networkx", counting_to_networkx)
+    return counts
+
+
+def test_compact_backend_buffers_small_batches_in_a_mutable_graph(manager, conversions):
+    manager.backend = GRAPH_BACKEND_COMPACT
+    source = make_concept_graph(num_nodes=40)
+    manager.build_concept_graph(list(source.nodes()), relationships(source))
+    # A full build compacts at once
+    assert isinstance(manager.graph, CompactGraphView)
+    assert conversions == {"from_networkx": 1, "to_networkx": 0}
+
+    batches = 0
+    while batches == 0 or not isinstance(manager.graph, CompactGraphView):
+        manager.apply_changes([{"op": ADD_EDGE, "source": "concept_0", "target": f"new_{batches}",
+                                "attrs": {"type": "binds"}}])
+        batches += 1
+        if not isinstance(manager.graph, CompactGraphView):
+            # One conversion back to NetworkX, then the mutable graph takes every batch
+            assert conversions == {"from_networkx": 1, "to_networkx": 1}
+
+    # Compacted again once the changes amount to compact_change_fraction of the graph
+    size = manager.graph.number_of_nodes() + manager.graph.number_of_edges()
+    assert batches >= manager.compact_change_fraction * size > 1
+    assert conversions == {"from_networkx": 2, "to_networkx": 1}
+    assert manager.graph.number_of_edges() == source.number_of_edges() + batches
+    assert manager.graph.has_edge("concept_0", f"new_{batches - 1}")
+
+
+def test_compact_backend_writes_store_snapshots_from_the_compact_graph(manager):
+    manager.backend = GRAPH_BACKEND_COMPACT
+    manager.open_store("concepts")
+    manager.store.compact_threshold = 3
+    for i in range(3):
+        manager.apply_changes([{"op": ADD_EDGE, "source": "a", "target": f"b{i}", "attrs": {"type": "binds"}}])
+    assert manager.store.pending_changes == 0
+    assert isinstance(manager.graph, CompactGraphView)
+
+    reloaded = KGCOIManager()
+    reloaded.cache_dir = manager.cache_dir
+    assert sorted(reloaded.open_store("concepts").edges()) == sorted(manager.graph.edges())
+
+
+def concepts_of(graph: nx.Graph) -> list:
+    return [{"text": node, "type": "concept"} for node in graph.nodes()]
+
+
+def test_rebuild_leaves_previously_returned_graphs_untouched(manager):
+    first_source, second_source = make_concept_graph(num_nodes=20, seed=1), make_concept_graph(num_nodes=12, seed=2)
+    first = manager.build_evidence_weighted_graph(concepts_of(first_source), relationships(first_source))
+    first_edges = sorted(first.edges())
+    second = manager.build_evidence_weighted_graph(concepts_of(second_source), relationships(second_source))
+
+    assert second is not first
+    assert sorted(first.edges()) == first_edges
+    assert sorted(second.edges()) == sorted(second_source.edges())
+
+
+def test_rebuild_starts_from_an_undirected_graph(manager, concept_digraph):
+    manager.graph = concept_digraph
+    graph = manager.build_evidence_weighted_graph(concepts_of(concept_digraph), relationships(concept_digraph))
+    assert not graph.is_directed()
+    assert concept_digraph.is_directed() and concept_digraph.number_of_edges() > 0
+
+
+def test_rebuild_is_recorded_in_the_store_log(manager):
+    first_source, second_source = make_concept_graph(num_nodes=20, seed=1), make_concept_graph(num_nodes=12, seed=2)
+    manager.open_store("evidence")
+    manager.build_evidence_weighted_graph(concepts_of(first_source), relationships(first_source))
+    graph = manager.build_evidence_weighted_graph(concepts_of(second_source), relationships(second_source))
+
+    reloaded = KGCOIManager()
+    reloaded.cache_dir = manager.cache_dir
+    restored = reloaded.open_store("evidence")
+    assert sorted(restored.nodes()) == sorted(graph.nodes())
+    assert sorted(restored.edges()) == sorted(graph.edges())
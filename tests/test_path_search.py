@@ -0,0 +1,82 @@
+"""
+Path search against NetworkX shortest paths with the same evidence costs
+"""
+import itertools
+
+import networkx as nx
+import pytest
+
+from scidiscover.knowledge.path_search import (
+    KShortestPaths, evidence_cost, many_to_many_paths, max_edge_weight
+)
+from scidiscover.knowledge.walk_engine import CSRGraph
+
+
+def networkx_cost(graph):
+    cost = evidence_cost("weight", max_weight=max_edge_weight(graph))
+    return lambda u, v, data: cost(data)
+
+
+def path_cost(graph, path):
+    cost = evidence_cost("weight", max_weight=max_edge_weight(graph))
+    return sum(cost(graph[u][v]) for u, v in zip(path, path[1:]))
+
+
+@pytest.mark.parametrize("target", ["concept_17", "concept_25", "concept_39"])
+def test_k_shortest_paths_match_networkx(concept_graph, target):
+    source = "concept_0"
+    expected = list(itertools.islice(
+        nx.shortest_simple_paths(concept_graph, source, target, weight=networkx_cost(concept_graph)), 15
+    ))
+    found = KShortestPaths(concept_graph, source, target).take(15)
+
+    assert [path_cost(concept_graph, path) for path in found] == pytest.approx(
+        [path_cost(concept_graph, path) for path in expected]
+    )
+    assert found == expected
+
+
+def test_k_shortest_paths_with_length_limit_match_bounded_enumeration(concept_graph):
+    source, target, max_length = "concept_0", "concept_20", 6
+    admissible = nx.all_simple_paths(concept_graph, source, target, cutoff=max_length - 1)
+    expected = sorted(admissible, key=lambda path: path_cost(concept_graph, path))[:10]
+    found = KShortestPaths(concept_graph, source, target, max_length=max_length).take(10)
+
+    assert all(len(path) <= max_length for path in found)
+    assert found == expected
+
+
+def test_k_shortest_paths_resume_where_they_stopped(concept_graph):
+    search = KShortestPaths(concept_graph, "concept_0", "concept_25")
+    first = search.take(4)
+    assert search.take(8)[:4] == first
+    assert search.take(8) == KShortestPaths(concept_graph, "concept_0", "concept_25").take(8)
+
+
+def test_k_shortest_paths_directed(concept_digraph):
+    source = "concept_0"
+    target = next(node for node in reversed(list(concept_digraph))
+                  if nx.has_path(concept_digraph, source, node))
+    expected = list(itertools.islice(
+        nx.shortest_simple_paths(concept_digraph, source, target, weight=networkx_cost(concept_digraph)), 10
+    ))
+    assert KShortestPaths(concept_digraph, source, target).take(10) == expected
+
+
+@pytest.mark.parametrize("graph_fixture", ["concept_graph", "concept_digraph"])
+def test_many_to_many_paths_match_dijkstra(request, graph_fixture):
+    graph = request.getfixturevalue(graph_fixture)
+    sources = ["concept_0", "concept_8", "concept_21"]
+    targets = ["concept_3", "concept_30", "concept_21", "concept_35"]
+    matrix = many_to_many_paths(CSRGraph.from_networkx(graph), sources, targets, directed=graph.is_directed())
+
+    for source in sources:
+        lengths = nx.single_source_dijkstra_path_length(graph, source, weight=networkx_cost(graph))
+        for target in targets:
+            if target not in lengths:
+                assert matrix.path(source, target) == []
+                continue
+            assert matrix.distance(source, target) == pytest.approx(lengths[target])
+            path = matrix.path(source, target)
+            assert path[0] == source and path[-1] == target
+            assert path_cost(graph, path) == pytest.approx(lengths[target])
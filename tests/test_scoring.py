@@ -0,0 +1,80 @@
+"""
+Score estimates, self-consistency aggregation, canonical hypothesis hashing and the score cache
+"""
+import pytest
+
+from scidiscover.reasoning.scoring import (
+    PRIOR_STDEV, SCORE_DIMENSIONS, ScoreCache, ScoreEstimate, aggregate_samples, canonicalize, hypothesis_hash,
+    parse_score_samples
+)
+
+
+def sample(value: float) -> dict:
+    return {dim: value for dim in SCORE_DIMENSIONS}
+
+
+def test_parse_score_samples_skips_invalid_and_clamps():
+    response = {"samples": [sample(0.5), {"scientific_rigor": 0.9}, "text", dict(sample(0.2), scientific_rigor="x"), sample(1.4)]}
+    samples = parse_score_samples(response)
+    assert samples == [sample(0.5), sample(1.0)]
+
+
+def test_aggregate_samples_gives_a_confidence_interval():
+    estimate = aggregate_samples([sample(0.4), sample(0.5), sample(0.6)])
+    assert estimate.mean == pytest.approx(0.5)
+    assert estimate.stdev == pytest.approx(0.1)
+    assert estimate.n == 3
+    assert estimate.lower < estimate.mean < estimate.upper
+    assert estimate.upper - estimate.lower == pytest.approx(2 * 1.96 * 0.1 / 3 ** 0.5)
+
+
+def test_aggregate_samples_without_samples():
+    assert aggregate_samples([]) is None
+
+
+def test_point_with_prior_is_as_wide_as_a_single_sample():
+    fallback = ScoreEstimate.point(0.7, PRIOR_STDEV)
+    single = aggregate_samples([sample(0.7)])
+    assert (fallback.lower, fallback.upper) == pytest.approx((single.lower, single.upper))
+    assert fallback.upper - fallback.lower > 0
+
+
+def test_point_without_stdev_has_zero_width():
+    estimate = ScoreEstimate.point(0.7)
+    assert estimate.lower == estimate.upper == 0.7
+    assert estimate.noise_margin(ScoreEstimate.point(0.5)) == 0
+
+
+def test_canonicalize_treats_set_like_fields_as_sets():
+    first = {"hypothesis": "Wnt  drives\nregrowth", "genes": ["Wnt", "Fgf", "Wnt"]}
+    second = {"genes": ["Fgf", "Wnt"], "hypothesis": "Wnt drives regrowth "}
+    assert canonicalize(first) == canonicalize(second)
+    assert hypothesis_hash(first) == hypothesis_hash(second)
+
+
+def test_canonicalize_keeps_the_order_of_other_lists():
+    first = {"mechanism_steps": ["injury", "blastema", "regrowth"]}
+    second = {"mechanism_steps": ["blastema", "injury", "regrowth"]}
+    assert canonicalize(first)["mechanism_steps"] == ["injury", "blastema", "regrowth"]
+    assert hypothesis_hash(first) != hypothesis_hash(second)
+
+
+def test_score_cache_counts_hits_and_misses():
+    cache = ScoreCache()
+    estimate = ScoreEstimate.point(0.6)
+    assert cache.get("a") is None
+    cache.put("a", estimate)
+    assert cache.get("a") is estimate
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_score_cache_evicts_the_least_recently_used():
+    cache = ScoreCache(max_entries=2)
+    cache.put("a", ScoreEstimate.point(0.1))
+    cache.put("b", ScoreEstimate.point(0.2))
+    cache.get("a")
+    cache.put("c", ScoreEstimate.point(0.3))
+    assert len(cache) == 2
+    assert cache.get("b") is None
+    assert cache.get("a").mean == 0.1
+    assert cache.get("c").mean == 0.3
@@ -0,0 +1,99 @@
+"""
+RandomWalkEngine steps against the transition probabilities of the original per-step sampler
+"""
+from collections import Counter
+
+import networkx as nx
+import numpy as np
+import pytest
+
+from scidiscover.knowledge.walk_engine import CSRGraph, RandomWalkEngine
+
+NOVELTY_WEIGHT = 3.0
+NUM_WALKS = 200_000
+
+
+def reference_step_weights(graph, current, path, end, centrality, distances):
+    """Transition weights of the original sampler (random.choices over the neighbors of current)"""
+    weights = {}
+    for neighbor in graph.neighbors(current):
+        weight = centrality.get(neighbor, 0.1)
+        if "weight" in graph[current][neighbor]:
+            weight *= graph[current][neighbor]["weight"]
+        if neighbor not in path:
+            weight *= NOVELTY_WEIGHT
+        if neighbor in distances:
+            weight *= 1 + 1 / max(1, distances[neighbor])
+        weights[neighbor] = max(0.01, weight)
+    total = sum(weights.values())
+    return {neighbor: weight / total for neighbor, weight in weights.items()}
+
+
+def reference_two_step_distribution(graph, start, end, centrality, distances):
+    """Probability of every (first, second) step pair from start, for targets more than two hops away"""
+    probabilities = {}
+    for first, p_first in reference_step_weights(graph, start, [start], end, centrality, distances).items():
+        second_steps = reference_step_weights(graph, first, [start, first], end, centrality, distances)
+        for second, p_second in second_steps.items():
+            probabilities[(first, second)] = p_first * p_second
+    return probabilities
+
+
+@pytest.fixture
+def walk_setup(concept_graph):
+    start = "concept_0"
+    hops = nx.single_source_shortest_path_length(concept_graph, start)
+    end = max(hops, key=hops.get)
+    assert hops[end] > 2
+
+    centrality = nx.betweenness_centrality(concept_graph)
+    centrality.pop("concept_3")  # Exercise the 0.1 default of nodes without a score
+    distances = nx.single_source_shortest_path_length(concept_graph, end)
+
+    csr = CSRGraph.from_networkx(concept_graph)
+    engine = RandomWalkEngine(csr)
+    base_weights = engine.edge_base_weights(
+        csr.node_array(centrality, 0.1), csr.node_array(distances, -1, dtype=np.int64)
+    )
+    expected = reference_two_step_distribution(concept_graph, start, end, centrality, distances)
+    return csr, engine, base_weights, start, end, expected
+
+
+def empirical_two_step_distribution(csr, engine, base_weights, start, end, alias_tables):
+    paths, lengths, _ = engine.run_walks(
+        csr.index[start], csr.index[end], NUM_WALKS, 3, NOVELTY_WEIGHT, base_weights,
+        np.random.default_rng(0), alias_tables
+    )
+    assert (lengths == 3).all()
+    counts = Counter(zip(paths[:, 1].tolist(), paths[:, 2].tolist()))
+    return {(csr.nodes[a], csr.nodes[b]): count / NUM_WALKS for (a, b), count in counts.items()}
+
+
+@pytest.mark.parametrize("use_alias", [False, True])
+def test_walk_steps_match_reference_distribution(walk_setup, use_alias):
+    csr, engine, base_weights, start, end, expected = walk_setup
+    tables = engine.build_alias_tables(base_weights, NOVELTY_WEIGHT) if use_alias else None
+    observed = empirical_two_step_distribution(csr, engine, base_weights, start, end, tables)
+
+    assert set(observed) <= set(expected)
+    total_variation = 0.5 * sum(abs(observed.get(pair, 0.0) - p) for pair, p in expected.items())
+    assert total_variation < 0.01
+
+
+def test_sample_paths_only_returns_walks_reaching_the_target(walk_setup):
+    csr, engine, base_weights, start, end, _ = walk_setup
+    tables = engine.build_alias_tables(base_weights, NOVELTY_WEIGHT)
+    paths = engine.sample_paths(start, end, 500, 10, NOVELTY_WEIGHT, base_weights,
+                                np.random.default_rng(1), tables)
+    assert paths
+    for path in paths:
+        assert path[0] == start and path[-1] == end and len(path) <= 10
+        assert end not in path[:-1]
+
+
+def test_sample_paths_edge_cases(walk_setup):
+    _, engine, base_weights, start, end, _ = walk_setup
+    rng = np.random.default_rng(2)
+    assert engine.sample_paths(start, start, 2, 10, NOVELTY_WEIGHT, base_weights, rng) == [[start], [start]]
+    with pytest.raises(nx.NetworkXError):
+        engine.sample_paths("missing", end, 2, 10, NOVELTY_WEIGHT, base_weights, rng)